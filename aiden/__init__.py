@@ -1 +1,22 @@
-from .transformations import Transformation as Transformation
+"""
+Aiden builds data transformations from natural language.
+
+The package is imported lazily: `Transformation` and its dependencies (the agents, the LLM clients, the code
+formatters) are only imported when first accessed, so that processes that only need the dataset and environment
+definitions start quickly.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .transformations import Transformation as Transformation
+
+__all__ = ["Transformation"]
+
+
+def __getattr__(name: str):
+    if name == "Transformation":
+        from .transformations import Transformation
+
+        return Transformation
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
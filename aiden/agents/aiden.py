@@ -6,7 +6,9 @@ import logging
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Callable
 
+from aiden.common.checkpoint import BuildCheckpoint
 from aiden.common.environment import Environment
+from aiden.common.usage import UsageLedger
 from aiden.registries.objects import ObjectRegistry
 from aiden.entities.code import Code
 from aiden.agents.manager import ManagerAgent
@@ -41,6 +43,11 @@ class AidenAgent:
         max_steps: int = 30,
         verbose: bool = False,
         chain_of_thought_callable: Optional[Callable] = None,
+        candidates: int = 1,
+        distributed: bool = False,
+        optimize: bool = False,
+        checkpoint: Optional[BuildCheckpoint] = None,
+        ledger: Optional[UsageLedger] = None,
     ):
         """
         Initialize the multi-agent ML engineering system.
@@ -53,6 +60,13 @@ class AidenAgent:
             max_steps: Maximum number of steps for the manager agent
             verbose: Whether to display detailed agent logs
             chain_of_thought_callable: Callable to use for chain of thought output
+            candidates: Number of code candidates the data engineer generates and executes in parallel
+            distributed: Whether to execute the generated code on a distributed execution backend
+            optimize: Whether the data engineer optimises the code that executes correctly, by profiling it on
+                larger synthetic datasets
+            checkpoint: Checkpoint journaling the model and tool calls of the agents, replaying the calls it
+                already holds
+            ledger: Ledger recording the usage of the model calls of the agents, by agent role
         """
         self.manager_model_id = manager_model_id
         self.data_expert_model_id = data_expert_model_id
@@ -62,6 +76,9 @@ class AidenAgent:
         self.max_steps = max_steps
         self.verbose = verbose
         self.chain_of_thought_callable = chain_of_thought_callable
+        self.candidates = candidates
+        self.distributed = distributed
+        self.optimize = optimize
 
         # Set verbosity levels
         self.manager_verbosity = 2 if verbose else 0
@@ -74,6 +91,9 @@ class AidenAgent:
             environment=self.environment,
             tool_model_id=self.tool_model_id,
             chain_of_thought_callable=self.chain_of_thought_callable,
+            candidates=self.candidates,
+            distributed=self.distributed,
+            optimize=self.optimize,
         ).agent
 
         # Create solution planner agent - plans Data transformation approaches
@@ -81,6 +101,7 @@ class AidenAgent:
             model_id=self.data_expert_model_id,
             verbosity=self.specialist_verbosity,
             chain_of_thought_callable=self.chain_of_thought_callable,
+            engine=self.environment.engine if self.environment else "pandas",
         ).agent
 
         # Create manager agent - coordinates the workflow
@@ -92,6 +113,15 @@ class AidenAgent:
             chain_of_thought_callable=self.chain_of_thought_callable,
         ).agent
 
+        # Attached before the checkpoint, so that the calls replayed from the checkpoint are not recorded
+        if ledger is not None:
+            for agent in (self.manager_agent, self.data_expert, self.data_engineer):
+                ledger.attach(agent)
+
+        if checkpoint is not None:
+            for agent in (self.manager_agent, self.data_expert, self.data_engineer):
+                checkpoint.attach(agent)
+
     def run(self, task, additional_args: dict) -> AidenGenerationResult:
         """
         Run the orchestrator agent to generate a machine learning model.
@@ -3,7 +3,8 @@ from smolagents import ToolCallingAgent, LiteLLMModel
 from aiden.common.utils.prompt import get_prompt_templates
 from aiden.tools.response_formatting import format_final_de_agent_response
 from aiden.tools.code_generation import get_generate_transformation_code, get_fix_transformation_code
-from aiden.tools.execution import get_executor_tool
+from aiden.tools.execution import get_candidates_executor_tool, get_executor_tool
+from aiden.tools.optimization import get_optimizer_tool
 from aiden.common.environment import Environment
 
 
@@ -15,7 +16,27 @@ class DataEngineerAgent:
         environment: Environment,
         tool_model_id: str,
         chain_of_thought_callable: Optional[Callable] = None,
+        candidates: int = 1,
+        distributed: bool = False,
+        optimize: bool = False,
     ):
+        if candidates > 1:
+            # Candidates are generated and executed together, the first valid one wins
+            generate_tool = get_candidates_executor_tool(
+                llm_to_use=tool_model_id, environment=environment, candidates=candidates, distributed=distributed
+            )
+        else:
+            generate_tool = get_generate_transformation_code(llm_to_use=tool_model_id, environment=environment)
+
+        tools = [
+            generate_tool,
+            get_fix_transformation_code(llm_to_use=tool_model_id, environment=environment),
+            get_executor_tool(distributed=distributed, environment=environment),
+        ]
+        if optimize:
+            # Once the code runs, it is profiled on larger synthetic data and rewritten to run faster
+            tools.append(get_optimizer_tool(llm_to_use=tool_model_id, environment=environment, distributed=distributed))
+
         self.agent = ToolCallingAgent(
             name="data_engineer",
             description=(
@@ -28,14 +49,9 @@ class DataEngineerAgent:
                 "- the working directory to use for transformation execution"
             ),
             model=LiteLLMModel(model_id=model_id),
-            tools=[
-                get_generate_transformation_code(llm_to_use=tool_model_id, environment=environment),
-                get_fix_transformation_code(llm_to_use=tool_model_id, environment=environment),
-                get_executor_tool(environment=environment),
-                format_final_de_agent_response,
-            ],
+            tools=[*tools, format_final_de_agent_response],
             add_base_tools=False,
             verbosity_level=verbosity,
             prompt_templates=get_prompt_templates("toolcalling_agent.yaml", "data_engineer_prompt_templates.yaml"),
-            step_callbacks=[chain_of_thought_callable],
+            step_callbacks=[chain_of_thought_callable] if chain_of_thought_callable else [],
         )
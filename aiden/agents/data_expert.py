@@ -1,6 +1,7 @@
 from typing import Optional, Callable
 from smolagents import ToolCallingAgent, LiteLLMModel
 from aiden.common.utils.prompt import get_prompt_templates
+from aiden.config import config
 
 
 class DataExpertAgent:
@@ -9,6 +10,7 @@ class DataExpertAgent:
         model_id: str,
         verbosity: int,
         chain_of_thought_callable: Optional[Callable] = None,
+        engine: str = "pandas",
     ):
         self.agent = ToolCallingAgent(
             name="data_expert",
@@ -23,6 +25,10 @@ class DataExpertAgent:
             tools=[],
             add_base_tools=False,
             verbosity_level=verbosity,
-            prompt_templates=get_prompt_templates("toolcalling_agent.yaml", "data_expert_prompt_templates.yaml"),
-            step_callbacks=[chain_of_thought_callable],
+            prompt_templates=get_prompt_templates(
+                "toolcalling_agent.yaml",
+                "data_expert_prompt_templates.yaml",
+                allowed_packages=config.code_generation.engine_packages(engine),
+            ),
+            step_callbacks=[chain_of_thought_callable] if chain_of_thought_callable else [],
         )
@@ -28,5 +28,5 @@ class ManagerAgent:
             prompt_templates=get_prompt_templates("code_agent.yaml", "manager_prompt_templates.yaml"),
             max_steps=max_steps,
             planning_interval=7,
-            step_callbacks=[chain_of_thought_callable],
+            step_callbacks=[chain_of_thought_callable] if chain_of_thought_callable else [],
         )
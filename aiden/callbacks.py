@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 from aiden.common.dataset import Dataset
+from aiden.common.usage import UsageRecord
 from aiden.entities.node import Node
 from aiden.common.utils.cot.callable import ChainOfThoughtCallable
 from aiden.common.utils.cot.emitters import ConsoleEmitter
@@ -89,6 +90,12 @@ class Callback(ABC):
         """
         pass
 
+    def on_llm_call(self, record: UsageRecord) -> None:
+        """
+        Called after each LLM call made during the model building process, with its tokens, cost and latency.
+        """
+        pass
+
 
 class ChainOfThoughtModelCallback(Callback):
     """
@@ -98,15 +105,20 @@ class ChainOfThoughtModelCallback(Callback):
     chain of thought callback system.
     """
 
-    def __init__(self, emitter=None):
+    def __init__(self, emitter=None, summarizer=None, background: bool = True, batch_size: int = 4):
         """
         Initialize the chain of thought model callback.
 
         Args:
             emitter: The emitter to use for chain of thought output
+            summarizer: The summarizer producing friendly step summaries, defaults to an LLM-based one
+            background: Whether friendly step summaries are generated off the agent's critical path
+            batch_size: Maximum number of pending steps summarised together in a single LLM call
         """
 
-        self.cot_callable = ChainOfThoughtCallable(emitter=emitter or ConsoleEmitter())
+        self.cot_callable = ChainOfThoughtCallable(
+            emitter=emitter or ConsoleEmitter(), summarizer=summarizer, background=background, batch_size=batch_size
+        )
 
     def on_build_start(self, info: BuildStateInfo) -> None:
         """
@@ -119,6 +131,8 @@ class ChainOfThoughtModelCallback(Callback):
         """
         Emit completion message at the end of the build process.
         """
+        # Emit pending step summaries before the completion message, and stop the summary worker
+        self.cot_callable.close()
         self.cot_callable.emitter.emit_thought("System", "✅ Model build completed")
 
     def on_iteration_start(self, info: BuildStateInfo) -> None:
@@ -0,0 +1,253 @@
+"""
+This module provides a persistent, content-addressed cache for LLM provider responses.
+
+Responses are stored on disk under the aiden cache directory, keyed on a hash of everything that determines
+the completion: the model, the system message, the user message and the response format schema. Entries
+expire after a configurable TTL, and the least recently used entries are evicted once the cache grows past
+its size limit.
+
+The same store keeps the validated sources of built transformations, under a separate directory, so that
+rebuilding an unchanged transformation skips the agents altogether.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Type
+
+from platformdirs import user_cache_dir
+from pydantic import BaseModel
+
+from aiden.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    Return (and create) a directory under the aiden cache root.
+
+    The root is taken from the AIDEN_CACHE_DIR environment variable if set, then from the configured
+    cache directory, and finally from the platform-specific user cache directory.
+
+    :param parts: path components to append to the cache root
+    :return: the resolved cache directory
+    """
+    root = os.getenv("AIDEN_CACHE_DIR") or config.cache.cache_dir or user_cache_dir("aiden")
+    path = Path(root).expanduser().joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class ResponseCache:
+    """
+    On-disk cache of provider responses with TTL and size-based (LRU) eviction.
+
+    Each entry is a small JSON file named after its key. Reads refresh the file's modification time, so
+    eviction by oldest modification time removes the least recently used entries first.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str | None = None,
+        ttl_seconds: int = config.cache.response_ttl_seconds,
+        max_size_bytes: int = config.cache.response_max_size_mb * 1024 * 1024,
+    ):
+        """
+        Initialise the response cache.
+
+        :param cache_dir: directory in which to store entries; defaults to '<cache root>/responses'
+        :param ttl_seconds: time after which an entry is considered stale
+        :param max_size_bytes: total size above which least recently used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir("responses")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_message: str,
+        user_message: str,
+        response_format: Type[BaseModel] | None = None,
+    ) -> str:
+        """
+        Compute the content address of a completion request.
+
+        :param model: the model identifier
+        :param system_message: the system message
+        :param user_message: the user message
+        :param response_format: the pydantic model describing the structured response, if any
+        :return: a hex digest uniquely identifying the request
+        """
+        schema = response_format.model_json_schema() if response_format is not None else None
+        payload = json.dumps(
+            {"model": model, "system": system_message, "user": user_message, "schema": schema},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached response for a key, or None if it is missing or expired.
+
+        :param key: the key computed by make_key
+        :return: the cached response, if any
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("response")
+
+    def set(self, key: str, response: str, model: str | None = None) -> None:
+        """
+        Store a response in the cache, evicting old entries if the size limit is exceeded.
+
+        :param key: the key computed by make_key
+        :param response: the response to store
+        :param model: the model that produced the response, stored for inspection only
+        """
+        path = self._path(key)
+        data = json.dumps({"created_at": time.time(), "model": model, "response": response})
+
+        # Write atomically so that concurrent readers never observe a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # A failed cache write must never fail the query that produced the response
+            logger.warning(f"Could not write response cache entry: {e}")
+            self._remove(tmp_path)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._total_size()
+            else:
+                self._size += len(data)
+            needs_eviction = self._size > self.max_size_bytes
+
+        if needs_eviction:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        """
+        Remove the entry of a key, e.g. a response that its caller could not use.
+
+        :param key: the key computed by make_key
+        """
+        self._remove(self._path(key))
+
+    def evict(self) -> None:
+        """
+        Remove expired entries, then the least recently used ones until the cache fits its size limit.
+        """
+        with self._lock:
+            now = time.time()
+            entries = []
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.ttl_seconds:
+                    self._remove(path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_size_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+            self._size = total
+            logger.debug(f"Response cache at {self.cache_dir} holds {total} bytes after eviction")
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            for path in self.cache_dir.glob("*/*.json"):
+                self._remove(path)
+            self._size = 0
+
+    def _total_size(self) -> int:
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"Could not remove cache entry {path}: {e}")
+
+
+_response_caches: Dict[Path, ResponseCache] = {}
+_response_caches_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Return the process-wide response cache for the current cache directory.
+
+    :return: the shared ResponseCache instance
+    """
+    cache_dir = get_cache_dir("responses")
+    with _response_caches_lock:
+        if cache_dir not in _response_caches:
+            _response_caches[cache_dir] = ResponseCache(cache_dir)
+        return _response_caches[cache_dir]
+
+
+_build_caches: Dict[Path, ResponseCache] = {}
+
+
+def get_build_cache() -> ResponseCache:
+    """
+    Return the process-wide cache of built transformations for the current cache directory.
+
+    :return: the shared ResponseCache instance storing build results
+    """
+    cache_dir = get_cache_dir("builds")
+    with _response_caches_lock:
+        if cache_dir not in _build_caches:
+            _build_caches[cache_dir] = ResponseCache(
+                cache_dir,
+                ttl_seconds=config.cache.build_ttl_seconds,
+                max_size_bytes=config.cache.build_max_size_mb * 1024 * 1024,
+            )
+        return _build_caches[cache_dir]
@@ -0,0 +1,257 @@
+"""
+This module persists the progress of a build, so that a build interrupted by a crash, a provider outage or a
+timeout can be resumed without re-issuing the LLM calls that already succeeded.
+
+The checkpoint lives in the 'checkpoint' directory of the transformation's working directory. It holds the build
+arguments, a journal of every model call and tool call made by the agents, with the `Code` entries registered by
+each tool call, and the memory of each agent step. On resume, the agents run again from the start, but the calls
+found in the journal are replayed from it: the agent memories and the object registry are rebuilt exactly as they
+were, without any LLM call or code execution, and the build continues live from the first call not in the journal.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from aiden.entities.code import Code
+from aiden.registries.objects import ObjectRegistry
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIRECTORY = "checkpoint"
+
+
+class BuildCheckpoint:
+    """
+    Journal of the progress of a build in a working directory.
+    """
+
+    def __init__(self, working_dir: Path | str):
+        """
+        Open the checkpoint of a working directory, loading the journal of a previous build if any.
+
+        :param working_dir: the working directory of the transformation
+        """
+        self.directory = Path(working_dir) / CHECKPOINT_DIRECTORY
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.build_file = self.directory / "build.json"
+        self.journal_file = self.directory / "journal.jsonl"
+        self.steps_file = self.directory / "steps.jsonl"
+        self.replayed_calls = 0
+        self.live_calls = 0
+        self._lock = threading.Lock()
+        self._replay: Dict[str, Deque[Any]] = defaultdict(deque)
+        self._registry = ObjectRegistry()
+        self._load_journal()
+
+    @staticmethod
+    def exists(working_dir: Path | str) -> bool:
+        """
+        Check if a working directory holds the checkpoint of a build.
+
+        :param working_dir: the working directory of the transformation
+        :return: whether a checkpoint exists
+        """
+        return (Path(working_dir) / CHECKPOINT_DIRECTORY / "build.json").is_file()
+
+    def start(self, build: Dict[str, Any]) -> None:
+        """
+        Start a new build, discarding the journal of any previous build in the same working directory.
+
+        :param build: the arguments of the build, needed to resume it
+        """
+        with self._lock:
+            self._replay.clear()
+            for path in (self.journal_file, self.steps_file):
+                path.unlink(missing_ok=True)
+        self._write_build({**build, "state": "building"})
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the arguments of the checkpointed build.
+
+        :return: the build arguments given to start
+        """
+        with open(self.build_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def finish(self) -> None:
+        """
+        Mark the build as completed.
+        """
+        self._write_build({**self.load(), "state": "ready"})
+
+    def attach(self, agent: Any) -> None:
+        """
+        Journal the model calls, the tool calls and the steps of an agent.
+
+        :param agent: a smolagents agent; managed agents must be attached separately
+        """
+        from smolagents.memory import ActionStep
+
+        # Tools run in threads that do not inherit the context of the build, so keep the registry of the build
+        self._registry = ObjectRegistry()
+        self._wrap_model(agent.model)
+        for name, tool in agent.tools.items():
+            if name != "final_answer":
+                self._wrap_tool(tool)
+        agent.step_callbacks.register(ActionStep, lambda step, agent=None: self._record_step(step, agent))
+
+    def _wrap_model(self, model: Any) -> None:
+        from smolagents.models import ChatMessage
+        from smolagents.monitoring import TokenUsage
+
+        generate = model.generate
+
+        def journaled_generate(messages, stop_sequences=None, response_format=None, tools_to_call_from=None, **kwargs):
+            key = _json_key(
+                "model",
+                getattr(model, "model_id", None),
+                [_message_payload(message) for message in messages],
+                stop_sequences,
+                response_format,
+                [tool.name for tool in tools_to_call_from or []],
+            )
+            recorded = self._take(key)
+            if recorded is not None:
+                token_usage = recorded.pop("token_usage", None)
+                return ChatMessage.from_dict(
+                    recorded,
+                    token_usage=(
+                        TokenUsage(token_usage["input_tokens"], token_usage["output_tokens"]) if token_usage else None
+                    ),
+                )
+
+            message = generate(
+                messages,
+                stop_sequences=stop_sequences,
+                response_format=response_format,
+                tools_to_call_from=tools_to_call_from,
+                **kwargs,
+            )
+            self._append(key, _message_record(message))
+            return message
+
+        model.generate = journaled_generate
+
+    def _wrap_tool(self, tool: Any) -> None:
+        forward = tool.forward
+
+        def journaled_forward(*args, **kwargs):
+            key = _json_key("tool", tool.name, args, kwargs)
+            recorded = self._take(key)
+            if recorded is not None:
+                # Restore the code registered by the call, which later calls refer to by name
+                registered = self._code_names()
+                for name, code in recorded["codes"].items():
+                    if name not in registered:
+                        self._registry.register(Code, name, Code(code))
+                return recorded["output"]
+
+            registered = self._code_names()
+            with self._registry.activate():
+                output = forward(*args, **kwargs)
+            codes = {name: code.code for name, code in self._code_entries().items() if name not in registered}
+            self._append(key, {"output": output, "codes": codes})
+            return output
+
+        tool.forward = journaled_forward
+
+    def _code_entries(self) -> Dict[str, Code]:
+        return {uri.split("://", 1)[1]: code for uri, code in self._registry.get_all(Code).items()}
+
+    def _code_names(self) -> set:
+        return set(self._code_entries())
+
+    def _take(self, key: str) -> Optional[Any]:
+        """Return the next recorded result of a call, or None if the call must be made live."""
+        with self._lock:
+            recorded = self._replay.get(key)
+            if not recorded:
+                self.live_calls += 1
+                return None
+            self.replayed_calls += 1
+            return json.loads(recorded.popleft())
+
+    def _append(self, key: str, value: Any) -> None:
+        line = json.dumps({"key": key, "value": json.dumps(value, default=str)})
+        with self._lock:
+            with open(self.journal_file, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _load_journal(self) -> None:
+        if not self.journal_file.exists():
+            return
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash: the call is made again
+                    logger.debug(f"Ignoring a truncated entry of {self.journal_file}")
+                    continue
+                self._replay[entry["key"]].append(entry["value"])
+
+    def _record_step(self, step: Any, agent: Any) -> None:
+        record = {
+            "agent": getattr(agent, "name", None),
+            "step_number": step.step_number,
+            "model_output": step.model_output,
+            "tool_calls": [tool_call.dict() for tool_call in step.tool_calls or []],
+            "observations": step.observations,
+            "error": str(step.error) if step.error else None,
+            "is_final_answer": step.is_final_answer,
+        }
+        with self._lock:
+            with open(self.steps_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def steps(self) -> List[Dict[str, Any]]:
+        """
+        Return the memory of the agent steps recorded in the checkpoint.
+
+        :return: one record per agent step, in order
+        """
+        if not self.steps_file.exists():
+            return []
+        with open(self.steps_file, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _write_build(self, build: Dict[str, Any]) -> None:
+        tmp_path = self.build_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(build, f, default=str, indent=2)
+        os.replace(tmp_path, self.build_file)
+
+
+def _json_key(*parts: Any) -> str:
+    """Return the journal key of a call, a hash of everything that determines its result."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _message_payload(message: Any) -> Dict[str, Any]:
+    """Return the parts of a chat message that determine a completion."""
+    if isinstance(message, dict):
+        role, content, tool_calls = message.get("role"), message.get("content"), message.get("tool_calls")
+    else:
+        role, content, tool_calls = message.role, message.content, message.tool_calls
+    return {
+        "role": str(getattr(role, "value", role)),
+        "content": content,
+        "tool_calls": [str(tool_call) for tool_call in tool_calls or []],
+    }
+
+
+def _message_record(message: Any) -> Dict[str, Any]:
+    from smolagents.models import get_dict_from_nested_dataclasses
+
+    record = get_dict_from_nested_dataclasses(message, ignore_key="raw")
+    record["role"] = str(getattr(message.role, "value", message.role))
+    return record
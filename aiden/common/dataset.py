@@ -7,10 +7,21 @@ input and output datasets for data transformations.
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Type, get_type_hints
+from typing import Any, Dict, List, Optional, Type, get_type_hints
 
 from pydantic import BaseModel, create_model
 
+# pyarrow dataset formats of the supported dataset formats
+_ARROW_FORMATS = {
+    "csv": "csv",
+    "parquet": "parquet",
+    "json": "json",
+    "jsonl": "json",
+    "arrow": "ipc",
+    "feather": "ipc",
+    "ipc": "ipc",
+}
+
 
 @dataclass
 class Dataset:
@@ -45,6 +56,10 @@ class Dataset:
         # Store the original schema for __repr__
         self._original_schema = self.schema
 
+        # Lazily opened view of the file, with the version of the file it was opened on
+        self._arrow_dataset = None
+        self._arrow_dataset_version = None
+
         # Process schema if provided
         if self.schema is not None and not isinstance(self.schema, BaseModel):
             # Convert the schema to a Pydantic model if it's a dictionary
@@ -88,7 +103,9 @@ class Dataset:
         self._name = value
 
     def get_data(self) -> Any:
-        """Get the loaded dataset data."""
+        """Get the dataset data, loading it from the dataset file on first access if it was not set."""
+        if self._data is None and self.exists():
+            self._data = self.load()
         return self._data
 
     def set_data(self, data: Any) -> None:
@@ -112,29 +129,104 @@ class Dataset:
         return json.dumps(dataset_info, indent=2)
 
     def __len__(self) -> int:
-        """Return the number of items in the dataset."""
+        """Return the number of items in the dataset, counted from the file metadata when the data is not loaded."""
         if self._data is None:
-            return 0
+            return self.count_rows() if self.exists() else 0
         if hasattr(self._data, "__len__"):
             return len(self._data)
         return 0
 
     def __getitem__(self, idx: int) -> Any:
         """Get an item from the dataset by index."""
-        if self._data is None:
+        if self.get_data() is None:
             raise ValueError("Dataset data not loaded")
         return self._data[idx]
 
     def head(self, n: int = 5) -> Any:
-        """Return the first n items of the dataset if available."""
+        """Return the first n items of the dataset, reading only the first batches of the file if not loaded."""
         if self._data is None:
-            raise ValueError("Dataset data not loaded")
+            if not self.exists():
+                raise ValueError("Dataset data not loaded")
+            return self.to_arrow_dataset().head(n).to_pandas()
         if hasattr(self._data, "head"):  # For pandas DataFrame
             return self._data.head(n)
         if hasattr(self._data, "__getitem__"):
             return self._data[:n]
         return self._data
 
+    def exists(self) -> bool:
+        """Check if the dataset is a local file that exists."""
+        return self.is_local and Path(self.path).is_file()
+
+    def to_arrow_dataset(self):
+        """
+        Open the dataset file as a pyarrow dataset, without reading its data.
+
+        Parquet and Arrow files are memory-mapped. The view is reused until the file changes.
+
+        :return: a pyarrow.dataset.Dataset over the file
+        """
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+
+        stat = Path(self.path).stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        if self._arrow_dataset is not None and self._arrow_dataset_version == version:
+            return self._arrow_dataset
+
+        file_format = _ARROW_FORMATS.get(self.format.lower())
+        if file_format is None:
+            raise ValueError(f"Unsupported dataset format: {self.format}")
+        filesystem = fs.LocalFileSystem(use_mmap=file_format in ("parquet", "ipc"))
+        if file_format == "csv":
+            import pyarrow.csv as pv
+
+            # Read empty strings as nulls, and quoted values spanning several lines, as pandas does
+            file_format = ds.CsvFileFormat(
+                convert_options=pv.ConvertOptions(strings_can_be_null=True),
+                parse_options=pv.ParseOptions(newlines_in_values=True),
+            )
+        try:
+            dataset = ds.dataset(str(Path(self.path).resolve()), format=file_format, filesystem=filesystem)
+        except Exception:
+            if self.format.lower() not in ("json", "jsonl"):
+                raise
+            # pyarrow only reads line-delimited JSON: load other JSON documents in memory instead
+            import pandas as pd
+            import pyarrow as pa
+
+            dataset = ds.dataset(pa.Table.from_pandas(pd.read_json(self.path), preserve_index=False))
+
+        self._arrow_dataset, self._arrow_dataset_version = dataset, version
+        return dataset
+
+    def load(self, columns: Optional[List[str]] = None, filter: Any = None) -> Any:
+        """
+        Load the dataset file, reading only the requested columns and the row groups that can match the filter.
+
+        :param columns: the columns to read, all of them if None
+        :param filter: a pyarrow.compute expression selecting the rows to read, e.g. pc.field("age") > 30
+        :return: a pandas DataFrame
+        """
+        return self.to_arrow_dataset().to_table(columns=columns, filter=filter).to_pandas()
+
+    def count_rows(self, filter: Any = None) -> int:
+        """
+        Count the rows of the dataset file, from the file metadata when the format allows it.
+
+        :param filter: a pyarrow.compute expression selecting the rows to count
+        :return: the number of rows
+        """
+        return self.to_arrow_dataset().count_rows(filter=filter)
+
+    def arrow_schema(self):
+        """
+        Read the schema of the dataset file, from the file metadata when the format allows it.
+
+        :return: a pyarrow.Schema
+        """
+        return self.to_arrow_dataset().schema
+
     @staticmethod
     def map_to_basemodel(name: str, schema: dict | Type[BaseModel]) -> Type[BaseModel]:
         """
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from aiden.config import config, is_package_available
+
 
 @dataclass
 class Environment:
@@ -21,7 +23,11 @@ class Environment:
     Args:
         type: The type of environment. Supported values are 'local' and 'dagster'.
         workdir: The working directory for execution.
-        metadata: Additional environment-specific configuration.
+        metadata: Additional environment-specific configuration. Set 'isolation' to 'docker' to run the
+            generated code in containers; see DockerExecutor for the related settings. Set 'mode' to 'streaming'
+            to generate a per-batch function that the runtime feeds with batches of the first input dataset,
+            of at most 'batch_size' rows, for inputs larger than memory. Set 'engine' to 'pyarrow', 'polars' or
+            'duckdb' to generate code for that columnar compute engine instead of pandas.
     """
 
     type: str
@@ -48,6 +54,26 @@ class Environment:
         # Initialize metadata if None
         self.metadata = self.metadata or {}
 
+        if self.is_streaming and not self.is_local:
+            raise ValueError("Streaming mode is only supported in local environments")
+
+        self._validate_engine()
+
+    def _validate_engine(self) -> None:
+        """Check that the compute engine is known, supported by the environment and installed."""
+        if self.engine not in config.code_generation.engines:
+            raise ValueError(
+                f"Unsupported compute engine: {self.engine}, expected one of {config.code_generation.engines}"
+            )
+        if self.engine == "pandas":
+            return
+        # The streaming runtime and the dagster assets exchange pandas DataFrames
+        if not self.is_local or self.is_streaming:
+            raise ValueError(f"The {self.engine} engine is only supported in local environments, without streaming")
+        # Containers run the code with the packages of their image, not of this interpreter
+        if self.metadata.get("isolation") != "docker" and not is_package_available(self.engine):
+            raise ValueError(f"The {self.engine} engine requires the '{self.engine}' package to be installed")
+
     @property
     def is_local(self) -> bool:
         """Check if this is a local environment."""
@@ -58,6 +84,21 @@ class Environment:
         """Check if this is a Dagster environment."""
         return self.type == "dagster"
 
+    @property
+    def is_streaming(self) -> bool:
+        """Check if the generated code is run in streaming mode."""
+        return self.metadata.get("mode") == "streaming"
+
+    @property
+    def engine(self) -> str:
+        """Compute engine targeted by the generated code."""
+        return self.metadata.get("engine", "pandas")
+
+    @property
+    def batch_size(self) -> int:
+        """Maximum number of rows per batch in streaming mode."""
+        return int(self.metadata.get("batch_size", 100_000))
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert the environment configuration to a dictionary."""
         return {"type": self.type, "workdir": self.workdir, "metadata": self.metadata}
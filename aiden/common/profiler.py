@@ -0,0 +1,286 @@
+"""
+This module profiles dataset files, to show the agents what the data actually looks like.
+
+A profile holds per-column statistics: null counts, a HyperLogLog estimate of the number of distinct values,
+min/max, the most frequent values and a few sample values. They are computed in a single pass over the record
+batches of the file, with vectorised pyarrow and numpy operations. Profiles are cached on disk, keyed on a
+fingerprint of the file (size, modification time and a hash of its first and last blocks), so each version of a
+file is profiled once.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from aiden.common.cache import get_cache_dir
+from aiden.common.dataset import Dataset
+from aiden.config import config
+
+logger = logging.getLogger(__name__)
+
+# Size of the blocks hashed at the start and the end of a file to fingerprint it
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+# Distinct values counted per column for the most frequent values, beyond which the rarest ones are dropped
+_MAX_TRACKED_VALUES = 10_000
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch estimating the number of distinct values in a stream of 64-bit hashes.
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        Initialise an empty sketch.
+
+        :param precision: number of bits of the hash selecting a register; the standard error is 1.04 / 2^(p/2)
+        """
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """
+        Add a batch of uint64 hashes to the sketch.
+
+        :param hashes: the hashes of the values
+        """
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        value_bits = 64 - self.precision
+        indices = (hashes >> np.uint64(value_bits)).astype(np.intp)
+        # The remaining bits fit in the mantissa of a float64, so frexp gives their exact bit length
+        remaining = (hashes & np.uint64((1 << value_bits) - 1)).astype(np.float64)
+        ranks = (value_bits + 1 - np.frexp(remaining)[1]).astype(np.uint8)
+        np.maximum.at(self.registers, indices, ranks)
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct values added to the sketch.
+
+        :return: the estimated cardinality
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small cardinalities: linear counting is more accurate
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class _ColumnProfiler:
+    """Accumulates the statistics of a column over record batches."""
+
+    def __init__(self, name: str, dtype: Any):
+        self.name = name
+        self.dtype = dtype
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.sketch = HyperLogLog()
+        self.counts: Counter = Counter()
+        self.samples: List[Any] = []
+
+    def update(self, array: Any) -> None:
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        self.nulls += array.null_count
+        values = pc.drop_null(array)
+        if len(values) == 0:
+            return
+
+        if _is_orderable(self.dtype):
+            min_max = pc.min_max(values)
+            low, high = min_max["min"].as_py(), min_max["max"].as_py()
+            self.min = low if self.min is None else min(self.min, low)
+            self.max = high if self.max is None else max(self.max, high)
+
+        if pa.types.is_nested(self.dtype):
+            # Nested values are not hashable: profile their string representation
+            values = pa.array([str(value) for value in values.to_pylist()])
+
+        series = values.to_pandas()
+        self.sketch.add_hashes(pd.util.hash_pandas_object(series, index=False).to_numpy())
+
+        value_counts = pc.value_counts(values)
+        self.counts.update(
+            dict(zip(value_counts.field("values").to_pylist(), value_counts.field("counts").to_pylist()))
+        )
+        if len(self.counts) > _MAX_TRACKED_VALUES:
+            self.counts = Counter(dict(self.counts.most_common(_MAX_TRACKED_VALUES // 2)))
+
+        if len(self.samples) < config.profiling.sample_values:
+            for value in value_counts.field("values").to_pylist():
+                if len(self.samples) >= config.profiling.sample_values:
+                    break
+                self.samples.append(value)
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "type": str(self.dtype),
+            "nulls": self.nulls,
+            "distinct": self.sketch.count(),
+            "min": _to_json_value(self.min),
+            "max": _to_json_value(self.max),
+            "top": [[_to_json_value(v), c] for v, c in self.counts.most_common(config.profiling.top_k)],
+            "samples": [_to_json_value(v) for v in self.samples],
+        }
+
+
+def profile_dataset(dataset: Dataset, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Profile the file of a dataset, or return its cached profile.
+
+    :param dataset: the dataset to profile
+    :param use_cache: whether to read and write the on-disk profile cache
+    :return: the profile, or None if the dataset has no readable local file
+    """
+    if not dataset.exists():
+        return None
+
+    cache_path = None
+    try:
+        if use_cache and config.profiling.cache_enabled:
+            cache_path = get_cache_dir("profiles") / f"{fingerprint(dataset)}.json"
+        if cache_path is not None and cache_path.exists():
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not read the cached profile of {dataset.path}: {e}")
+
+    try:
+        profile = _compute_profile(dataset)
+    except Exception as e:
+        logger.warning(f"Could not profile dataset {dataset.path}: {e}")
+        return None
+
+    if cache_path is not None:
+        # Write atomically so that concurrent readers never observe a partial profile
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(profile, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write the profile cache entry of {dataset.path}: {e}")
+    return profile
+
+
+def fingerprint(dataset: Dataset) -> str:
+    """
+    Fingerprint a dataset file from its size, modification time and the content of its first and last blocks.
+
+    :param dataset: the dataset whose file to fingerprint
+    :return: a hex digest identifying the version of the file and the profiling settings
+    """
+    path = Path(dataset.path)
+    stat = path.stat()
+    digest = hashlib.sha256()
+    settings = (config.profiling.max_rows, config.profiling.top_k, config.profiling.sample_values)
+    digest.update(repr((dataset.format.lower(), stat.st_size, stat.st_mtime_ns, settings)).encode("utf-8"))
+    with open(path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+        if stat.st_size > FINGERPRINT_BLOCK_SIZE:
+            f.seek(max(FINGERPRINT_BLOCK_SIZE, stat.st_size - FINGERPRINT_BLOCK_SIZE))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def format_profile(dataset: Dataset, profile: Dict[str, Any]) -> str:
+    """
+    Format a profile as compact text for the prompts.
+
+    :param dataset: the profiled dataset
+    :param profile: the profile returned by profile_dataset
+    :return: one line for the dataset, followed by one line per column
+    """
+    rows = f"{profile['rows']} rows"
+    if profile["rows_profiled"] < profile["rows"]:
+        rows += f", first {profile['rows_profiled']} profiled"
+    lines = [f"{dataset.name} ({dataset.format}, {rows}):"]
+    for column in profile["columns"]:
+        parts = [f"- {column['name']}: {column['type']}", f"nulls={column['nulls']}", f"distinct~{column['distinct']}"]
+        if column["min"] is not None:
+            parts.append(f"min={column['min']!r}, max={column['max']!r}")
+        if column["top"]:
+            parts.append("top=[" + ", ".join(f"{value!r} ({count})" for value, count in column["top"]) + "]")
+        if column["samples"]:
+            parts.append(f"samples={column['samples']!r}")
+        lines.append(", ".join(parts))
+    return "\n".join(lines)
+
+
+def describe_datasets(datasets: List[Dataset]) -> Optional[str]:
+    """
+    Profile datasets and format their profiles for the prompts, skipping datasets without a readable file.
+
+    :param datasets: the datasets to describe
+    :return: the formatted profiles, or None if profiling is disabled or no dataset could be profiled
+    """
+    if not config.profiling.enabled:
+        return None
+    descriptions = []
+    for dataset in datasets:
+        profile = profile_dataset(dataset)
+        if profile is not None:
+            descriptions.append(format_profile(dataset, profile))
+    return "\n\n".join(descriptions) or None
+
+
+def _compute_profile(dataset: Dataset) -> Dict[str, Any]:
+    """Profile a dataset file in a single pass over its record batches."""
+    arrow_dataset = dataset.to_arrow_dataset()
+    columns = [_ColumnProfiler(field.name, field.type) for field in arrow_dataset.schema]
+    max_rows = config.profiling.max_rows
+
+    rows_profiled = 0
+    for batch in arrow_dataset.to_batches():
+        if max_rows is not None and rows_profiled + batch.num_rows > max_rows:
+            batch = batch.slice(0, max_rows - rows_profiled)
+        for column, array in zip(columns, batch.columns):
+            column.update(array)
+        rows_profiled += batch.num_rows
+        if max_rows is not None and rows_profiled >= max_rows:
+            break
+
+    rows = rows_profiled if max_rows is None or rows_profiled < max_rows else arrow_dataset.count_rows()
+    return {
+        "format": dataset.format,
+        "rows": rows,
+        "rows_profiled": rows_profiled,
+        "columns": [column.result() for column in columns],
+    }
+
+
+def _is_orderable(dtype: Any) -> bool:
+    import pyarrow as pa
+
+    return (
+        pa.types.is_integer(dtype)
+        or pa.types.is_floating(dtype)
+        or pa.types.is_decimal(dtype)
+        or pa.types.is_temporal(dtype)
+        or pa.types.is_string(dtype)
+        or pa.types.is_large_string(dtype)
+    )
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convert a value read from a dataset to a JSON-serialisable value, keeping basic types as they are."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        if isinstance(value, float) and not np.isfinite(value):
+            return str(value)
+        return value
+    return str(value)
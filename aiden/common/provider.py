@@ -5,17 +5,35 @@ logging and retry mechanisms for querying the providers.
 
 import logging
 import textwrap
-from typing import Optional, Type
+import time
+from typing import Callable, Dict, Optional, Type
 
-import litellm
-from litellm import completion
-from litellm.utils import supports_response_schema
-from litellm.exceptions import RateLimitError, ServiceUnavailableError
 from pydantic import BaseModel
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from aiden.common.cache import ResponseCache, get_response_cache
+from aiden.common.rate_limiter import RateLimiter, get_rate_limiter
+from aiden.common.usage import UsageLedger, UsageRecord
+from aiden.common.utils.lazy import lazy_import
+from aiden.config import config
+
 logger = logging.getLogger(__name__)
 
+# litellm takes seconds to import, so it is only loaded when a provider is first created
+litellm = lazy_import("litellm")
+
+
+def completion(**kwargs):
+    return litellm.completion(**kwargs)
+
+
+async def acompletion(**kwargs):
+    return await litellm.acompletion(**kwargs)
+
+
+def supports_response_schema(model: str) -> bool:
+    return litellm.supports_response_schema(model=model)
+
 
 class ProviderConfig:
     """
@@ -70,7 +88,14 @@ class Provider:
     Base class for LiteLLM provider.
     """
 
-    def __init__(self, model: str | None = None):
+    def __init__(
+        self,
+        model: str | None = None,
+        cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        ledger: UsageLedger | None = None,
+        role: str = "tool",
+    ):
         default_model = "openai/gpt-4o-mini"
         self.model = model or default_model
         if "/" not in self.model:
@@ -81,16 +106,100 @@ class Provider:
             raise ValueError(f"Model {self.model} does not support passing response_format")
         if not supports_response_schema(model=self.model):
             raise ValueError(f"Model {self.model} does not support response schema")
+        # Responses are cached on disk unless caching is disabled in the configuration
+        if cache is None and config.cache.response_cache_enabled:
+            cache = get_response_cache()
+        self.cache = cache
+        # Providers querying the same model share a rate budget across the whole process
+        self.rate_limiter = rate_limiter or get_rate_limiter(self.model)
+        # Calls are recorded in the ledger of the build the provider is created in, or else the one it is used in
+        self.ledger = ledger or UsageLedger.current()
+        self.role = role
 
-    def _make_completion_call(self, messages, response_format):
+    def _make_completion_call(self, messages, response_format, usage: Dict[str, int] | None = None):
         """Helper method to make the actual API call with built-in retries for rate limits"""
-        response = completion(model=self.model, messages=messages, response_format=response_format)
+        try:
+            with self.rate_limiter.limit():
+                response = completion(model=self.model, messages=messages, response_format=response_format)
+        except litellm.RateLimitError:
+            # Make every caller sharing this model back off, not only the one that hit the limit
+            self.rate_limiter.penalize(config.rate_limit.rate_limit_cooldown_seconds)
+            raise
+
+        _add_usage(usage, response)
+        if not response.choices[0].message.content:
+            raise ValueError("Empty response from provider")
+        # Malformed or truncated structured responses are retried, and never cached
+        _check_response_format(response.choices[0].message.content, response_format)
+
+        return response.choices[0].message.content
+
+    async def _amake_completion_call(self, messages, response_format, usage: Dict[str, int] | None = None):
+        """Asynchronous counterpart of _make_completion_call, backed by litellm.acompletion"""
+        try:
+            async with self.rate_limiter.alimit():
+                response = await acompletion(model=self.model, messages=messages, response_format=response_format)
+        except litellm.RateLimitError:
+            self.rate_limiter.penalize(config.rate_limit.rate_limit_cooldown_seconds)
+            raise
 
+        _add_usage(usage, response)
         if not response.choices[0].message.content:
             raise ValueError("Empty response from provider")
+        _check_response_format(response.choices[0].message.content, response_format)
 
         return response.choices[0].message.content
 
+    @staticmethod
+    def _with_retries(fn: Callable, retries: int) -> Callable:
+        """
+        Wrap a zero-argument callable, synchronous or asynchronous, with the provider retry policy: service
+        errors are retried with a long backoff, and any error is retried up to 'retries' times.
+        """
+        retry_service_errors = retry(
+            stop=stop_after_attempt(5),
+            wait=wait_exponential(multiplier=2, min=4),
+            retry=retry_if_exception_type((litellm.RateLimitError, litellm.ServiceUnavailableError)),
+        )
+        retry_all_errors = retry(stop=stop_after_attempt(retries), wait=wait_exponential(multiplier=2))
+        return retry_all_errors(retry_service_errors(fn))
+
+    def _cache_key(
+        self, system_message: str, user_message: str, response_format: Type[BaseModel] | None, use_cache: bool
+    ) -> str | None:
+        """Return the response cache key for a request, or None if the cache is not used for it."""
+        if not use_cache or self.cache is None:
+            return None
+        return self.cache.make_key(self.model, system_message, user_message, response_format)
+
+    def _get_cached(self, cache_key: str | None, response_format: Type[BaseModel] | None) -> str | None:
+        """Return the cached response for a key, if any, dropping it if it does not match the response format."""
+        if cache_key is None:
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return None
+        try:
+            _check_response_format(cached, response_format)
+        except ValueError:
+            logger.debug(f"Dropping malformed cached response for {self.model} ({cache_key[:12]})")
+            self.cache.delete(cache_key)
+            return None
+        logger.debug(f"Response cache hit for {self.model} ({cache_key[:12]})")
+        return cached
+
+    def forget(self, system_message: str, user_message: str, response_format: Type[BaseModel] | None = None) -> None:
+        """
+        Remove the cached response of a request, for callers that could not use the response it returned.
+
+        :param [str] system_message: The system message of the request.
+        :param [str] user_message: The user message of the request.
+        :param [Type[BaseModel]] response_format: The response format of the request.
+        """
+        cache_key = self._cache_key(system_message, user_message, response_format, True)
+        if cache_key is not None:
+            self.cache.delete(cache_key)
+
     def query(
         self,
         system_message: str,
@@ -98,6 +207,7 @@ class Provider:
         response_format: Type[BaseModel] | None = None,
         retries: int = 3,
         backoff: bool = True,
+        use_cache: bool = True,
     ) -> str:
         """
         Method to query the provider using litellm.completion.
@@ -107,38 +217,124 @@ class Provider:
         :param [Type[BaseModel]] response_format: A pydantic BaseModel class representing the response format.
         :param [int] retries: The number of times to retry the request. Defaults to 3.
         :param [bool] backoff: Whether to use exponential backoff when retrying. Defaults to True.
+        :param [bool] use_cache: Whether to read and write the response cache. Defaults to True, so identical
+            requests get the same response; pass False for requests that are deliberately repeated.
         :return [str]: The response from the provider.
         """
         self._log_request(system_message, user_message, self.__class__.__name__)
+        start = time.monotonic()
+
+        cache_key = self._cache_key(system_message, user_message, response_format, use_cache)
+        cached = self._get_cached(cache_key, response_format)
+        if cached is not None:
+            self._record_usage(start, cache_hit=True)
+            return cached
 
         messages = [{"role": "system", "content": system_message}, {"role": "user", "content": user_message}]
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "attempts": 0}
+
+        def call():
+            usage["attempts"] += 1
+            return self._make_completion_call(messages, response_format, usage)
 
         try:
             # Handle general errors with standard retries
             if backoff:
+                r = self._with_retries(call, retries)()
+            else:
+                r = call()
 
-                @retry(stop=stop_after_attempt(retries), wait=wait_exponential(multiplier=2))
-                def call_with_backoff_retry_all_errors():
-                    @retry(
-                        stop=stop_after_attempt(5),
-                        wait=wait_exponential(multiplier=2, min=4),
-                        retry=retry_if_exception_type((RateLimitError, ServiceUnavailableError)),
-                    )
-                    def call_with_backoff_retry_service_errors():
-                        return self._make_completion_call(messages, response_format)
+            self._log_response(r, self.__class__.__name__)
+            self._record_usage(start, usage)
+            if cache_key is not None:
+                self.cache.set(cache_key, r, model=self.model)
+            return r
+        except Exception as e:
+            self._log_error(e)
+            self._record_usage(start, usage, error=e)
+            raise e
+
+    async def aquery(
+        self,
+        system_message: str,
+        user_message: str,
+        response_format: Type[BaseModel] | None = None,
+        retries: int = 3,
+        backoff: bool = True,
+        use_cache: bool = True,
+    ) -> str:
+        """
+        Method to query the provider asynchronously using litellm.acompletion.
 
-                    return call_with_backoff_retry_service_errors()
+        Concurrent calls share the process-wide rate limiter of the model, so many queries can be fanned out
+        with asyncio.gather without exceeding the configured concurrency or request rate.
 
-                r = call_with_backoff_retry_all_errors()
+        :param [str] system_message: The system message to send to the provider.
+        :param [str] user_message: The user message to send to the provider.
+        :param [Type[BaseModel]] response_format: A pydantic BaseModel class representing the response format.
+        :param [int] retries: The number of times to retry the request. Defaults to 3.
+        :param [bool] backoff: Whether to use exponential backoff when retrying. Defaults to True.
+        :param [bool] use_cache: Whether to read and write the response cache. Defaults to True, so identical
+            requests get the same response; pass False for requests that are deliberately repeated.
+        :return [str]: The response from the provider.
+        """
+        self._log_request(system_message, user_message, self.__class__.__name__)
+        start = time.monotonic()
+
+        cache_key = self._cache_key(system_message, user_message, response_format, use_cache)
+        cached = self._get_cached(cache_key, response_format)
+        if cached is not None:
+            self._record_usage(start, cache_hit=True)
+            return cached
+
+        messages = [{"role": "system", "content": system_message}, {"role": "user", "content": user_message}]
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "attempts": 0}
+
+        async def call():
+            usage["attempts"] += 1
+            return await self._amake_completion_call(messages, response_format, usage)
+
+        try:
+            if backoff:
+                r = await self._with_retries(call, retries)()
             else:
-                r = self._make_completion_call(messages, response_format)
+                r = await call()
 
             self._log_response(r, self.__class__.__name__)
+            self._record_usage(start, usage)
+            if cache_key is not None:
+                self.cache.set(cache_key, r, model=self.model)
             return r
         except Exception as e:
             self._log_error(e)
+            self._record_usage(start, usage, error=e)
             raise e
 
+    def _record_usage(
+        self,
+        start: float,
+        usage: Dict[str, int] | None = None,
+        cache_hit: bool = False,
+        error: Exception | None = None,
+    ) -> None:
+        """Record the usage of a query in the ledger of the current build, if any."""
+        ledger = self.ledger or UsageLedger.current()
+        if ledger is None:
+            return
+        usage = usage or {}
+        ledger.record(
+            UsageRecord(
+                model=self.model,
+                role=self.role,
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                latency=time.monotonic() - start,
+                retries=max(usage.get("attempts", 1) - 1, 0),
+                cache_hit=cache_hit,
+                error=str(error)[:200] if error is not None else None,
+            )
+        )
+
     @staticmethod
     def _log_request(system_message: str, user_message: str, model):
         """
@@ -174,3 +370,21 @@ class Provider:
         :param [str] error: The error from the provider.
         """
         logger.error(f"Error querying provider: {error}")
+
+
+def _add_usage(usage: Dict[str, int] | None, response) -> None:
+    """Add the tokens reported by a completion response to the usage of a query; failed attempts also count."""
+    if usage is None:
+        return
+    response_usage = getattr(response, "usage", None)
+    for key in ("prompt_tokens", "completion_tokens"):
+        tokens = getattr(response_usage, key, None)
+        if isinstance(tokens, int):
+            usage[key] += tokens
+
+
+def _check_response_format(response: str, response_format: Type[BaseModel] | None) -> None:
+    """Raise a ValueError if a structured response does not parse to its response format."""
+    if response_format is not None:
+        # pydantic's ValidationError is a ValueError
+        response_format.model_validate_json(response)
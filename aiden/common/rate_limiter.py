@@ -0,0 +1,148 @@
+"""
+This module provides a process-wide rate limiter shared by all providers querying the same model.
+
+The limiter combines a concurrency bound (a semaphore) with an optional token bucket on requests per minute.
+When a provider reports a rate limit error, the limiter is put in cooldown so that every caller in the process
+backs off together, instead of each one retrying independently against an exhausted quota.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+
+from aiden.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Thread-safe concurrency and request-rate limiter usable from both synchronous and asynchronous code.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: Optional[float] = None):
+        """
+        Initialise the rate limiter.
+
+        :param max_concurrency: maximum number of requests allowed in flight at the same time
+        :param requests_per_minute: sustained request rate allowed by the token bucket; None for no rate limit
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        # The bucket holds at most one minute worth of requests and starts full
+        self._capacity = float(requests_per_minute) if requests_per_minute else 0.0
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _try_acquire(self) -> float:
+        """
+        Try to take a concurrency slot and a token; must be called with the condition held.
+
+        :return: 0 if the slot was acquired, otherwise the suggested time to wait before trying again
+        """
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._in_flight >= self.max_concurrency:
+            return 0.05
+
+        if self.requests_per_minute:
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._last_refill) * self.requests_per_minute / 60.0
+            )
+            self._last_refill = now
+            if self._tokens < 1.0:
+                return (1.0 - self._tokens) * 60.0 / self.requests_per_minute
+            self._tokens -= 1.0
+
+        self._in_flight += 1
+        return 0.0
+
+    def acquire(self) -> None:
+        """
+        Block until a request may be sent.
+        """
+        with self._condition:
+            while (wait := self._try_acquire()) > 0:
+                self._condition.wait(timeout=wait)
+
+    async def aacquire(self) -> None:
+        """
+        Wait, without blocking the event loop, until a request may be sent.
+        """
+        while True:
+            with self._condition:
+                wait = self._try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self) -> None:
+        """
+        Release a concurrency slot taken by acquire or aacquire.
+        """
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._condition.notify()
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Stop handing out slots for the given duration, e.g. after the provider returned a rate limit error.
+
+        :param seconds: the cooldown duration
+        """
+        with self._condition:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            # Drain the bucket so that requests resume gradually after the cooldown
+            self._tokens = 0.0
+        logger.debug(f"Rate limiter in cooldown for {seconds}s")
+
+    @contextmanager
+    def limit(self):
+        """
+        Context manager holding a slot for the duration of a synchronous request.
+        """
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def alimit(self):
+        """
+        Async context manager holding a slot for the duration of an asynchronous request.
+        """
+        await self.aacquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """
+    Return the process-wide rate limiter for a model, creating it from the configuration if needed.
+
+    :param model: the model identifier, in the format 'provider/model'
+    :return: the shared RateLimiter instance for the model
+    """
+    with _rate_limiters_lock:
+        if model not in _rate_limiters:
+            _rate_limiters[model] = RateLimiter(
+                max_concurrency=config.rate_limit.max_concurrent_requests,
+                requests_per_minute=config.rate_limit.requests_per_minute,
+            )
+        return _rate_limiters[model]
@@ -0,0 +1,331 @@
+"""
+This module generates synthetic datasets from their schemas, to exercise generated transformations at realistic
+volume before they are deployed.
+
+Values are generated column by column with vectorised numpy and pyarrow operations, from the type of each schema field and
+hints taken from the column name: identifiers are unique, emails, phone numbers, names, places, statuses and dates
+look like real values, and amounts follow a skewed distribution. A small fraction of the rows is replaced with
+edge cases, boundary values and values drawn from hypothesis strategies, such as empty or unicode strings, so that
+the transformations are also exercised on unusual inputs. Columns can reference a column of another dataset, e.g.
+an 'EmployeeID' foreign key, to keep joins between synthetic datasets meaningful; such references can be inferred
+from real datasets sharing a column.
+"""
+
+import datetime
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+from aiden.common.dataset import Dataset
+from aiden.common.utils.output_validation import schema_fields
+
+# Vocabularies of the values generated for string columns, chosen from hints in the column name
+_FIRST_NAMES = ["Linda", "Carlos", "Sarah", "James", "Aiko", "Omar", "Priya", "Lukas", "Chloe", "Mateo", "Zoe", "Ivan"]
+_LAST_NAMES = ["Johnson", "Rivera", "Morris", "Lee", "Tanaka", "Haddad", "Patel", "Muller", "Martin", "Silva", "Kim"]
+_COMPANIES = ["ABC Corp", "XYZ Ltd", "Delta Inc", "FastNet Solutions", "Blue Harbor", "Northwind", "Acme", "Globex"]
+_PRODUCTS = ["CRM Software", "Analytics Platform", "Cloud Services", "Consulting", "Support Plan", "Data Warehouse"]
+_CITIES = ["Paris", "New York", "Tokyo", "Berlin", "Sao Paulo", "Nairobi", "Sydney", "Toronto", "Mumbai", "Madrid"]
+_COUNTRIES = ["France", "United States", "Japan", "Germany", "Brazil", "Kenya", "Australia", "Canada", "India"]
+_REGIONS = ["North", "South", "East", "West", "Central"]
+_STATUSES = ["Active", "Inactive", "Pending", "Completed", "Canceled"]
+_DOMAINS = ["example.com", "mail.com", "corp.io", "test.org"]
+
+# Edge cases of each type, mixed with values drawn from hypothesis strategies
+_EDGE_CASES = {
+    int: [0, 1, -1, 2**31 - 1, -(2**31)],
+    float: [0.0, -0.0, 1e-9, -1e-9, 1e12, -1e12],
+    str: ["", " ", "a,b", 'quote " inside', "line\nbreak", "Ünïcødé ✓", "x" * 1000],
+    bool: [True, False],
+    datetime.datetime: [datetime.datetime(1970, 1, 1), datetime.datetime(2024, 2, 29, 23, 59, 59)],
+    datetime.date: [datetime.date(1970, 1, 1), datetime.date(2024, 2, 29)],
+}
+
+# Values drawn from the hypothesis strategy of each type
+_HYPOTHESIS_EXAMPLES = 20
+
+_START_DATE = np.datetime64("2015-01-01")
+_DATE_RANGE_DAYS = 10 * 365
+
+
+@dataclass
+class Reference:
+    """
+    A column whose values are drawn from a column of another dataset, to keep joins between datasets meaningful.
+
+    :param dataset: the referenced dataset, whose file must exist, e.g. generated first
+    :param column: the referenced column of that dataset
+    """
+
+    dataset: Dataset
+    column: str
+
+
+def generate_dataset(
+    dataset: Dataset,
+    rows: int,
+    references: Optional[Dict[str, Reference]] = None,
+    null_fraction: float = 0.05,
+    edge_case_fraction: float = 0.001,
+    seed: Optional[int] = None,
+) -> Dataset:
+    """
+    Generate synthetic rows matching the schema of a dataset, and write them to the dataset file.
+
+    :param dataset: the dataset to generate, with a schema; its path and format define the file written
+    :param rows: the number of rows to generate
+    :param references: the columns whose values are drawn from a column of another dataset, by column name
+    :param null_fraction: the fraction of nulls in the optional fields
+    :param edge_case_fraction: the fraction of the rows of each column replaced with edge cases
+    :param seed: the seed of the random generator, for reproducible datasets
+    :return: the dataset, whose file now holds the generated rows
+    :raises ValueError: if the dataset has no schema, or a field has a type that cannot be generated
+    """
+    fields = schema_fields(dataset)
+    if not fields:
+        raise ValueError(f"Dataset {dataset.name} has no schema to generate data from")
+
+    rng = np.random.default_rng(seed)
+    references = references or {}
+    columns = {}
+    for column, (annotation, optional) in fields.items():
+        if column in references:
+            values = _referenced_values(references[column], rows, rng)
+        else:
+            values = _generate_column(column, annotation, rows, rng)
+            if not _is_identifier(column) and edge_case_fraction > 0:
+                values = _with_edge_cases(values, annotation, edge_case_fraction, dataset.format.lower(), rng)
+        if optional and null_fraction > 0:
+            values = _with_nulls(values, null_fraction, rng)
+        columns[column] = values
+
+    _write(dataset, columns)
+    return dataset
+
+
+def infer_references(datasets: List[Dataset]) -> Dict[str, Dict[str, Reference]]:
+    """
+    Infer the foreign keys between real datasets, to generate synthetic copies of them that still join.
+
+    A column of a dataset references the column of the same name of another dataset when the values of the other
+    column are unique, and hold every value of the column. Columns that cannot be read are ignored.
+
+    :param datasets: the real datasets, whose files exist
+    :return: the references of the columns of each dataset, by dataset name and column name
+    """
+    columns: Dict[str, Dict[str, pa.Array]] = {}
+    for dataset in datasets:
+        fields = schema_fields(dataset)
+        try:
+            arrow_dataset = dataset.to_arrow_dataset()
+            names = [name for name in arrow_dataset.schema.names if not fields or name in fields]
+            table = arrow_dataset.to_table(columns=names)
+        except Exception:
+            continue
+        columns[dataset.name] = {name: pc.drop_null(table.column(name).combine_chunks()) for name in names}
+
+    references: Dict[str, Dict[str, Reference]] = {}
+    for dataset in datasets:
+        for column, values in columns.get(dataset.name, {}).items():
+            for other in datasets:
+                keys = columns.get(other.name, {}).get(column)
+                if other is dataset or keys is None or len(keys) == 0 or len(values) == 0:
+                    continue
+                try:
+                    if not _is_key_of(keys, values):
+                        continue
+                    # Columns holding the same unique values both are keys: the first dataset is the referenced one
+                    if datasets.index(other) > datasets.index(dataset) and _is_key_of(values, keys):
+                        continue
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    continue
+                references.setdefault(dataset.name, {})[column] = Reference(other, column)
+                break
+    return references
+
+
+def _is_key_of(keys: pa.Array, values: pa.Array) -> bool:
+    """Whether a column has unique values that hold every value of another column."""
+    return len(pc.unique(keys)) == len(keys) and pc.all(pc.is_in(values, value_set=keys)).as_py()
+
+
+def _generate_column(column: str, annotation: Any, rows: int, rng: np.random.Generator) -> pa.Array:
+    """Generate the values of a column from its type and hints in its name."""
+    name = column.lower()
+    if annotation is bool:
+        return pa.array(rng.random(rows) < 0.5)
+    if annotation is int:
+        if _is_identifier(column):
+            return pa.array(np.arange(1, rows + 1, dtype=np.int64))
+        if "year" in name:
+            return pa.array(rng.integers(2000, 2031, rows))
+        if "age" in name:
+            return pa.array(rng.integers(18, 90, rows))
+        return pa.array(rng.integers(0, 100_000, rows))
+    if annotation is float:
+        if any(hint in name for hint in ("percent", "rate", "ratio", "score")):
+            return pa.array(np.round(rng.random(rows) * 100, 2))
+        # Amounts, prices and other quantities are skewed: mostly small, with a long tail
+        return pa.array(np.round(rng.lognormal(mean=8, sigma=1.5, size=rows), 2))
+    if annotation is datetime.datetime:
+        seconds = rng.integers(0, _DATE_RANGE_DAYS * 86400, rows)
+        return pa.array(_START_DATE.astype("datetime64[s]") + seconds.astype("timedelta64[s]"))
+    if annotation is datetime.date:
+        return pa.array(_START_DATE + rng.integers(0, _DATE_RANGE_DAYS, rows).astype("timedelta64[D]"))
+    if annotation is str:
+        return _generate_strings(column, rows, rng)
+    raise ValueError(f"Cannot generate values of type {annotation} for column '{column}'")
+
+
+def _generate_strings(column: str, rows: int, rng: np.random.Generator) -> pa.Array:
+    """Generate string values that look like the values of a column, from hints in its name."""
+    name = column.lower()
+    if _is_identifier(column):
+        # Unique identifiers, prefixed like 'S0000001'
+        return _join(column[0].upper(), _digits(np.arange(1, rows + 1), 7))
+    if "email" in name:
+        first = pc.utf8_lower(_choice(_FIRST_NAMES, rows, rng))
+        last = pc.utf8_lower(_choice(_LAST_NAMES, rows, rng))
+        return _join(first, ".", last, _digits(rng.integers(0, 1000, rows)), "@", _choice(_DOMAINS, rows, rng))
+    if "phone" in name:
+        return _join("555-", _digits(rng.integers(0, 10_000, rows), 4))
+    if "date" in name or name.endswith("_at"):
+        days = rng.integers(0, _DATE_RANGE_DAYS, rows).astype("timedelta64[D]")
+        return pc.cast(pa.array(_START_DATE + days), pa.string())
+    if "month" in name:
+        return _choice([datetime.date(2000, month, 1).strftime("%B") for month in range(1, 13)], rows, rng)
+    if "first" in name:
+        return _choice(_FIRST_NAMES, rows, rng)
+    if "last" in name or "surname" in name:
+        return _choice(_LAST_NAMES, rows, rng)
+    if any(hint in name for hint in ("client", "company", "customer", "account")):
+        return _choice(_COMPANIES, rows, rng)
+    if "name" in name or any(hint in name for hint in ("manager", "trainer", "owner")):
+        return _join(_choice(_FIRST_NAMES, rows, rng), " ", _choice(_LAST_NAMES, rows, rng))
+    if "product" in name:
+        return _choice(_PRODUCTS, rows, rng)
+    if "city" in name:
+        return _choice(_CITIES, rows, rng)
+    if "country" in name:
+        return _choice(_COUNTRIES, rows, rng)
+    if "region" in name:
+        return _choice(_REGIONS, rows, rng)
+    if "status" in name:
+        return _choice(_STATUSES, rows, rng)
+    # Other strings are categorical, with a skewed distribution over a realistic number of distinct values
+    return _join(f"{column}_", _digits(rng.zipf(1.5, rows).clip(max=1000)))
+
+
+def _referenced_values(reference: Reference, rows: int, rng: np.random.Generator) -> pa.Array:
+    """Draw the values of a column from the values of the referenced column."""
+    table = reference.dataset.to_arrow_dataset().to_table(columns=[reference.column])
+    values = pc.unique(pc.drop_null(table.column(reference.column).combine_chunks()))
+    if len(values) == 0:
+        raise ValueError(f"Referenced column '{reference.column}' of {reference.dataset.name} has no values")
+    return values.take(pa.array(rng.integers(0, len(values), rows)))
+
+
+def _with_edge_cases(
+    values: pa.Array, annotation: Any, fraction: float, file_format: str, rng: np.random.Generator
+) -> pa.Array:
+    """Replace a fraction of the values with edge cases of their type."""
+    count = min(int(len(values) * fraction), len(values))
+    cases = _edge_cases(annotation, int(rng.integers(0, 2**32)))
+    if file_format == "csv":
+        # Strings that CSV readers read back as nulls are not edge cases of a string, but nulls
+        null_values = set(pv.ConvertOptions().null_values)
+        cases = [case for case in cases if not (isinstance(case, str) and case.strip() in null_values)]
+    if count == 0 or not cases:
+        return values
+    mask = np.zeros(len(values), dtype=bool)
+    mask[rng.choice(len(values), size=count, replace=False)] = True
+    replacements = pa.array([cases[i] for i in rng.integers(0, len(cases), count)], type=values.type)
+    return pc.replace_with_mask(values, pa.array(mask), replacements)
+
+
+def _edge_cases(annotation: Any, seed: int) -> List[Any]:
+    """Return boundary values of a type, with a few values drawn from the matching hypothesis strategy."""
+    from hypothesis import HealthCheck, Phase, given, settings
+    from hypothesis import seed as hypothesis_seed
+    from hypothesis import strategies as st
+
+    cases = list(_EDGE_CASES.get(annotation, []))
+    strategies = {
+        int: st.integers(min_value=-(2**31), max_value=2**31 - 1),
+        float: st.floats(allow_nan=False, allow_infinity=False, width=32),
+        # Any printable text; control characters are not data that transformations are expected to handle
+        str: st.text(st.characters(exclude_categories=("Cc", "Cs")), max_size=50),
+    }
+    if annotation not in strategies:
+        return cases
+
+    # Run the strategy through the hypothesis engine, only to collect the values it generates from the seed
+    @hypothesis_seed(seed)
+    @settings(
+        max_examples=_HYPOTHESIS_EXAMPLES,
+        database=None,
+        phases=[Phase.generate],
+        suppress_health_check=list(HealthCheck),
+        deadline=None,
+    )
+    @given(strategies[annotation])
+    def collect(value):
+        cases.append(value)
+
+    collect()
+    return cases
+
+
+def _with_nulls(values: pa.Array, fraction: float, rng: np.random.Generator) -> pa.Array:
+    """Replace a fraction of the values with nulls."""
+    mask = pa.array(rng.random(len(values)) < fraction)
+    return pc.if_else(mask, pa.scalar(None, type=values.type), values)
+
+
+def _is_identifier(column: str) -> bool:
+    return column.lower() == "id" or column.endswith("ID") or column.lower().endswith("_id")
+
+
+def _choice(vocabulary: List[str], rows: int, rng: np.random.Generator) -> pa.Array:
+    return pa.array(vocabulary).take(pa.array(rng.integers(0, len(vocabulary), rows)))
+
+
+def _digits(numbers: np.ndarray, width: int = 0) -> pa.Array:
+    """Format integers as strings, left-padded with zeros to a width."""
+    strings = pc.cast(pa.array(numbers), pa.string())
+    return pc.utf8_lpad(strings, width=width, padding="0") if width else strings
+
+
+def _join(*parts: Any) -> pa.Array:
+    """Concatenate string arrays and constant strings element-wise."""
+    return pc.binary_join_element_wise(*parts, "")
+
+
+def _write(dataset: Dataset, columns: Dict[str, pa.Array]) -> None:
+    """Write the generated columns to the dataset file, in the dataset format."""
+    table = pa.table(columns)
+    path = Path(dataset.path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_format = dataset.format.lower()
+    if file_format == "csv":
+        pv.write_csv(table, path)
+    elif file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    elif file_format in ("json", "jsonl"):
+        # JSON has no date type: write dates and timestamps as ISO 8601 strings
+        for index, field in enumerate(table.schema):
+            if pa.types.is_date(field.type) or pa.types.is_timestamp(field.type):
+                table = table.set_column(index, field.name, pc.cast(table.column(index), pa.string()))
+        table.to_pandas().to_json(path, orient="records", lines=True, force_ascii=False)
+    elif file_format in ("arrow", "feather", "ipc"):
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path)
+    else:
+        raise ValueError(f"Unsupported dataset format: {dataset.format}")
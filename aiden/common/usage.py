@@ -0,0 +1,180 @@
+"""
+This module accounts for the LLM calls made during a build: their tokens, cost, latency, retries and cache hits.
+
+Each build has a usage ledger, registered in the registry of the build, which collects one record per LLM call.
+The providers used by the tools and the chain of thought record their calls in the ledger of the build they run
+in, and the models of the agents are attached to the ledger directly. The totals of the ledger are broken down by
+agent role, to show which role uses the most tokens, budget and time in a build.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from aiden.common.utils.lazy import lazy_import
+from aiden.registries.objects import ObjectRegistry
+
+logger = logging.getLogger(__name__)
+
+litellm = lazy_import("litellm")
+
+# Name of the ledger in the registry of a build
+LEDGER_NAME = "build"
+
+
+@dataclass
+class UsageRecord:
+    """The usage of a single LLM call."""
+
+    model: str
+    # Agent role making the call, e.g. 'manager', 'data_expert', 'data_engineer', 'tool' or 'chain_of_thought'
+    role: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Seconds from the request to the response, including the rate limiting waits and the retries
+    latency: float = 0.0
+    retries: int = 0
+    cache_hit: bool = False
+    # Cost in USD from the litellm price list, None if the model is not priced
+    cost: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class UsageLedger:
+    """
+    Thread-safe collection of the usage records of a build, which notifies its listeners of each new record.
+    """
+
+    def __init__(self):
+        self._records: List[UsageRecord] = []
+        self._listeners: List[Callable[[UsageRecord], None]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current() -> Optional["UsageLedger"]:
+        """
+        Return the ledger of the build whose registry is active, if any.
+
+        :return: the ledger, or None outside of a build
+        """
+        try:
+            return ObjectRegistry().get(UsageLedger, LEDGER_NAME)
+        except KeyError:
+            return None
+
+    def add_listener(self, listener: Callable[[UsageRecord], None]) -> None:
+        """
+        Call a function with each record added to the ledger, e.g. to stream the records to callbacks.
+
+        :param listener: the function to call; its exceptions are logged and ignored
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def record(self, record: UsageRecord) -> None:
+        """
+        Add a record to the ledger, pricing it if it has no cost yet, and notify the listeners.
+
+        :param record: the usage of an LLM call
+        """
+        if record.cost is None and not record.cache_hit:
+            record.cost = _cost(record.model, record.prompt_tokens, record.completion_tokens)
+        with self._lock:
+            self._records.append(record)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                logger.warning(f"Error in usage listener: {str(e)[:50]}")
+
+    @property
+    def records(self) -> List[UsageRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def totals(self) -> Dict[str, Any]:
+        """
+        Return the totals of all the records of the ledger.
+
+        :return: the number of calls, tokens, cost in USD, latency in seconds, retries, cache hits and errors
+        """
+        return _summarize(self.records)
+
+    def totals_by_role(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the totals of the records of each agent role.
+
+        :return: the totals of each role, by role name
+        """
+        by_role: Dict[str, List[UsageRecord]] = {}
+        for record in self.records:
+            by_role.setdefault(record.role, []).append(record)
+        return {role: _summarize(records) for role, records in sorted(by_role.items())}
+
+    def attach(self, agent: Any, role: Optional[str] = None) -> None:
+        """
+        Record the model calls of a smolagents agent.
+
+        :param agent: a smolagents agent; managed agents must be attached separately
+        :param role: the role of the agent in the records, defaults to the name of the agent
+        """
+        model = agent.model
+        model_id = getattr(model, "model_id", None) or "unknown"
+        role = role or getattr(agent, "name", None) or "agent"
+        generate = model.generate
+
+        def recorded_generate(*args, **kwargs):
+            start = time.monotonic()
+            try:
+                message = generate(*args, **kwargs)
+            except Exception as e:
+                self.record(UsageRecord(model_id, role, latency=time.monotonic() - start, error=str(e)[:200]))
+                raise
+            token_usage = getattr(message, "token_usage", None)
+            self.record(
+                UsageRecord(
+                    model_id,
+                    role,
+                    prompt_tokens=getattr(token_usage, "input_tokens", 0) or 0,
+                    completion_tokens=getattr(token_usage, "output_tokens", 0) or 0,
+                    latency=time.monotonic() - start,
+                )
+            )
+            return message
+
+        model.generate = recorded_generate
+
+
+def _summarize(records: List[UsageRecord]) -> Dict[str, Any]:
+    """Sum the usage of a list of records."""
+    costs = [record.cost for record in records if record.cost is not None]
+    return {
+        "calls": len(records),
+        "prompt_tokens": sum(record.prompt_tokens for record in records),
+        "completion_tokens": sum(record.completion_tokens for record in records),
+        "total_tokens": sum(record.prompt_tokens + record.completion_tokens for record in records),
+        "cost_usd": round(sum(costs), 6) if costs else None,
+        "latency_seconds": round(sum(record.latency for record in records), 3),
+        "retries": sum(record.retries for record in records),
+        "cache_hits": sum(record.cache_hit for record in records),
+        "errors": sum(record.error is not None for record in records),
+    }
+
+
+def _cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Price the tokens of a call with the litellm price list, or return None if the model is not priced."""
+    if not prompt_tokens and not completion_tokens:
+        return 0.0
+    try:
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return prompt_cost + completion_cost
+    except Exception:
+        return None
@@ -5,7 +5,7 @@ This package provides a framework-agnostic way to capture, format, and display
 the chain of thought reasoning from different agent frameworks.
 """
 
-from aiden.common.utils.cot.protocol import StepSummary, ToolCall
+from aiden.common.utils.cot.protocol import StepSummarizer, StepSummary, ToolCall
 from aiden.common.utils.cot.adapters import extract_step_summary_from_smolagents
 from aiden.common.utils.cot.callable import ChainOfThoughtCallable
 from aiden.common.utils.cot.emitters import (
@@ -14,8 +14,10 @@ from aiden.common.utils.cot.emitters import (
     LoggingEmitter,
     MultiEmitter,
 )
+from aiden.common.utils.cot.summarizers import HeuristicStepSummarizer, LLMStepSummarizer
 
 __all__ = [
+    "StepSummarizer",
     "StepSummary",
     "ToolCall",
     "extract_step_summary_from_smolagents",
@@ -24,4 +26,6 @@ __all__ = [
     "ConsoleEmitter",
     "LoggingEmitter",
     "MultiEmitter",
+    "HeuristicStepSummarizer",
+    "LLMStepSummarizer",
 ]
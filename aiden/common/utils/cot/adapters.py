@@ -29,7 +29,8 @@ def extract_step_summary_from_smolagents(step: Any, agent: Any) -> StepSummary:
     # Extract common properties
     step_number = getattr(step, "step_number", None)
     step_type = step.__class__.__name__
-    error = str(getattr(step, "error", "")) or None
+    error = getattr(step, "error", None)
+    error = str(error) if error else None
 
     # Extract model output from various step types
     model_output = None
@@ -6,20 +6,21 @@ of a user-friendly output of the agent's reasoning process. The output can be us
 user feedback during agent execution.
 """
 
-import json
 import logging
-from typing import Any, List, Optional, Tuple
+import queue
+import threading
+from typing import Any, List, Optional
 
-from pydantic import BaseModel, Field
-
-from aiden.common.provider import Provider
-from aiden.config import prompt_templates
-from .protocol import StepExtractor, StepSummary
+from .protocol import StepExtractor, StepSummarizer, StepSummary
 from .adapters import extract_step_summary_from_smolagents
 from .emitters import ChainOfThoughtEmitter, ConsoleEmitter
+from .summarizers import LLMStepSummarizer
 
 logger = logging.getLogger(__name__)
 
+# Queued after the pending steps to stop the summary worker
+_STOP = object()
+
 
 class ChainOfThoughtCallable:
     """
@@ -28,12 +29,19 @@ class ChainOfThoughtCallable:
     This callable can be attached to agent frameworks to capture
     each step of the agent's reasoning process and format it for
     user-friendly output.
+
+    In background mode, the raw step is emitted immediately and the friendly summary is generated by a
+    worker thread, so that the summarisation LLM call is kept off the agent's critical path. The worker is
+    stopped by close(), and restarted if further steps are processed.
     """
 
     def __init__(
         self,
         emitter: Optional[ChainOfThoughtEmitter] = None,
         extractor: StepExtractor = extract_step_summary_from_smolagents,
+        summarizer: Optional[StepSummarizer] = None,
+        background: bool = False,
+        batch_size: int = 1,
     ):
         """
         Initialize the chain of thought callable.
@@ -41,11 +49,22 @@ class ChainOfThoughtCallable:
         Args:
             emitter: The emitter to use for outputting chain of thought
             extractor: Function that extracts step information from the agent framework
+            summarizer: Summarizer producing friendly titles and summaries, defaults to an LLM-based one
+            background: Whether to generate friendly summaries in a background worker
+            batch_size: Maximum number of queued steps summarised together in a single LLM call
         """
         self.emitter = emitter or ConsoleEmitter()
         self.extractor = extractor
+        self.summarizer = summarizer or LLMStepSummarizer()
+        self.background = background
+        self.batch_size = max(1, batch_size)
         self.steps: List[StepSummary] = []
 
+        # Emission happens from both the agent thread and the summary worker
+        self._emit_lock = threading.Lock()
+        self._queue: "queue.Queue[StepSummary]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
     def __call__(self, step: Any, agent: Any = None) -> None:
         """
         Process a step from an agent.
@@ -58,9 +77,17 @@ class ChainOfThoughtCallable:
             # Extract step summary
             summary = self.extractor(step, agent)
 
+            if self.background and (summary.friendly_title is None or summary.friendly_summary is None):
+                # Emit the raw step now and let the worker emit the friendly version when it is ready
+                self.steps.append(summary)
+                self._emit_step(summary)
+                self._ensure_worker()
+                self._queue.put(summary)
+                return
+
             # Generate friendly title and summary if not already present
             if summary.friendly_title is None or summary.friendly_summary is None:
-                friendly_title, friendly_summary = _generate_friendly_summary(summary)
+                friendly_title, friendly_summary = self.summarizer.summarize(summary)
                 summary.friendly_title = friendly_title
                 summary.friendly_summary = friendly_summary
 
@@ -79,10 +106,72 @@ class ChainOfThoughtCallable:
             # Log a shorter message at warning level
             logger.warning(f"Error processing agent step: {str(e)[:50]}")
 
+    def _ensure_worker(self) -> None:
+        """Start the background summary worker if it is not running."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._summarise_loop, name="cot-summariser", daemon=True)
+            self._worker.start()
+
+    def _summarise_loop(self) -> None:
+        """Consume queued steps and emit their friendly summaries, batching steps that are already waiting."""
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                self._queue.task_done()
+                batch.pop()
+                stopping = True
+            if not batch:
+                continue
+
+            try:
+                if len(batch) == 1:
+                    friendly = [self.summarizer.summarize(batch[0])]
+                else:
+                    friendly = self.summarizer.summarize_batch(batch)
+
+                for summary, (title, text) in zip(batch, friendly):
+                    summary.friendly_title = title
+                    summary.friendly_summary = text
+                    self._emit_step(summary)
+            except Exception as e:
+                logger.warning(f"Error summarising agent steps in background: {str(e)[:50]}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until all queued steps have been summarised and emitted."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Summarise and emit the queued steps, then stop the background worker."""
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            self._queue.put(_STOP)
+            worker.join()
+        self._worker = None
+
     def _emit_step(self, summary: StepSummary) -> None:
         """
         Emit a step to the configured emitter.
 
+        Args:
+            summary: The step summary to emit
+        """
+        with self._emit_lock:
+            self._emit_step_unlocked(summary)
+
+    def _emit_step_unlocked(self, summary: StepSummary) -> None:
+        """
+        Emit a step to the configured emitter; must be called with the emit lock held.
+
         Args:
             summary: The step summary to emit
         """
@@ -142,68 +231,5 @@ class ChainOfThoughtCallable:
 
     def clear(self) -> None:
         """Clear all captured steps."""
+        self.flush()
         self.steps = []
-
-
-def _generate_friendly_summary(summary: StepSummary) -> Tuple[str, str]:
-    """
-    Generate a user-friendly title and summary for a step using LLM.
-
-    Args:
-        summary: The step summary to generate a friendly summary for
-
-    Returns:
-        A tuple of (friendly_title, friendly_summary)
-    """
-
-    class FriendlySummaryResponse(BaseModel):
-        """Response format for generating friendly step summaries."""
-
-        title: str = Field(description="A short, friendly title (3-7 words) that captures the essence of what happened")
-        summary: str = Field(description="A concise summary (1-2 sentences) that explains the step in plain language")
-
-    # Create a context string that summarizes the step for the LLM
-    context_parts = [f"Step Type: {summary.step_type}"]
-
-    if summary.model_output:
-        context_parts.append(f"Thought: {summary.model_output}")
-
-    if summary.tool_calls:
-        for call in summary.tool_calls:
-            context_parts.append(f"Tool: {call.name}({json.dumps(call.args)})")
-
-    if summary.observations:
-        context_parts.append(f"Observation: {summary.observations}")
-
-    if summary.result:
-        context_parts.append(f"Result: {str(summary.result)}")
-
-    if summary.error:
-        context_parts.append(f"Error: {summary.error}")
-
-    context = "\n".join(context_parts)
-
-    # Get the prompt template
-    system_message = prompt_templates.cot_system()
-    user_message = prompt_templates.cot_summarize(context)
-
-    try:
-        # Use the Provider to get a structured response
-        provider = Provider()
-        response = provider.query(
-            system_message=system_message, user_message=user_message, response_format=FriendlySummaryResponse
-        )
-
-        # Parse the response to get JSON
-        response_data = json.loads(response)
-        return response_data["title"], response_data["summary"]
-    except Exception as e:
-        # Log full stack trace at debug level
-        import traceback
-
-        logger.debug(f"Error generating friendly summary: {str(e)}\n{traceback.format_exc()}")
-
-        # Log shorter message at warning level
-        logger.warning(f"Error generating friendly summary: {str(e)[:50]}")
-
-        return f"{summary.step_type}", f"Step {summary.step_number or 0} of type {summary.step_type}"
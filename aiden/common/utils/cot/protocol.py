@@ -3,7 +3,7 @@ Defines protocols and data classes for capturing agent reasoning steps.
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 
 
 @dataclass
@@ -52,3 +52,33 @@ class StepExtractor(Protocol):
             A framework-agnostic StepSummary object
         """
         ...
+
+
+class StepSummarizer(Protocol):
+    """
+    Protocol for producing user-friendly titles and summaries of agent steps.
+    """
+
+    def summarize(self, summary: StepSummary) -> Tuple[str, str]:
+        """
+        Generate a friendly title and summary for a single step.
+
+        Args:
+            summary: The step to summarize
+
+        Returns:
+            A tuple of (friendly_title, friendly_summary)
+        """
+        ...
+
+    def summarize_batch(self, summaries: List[StepSummary]) -> List[Tuple[str, str]]:
+        """
+        Generate friendly titles and summaries for several steps at once.
+
+        Args:
+            summaries: The steps to summarize
+
+        Returns:
+            A list of (friendly_title, friendly_summary) tuples, one per step and in the same order
+        """
+        ...
@@ -0,0 +1,281 @@
+"""
+This module defines Summarizers for turning agent steps into user-friendly titles and summaries.
+
+The LLM-based summarizer asks a model to describe each step, which reads well but costs one LLM call per step
+(or per batch of steps). The heuristic summarizer derives the title and summary from the step fields alone
+using rules and templates, and makes no LLM calls at all.
+"""
+
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from aiden.common.provider import Provider
+from aiden.common.usage import UsageLedger
+from aiden.config import prompt_templates
+from .protocol import StepSummary, ToolCall
+
+logger = logging.getLogger(__name__)
+
+
+class FriendlySummaryResponse(BaseModel):
+    """Response format for generating friendly step summaries."""
+
+    title: str = Field(description="A short, friendly title (3-7 words) that captures the essence of what happened")
+    summary: str = Field(description="A concise summary (1-2 sentences) that explains the step in plain language")
+
+
+class FriendlySummaryBatchResponse(BaseModel):
+    """Response format for generating friendly summaries of several steps at once."""
+
+    steps: List[FriendlySummaryResponse] = Field(description="One title and summary per step, in the given order")
+
+
+class LLMStepSummarizer:
+    """
+    Summarizer that asks an LLM for a friendly title and summary of each step.
+    """
+
+    def __init__(self, model: Optional[str] = None):
+        """
+        Initialize the LLM summarizer.
+
+        Args:
+            model: The model to use, in the format 'provider/model'; defaults to the Provider default model
+        """
+        self.model = model
+        # Steps are summarised in a background thread, outside of the build: keep the usage ledger of the build
+        self.ledger = UsageLedger.current()
+
+    def summarize(self, summary: StepSummary) -> Tuple[str, str]:
+        """
+        Generate a user-friendly title and summary for a step using LLM.
+
+        Args:
+            summary: The step summary to generate a friendly summary for
+
+        Returns:
+            A tuple of (friendly_title, friendly_summary)
+        """
+        context = _build_step_context(summary)
+
+        # Get the prompt template
+        system_message = prompt_templates.cot_system()
+        user_message = prompt_templates.cot_summarize(context)
+
+        try:
+            # Use the Provider to get a structured response
+            provider = Provider(self.model, ledger=self.ledger, role="chain_of_thought")
+            response = provider.query(
+                system_message=system_message, user_message=user_message, response_format=FriendlySummaryResponse
+            )
+
+            # Parse the response to get JSON
+            response_data = json.loads(response)
+            return response_data["title"], response_data["summary"]
+        except Exception as e:
+            # Log full stack trace at debug level
+            import traceback
+
+            logger.debug(f"Error generating friendly summary: {str(e)}\n{traceback.format_exc()}")
+
+            # Log shorter message at warning level
+            logger.warning(f"Error generating friendly summary: {str(e)[:50]}")
+
+            return _fallback_summary(summary)
+
+    def summarize_batch(self, summaries: List[StepSummary]) -> List[Tuple[str, str]]:
+        """
+        Generate user-friendly titles and summaries for several steps in a single LLM call.
+
+        Args:
+            summaries: The step summaries to generate friendly summaries for
+
+        Returns:
+            A list of (friendly_title, friendly_summary) tuples, one per step and in the same order
+        """
+        system_message = prompt_templates.cot_system()
+        user_message = prompt_templates.cot_summarize_batch([_build_step_context(summary) for summary in summaries])
+
+        try:
+            provider = Provider(self.model, ledger=self.ledger, role="chain_of_thought")
+            response = FriendlySummaryBatchResponse(
+                **json.loads(
+                    provider.query(
+                        system_message=system_message,
+                        user_message=user_message,
+                        response_format=FriendlySummaryBatchResponse,
+                    )
+                )
+            )
+            if len(response.steps) != len(summaries):
+                # Do not replay the unusable response the next time the same steps are summarised
+                provider.forget(system_message, user_message, FriendlySummaryBatchResponse)
+                raise ValueError(f"Expected {len(summaries)} summaries, got {len(response.steps)}")
+            return [(step.title, step.summary) for step in response.steps]
+        except Exception as e:
+            logger.warning(f"Error generating batched friendly summaries, summarising steps one by one: {str(e)[:50]}")
+            return [self.summarize(summary) for summary in summaries]
+
+
+class HeuristicStepSummarizer:
+    """
+    Summarizer that builds friendly titles and summaries from the step fields using rules, without any LLM call.
+    """
+
+    # Titles for the tools and managed agents used by the Aiden agents
+    TOOL_TITLES = {
+        "generate_transformation_code": "Generating transformation code",
+        "fix_transformation_code": "Fixing transformation code",
+        "execute_code": "Executing transformation code",
+        "format_final_de_agent_response": "Packaging the engineering results",
+        "format_final_manager_agent_response": "Packaging the final deliverables",
+        "final_answer": "Submitting the final answer",
+        "data_expert": "Asking the data expert for a plan",
+        "data_engineer": "Handing the plan to the data engineer",
+        "python_interpreter": "Running orchestration code",
+    }
+
+    # Titles for step types that carry no tool calls
+    STEP_TITLES = {
+        "PlanningStep": "Planning the next steps",
+        "TaskStep": "Receiving the task",
+        "FinalAnswerStep": "Submitting the final answer",
+    }
+
+    def __init__(self, max_value_length: int = 40, max_error_length: int = 120):
+        """
+        Initialize the heuristic summarizer.
+
+        Args:
+            max_value_length: Maximum length of argument values quoted in summaries
+            max_error_length: Maximum length of error messages quoted in summaries
+        """
+        self.max_value_length = max_value_length
+        self.max_error_length = max_error_length
+
+    def summarize(self, summary: StepSummary) -> Tuple[str, str]:
+        """
+        Derive a user-friendly title and summary for a step from its fields.
+
+        Args:
+            summary: The step summary to generate a friendly summary for
+
+        Returns:
+            A tuple of (friendly_title, friendly_summary)
+        """
+        title = self._title(summary)
+        sentences = [self._thought_sentence(summary), self._action_sentence(summary), self._outcome_sentence(summary)]
+        return title, " ".join(sentence for sentence in sentences if sentence)
+
+    def summarize_batch(self, summaries: List[StepSummary]) -> List[Tuple[str, str]]:
+        """
+        Derive user-friendly titles and summaries for several steps.
+
+        Args:
+            summaries: The step summaries to generate friendly summaries for
+
+        Returns:
+            A list of (friendly_title, friendly_summary) tuples, one per step and in the same order
+        """
+        return [self.summarize(summary) for summary in summaries]
+
+    def _title(self, summary: StepSummary) -> str:
+        if summary.tool_calls:
+            title = self._tool_title(summary.tool_calls[0])
+            if len(summary.tool_calls) > 1:
+                title += f" and {len(summary.tool_calls) - 1} more"
+        else:
+            title = self.STEP_TITLES.get(summary.step_type, "Reasoning about the task")
+
+        if summary.error:
+            return f"Error while {title[0].lower()}{title[1:]}"
+        return title
+
+    def _tool_title(self, call: ToolCall) -> str:
+        return self.TOOL_TITLES.get(call.name, f"Calling {call.name.replace('_', ' ')}")
+
+    def _thought_sentence(self, summary: StepSummary) -> Optional[str]:
+        if not summary.model_output:
+            return None
+        # Keep the first sentence of the model's reasoning
+        first_line = summary.model_output.strip().split("\n", 1)[0]
+        thought = first_line.split(". ", 1)[0].strip().rstrip(".")
+        for prefix in ("Thought:", "Thought"):
+            if thought.startswith(prefix):
+                thought = thought[len(prefix) :].strip()
+        if not thought:
+            return None
+        return f"I reasoned that {self._shorten(thought[0].lower() + thought[1:], 160)}."
+
+    def _action_sentence(self, summary: StepSummary) -> Optional[str]:
+        if not summary.tool_calls:
+            return None
+        actions = []
+        for call in summary.tool_calls:
+            args = self._format_args(call.args)
+            actions.append(f"'{call.name}'" + (f" with {args}" if args else ""))
+        return f"I called {', then '.join(actions)}."
+
+    def _outcome_sentence(self, summary: StepSummary) -> str:
+        if summary.error:
+            error = summary.error.strip().split("\n")[-1]
+            return f"It failed with: {self._shorten(error, self.max_error_length)}."
+        if summary.observations:
+            return f"I observed {len(summary.observations)} characters of output."
+        if summary.result is not None:
+            return f"It returned a result of type {type(summary.result).__name__}."
+        return "No output was observed."
+
+    def _format_args(self, args: Any) -> str:
+        if not isinstance(args, dict):
+            return self._shorten(str(args), self.max_value_length) if args else ""
+        parts = [
+            f"{name}={self._shorten(repr(value), self.max_value_length)}" for name, value in list(args.items())[:3]
+        ]
+        if len(args) > 3:
+            parts.append(f"and {len(args) - 3} more arguments")
+        return ", ".join(parts)
+
+    @staticmethod
+    def _shorten(text: str, limit: int) -> str:
+        text = " ".join(text.split())
+        return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _build_step_context(summary: StepSummary) -> str:
+    """
+    Create a context string that summarizes a step for the LLM.
+
+    Args:
+        summary: The step summary to describe
+
+    Returns:
+        The step context as text
+    """
+    context_parts = [f"Step Type: {summary.step_type}"]
+
+    if summary.model_output:
+        context_parts.append(f"Thought: {summary.model_output}")
+
+    if summary.tool_calls:
+        for call in summary.tool_calls:
+            context_parts.append(f"Tool: {call.name}({json.dumps(call.args)})")
+
+    if summary.observations:
+        context_parts.append(f"Observation: {summary.observations}")
+
+    if summary.result:
+        context_parts.append(f"Result: {str(summary.result)}")
+
+    if summary.error:
+        context_parts.append(f"Error: {summary.error}")
+
+    return "\n".join(context_parts)
+
+
+def _fallback_summary(summary: StepSummary) -> Tuple[str, str]:
+    """Return a generic title and summary for a step whose friendly summary could not be generated."""
+    return f"{summary.step_type}", f"Step {summary.step_number or 0} of type {summary.step_type}"
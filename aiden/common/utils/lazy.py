@@ -0,0 +1,28 @@
+"""
+Utilities for deferring the import of slow-to-import dependencies until they are used.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return a module that is only executed when one of its attributes is first accessed.
+
+    :param name: the fully qualified name of the module
+    :return: the module, loaded lazily unless it was already imported
+    :raises ModuleNotFoundError: if the module is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,227 @@
+"""
+This module validates the output file written by a transformation against the schema of the output dataset.
+
+The file is read with pyarrow, one record batch at a time and only for the columns of the schema, and each check is
+a vectorised pyarrow compute operation over a whole batch: the columns and their order, the coercibility of each
+column to the type of the matching schema field, and the absence of nulls in the fields that are not optional, except
+for string fields of text formats, where nulls cannot be told apart from empty strings. The
+problems found are returned as structured records, so that the agents can fix the code that produced the output.
+"""
+
+import datetime
+import types
+import typing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiden.common.dataset import _ARROW_FORMATS, Dataset
+
+# Formats whose files do not record types: every scalar value was written as text, and can be read back as a string
+_TEXT_FORMATS = {"csv"}
+
+
+@dataclass
+class SchemaProblem:
+    """A mismatch between an output file and the schema of the output dataset."""
+
+    # One of 'missing_file', 'unreadable', 'missing_columns', 'unexpected_columns', 'column_order', 'type', 'nulls'
+    kind: str
+    message: str
+    column: Optional[str] = None
+
+    def __str__(self) -> str:
+        return self.message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def validate_output(path: str | Path, dataset: Dataset) -> List[SchemaProblem]:
+    """
+    Validate the file written by a transformation against the schema of the expected output dataset.
+
+    :param path: the path of the file written by the transformation
+    :param dataset: the expected output dataset
+    :return: the problems found, empty if the output matches the schema
+    """
+    path = Path(path)
+    if not path.exists():
+        return [SchemaProblem("missing_file", f"Output file {path} was not created")]
+    if dataset.format.lower() not in _ARROW_FORMATS:
+        return []
+
+    try:
+        arrow_dataset = Dataset(path=str(path), format=dataset.format).to_arrow_dataset()
+        columns = arrow_dataset.schema.names
+    except Exception as e:
+        return [SchemaProblem("unreadable", f"Output file {path} could not be read as {dataset.format}: {e}")]
+
+    fields = schema_fields(dataset)
+    expected = list(fields)
+    problems = []
+    missing = [column for column in expected if column not in columns]
+    if missing:
+        problems.append(SchemaProblem("missing_columns", f"Output is missing columns {missing}, found {columns}"))
+    unexpected = [column for column in columns if column not in fields]
+    if unexpected and expected:
+        problems.append(
+            SchemaProblem("unexpected_columns", f"Output has columns {unexpected} that are not in the schema")
+        )
+    present = [column for column in columns if column in fields]
+    if not missing and present != expected:
+        problems.append(
+            SchemaProblem("column_order", f"Output columns are in the order {present}, expected {expected}")
+        )
+    if not present:
+        return problems
+
+    checks = {column: _ColumnCheck(column, *fields[column], dataset.format.lower()) for column in present}
+    try:
+        for batch in arrow_dataset.to_batches(columns=present):
+            for column, array in zip(present, batch.columns):
+                checks[column].update(array)
+    except Exception as e:
+        problems.append(SchemaProblem("unreadable", f"Output file {path} could not be read as {dataset.format}: {e}"))
+        return problems
+
+    for column in present:
+        problems.extend(checks[column].problems())
+    return problems
+
+
+class _ColumnCheck:
+    """Accumulates the type and null checks of a column over record batches."""
+
+    def __init__(self, column: str, annotation: Any, optional: bool, file_format: str):
+        self.column = column
+        self.annotation = annotation
+        self.optional = optional
+        self.file_format = file_format
+        self.nulls = 0
+        self.type_error: Optional[str] = None
+
+    def update(self, array: Any) -> None:
+        # Text formats write empty strings and missing values alike, and an empty string is a valid str value
+        if not (self.file_format in _TEXT_FORMATS and (typing.get_origin(self.annotation) or self.annotation) is str):
+            self.nulls += array.null_count
+        if self.type_error is None and array.null_count < len(array):
+            self.type_error = _coercion_error(array, self.annotation, self.file_format)
+
+    def problems(self) -> List[SchemaProblem]:
+        problems = []
+        name = getattr(self.annotation, "__name__", str(self.annotation))
+        if self.type_error is not None:
+            problems.append(
+                SchemaProblem(
+                    "type", f"Column '{self.column}' cannot be read as {name}: {self.type_error}", self.column
+                )
+            )
+        if self.nulls and not self.optional:
+            problems.append(
+                SchemaProblem(
+                    "nulls",
+                    f"Column '{self.column}' has {self.nulls} null values, but its type {name} is not optional",
+                    self.column,
+                )
+            )
+        return problems
+
+
+def schema_fields(dataset: Dataset) -> Dict[str, Tuple[Any, bool]]:
+    """
+    Return the type of each field of the dataset schema, and whether the field is optional.
+
+    :param dataset: the dataset whose schema to read
+    :return: the type of each field, with Optional[X] unwrapped to X, and whether None is allowed
+    """
+    if dataset.schema is None:
+        return {}
+    model = Dataset.map_to_basemodel(f"{dataset.name}_schema", dataset.schema)
+    fields = {}
+    for name, field_info in model.model_fields.items():
+        annotation, optional = _unwrap_optional(field_info.annotation)
+        fields[field_info.alias or name] = (annotation, optional)
+    return fields
+
+
+def _unwrap_optional(annotation: Any) -> Tuple[Any, bool]:
+    """Split Optional[X] into X and whether None is allowed."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        arguments = [argument for argument in typing.get_args(annotation) if argument is not type(None)]
+        optional = len(arguments) < len(typing.get_args(annotation))
+        return (arguments[0] if len(arguments) == 1 else Any), optional
+    return annotation, annotation is Any or annotation is type(None)
+
+
+def _coercion_error(array: Any, annotation: Any, file_format: str) -> Optional[str]:
+    """Check that the non-null values of an array can be coerced to a type, the way pydantic coerces them."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    origin = typing.get_origin(annotation) or annotation
+    dtype = array.type
+    if pa.types.is_dictionary(dtype):
+        array = pc.cast(array, dtype.value_type)
+        dtype = array.type
+    if pa.types.is_null(dtype):
+        return None
+
+    try:
+        if origin is bool:
+            if pa.types.is_boolean(dtype):
+                return None
+            if pa.types.is_integer(dtype) or pa.types.is_floating(dtype):
+                # Numbers are only valid booleans as 0 or 1
+                if not pc.all(pc.is_in(pc.drop_null(array), value_set=pa.array([0, 1], type=dtype))).as_py():
+                    return "values other than 0 and 1"
+                return None
+            if pa.types.is_string(dtype) or pa.types.is_large_string(dtype):
+                pc.cast(pc.utf8_lower(array), pa.bool_())
+                return None
+        elif origin is int:
+            if pa.types.is_integer(dtype) or pa.types.is_boolean(dtype):
+                return None
+            if pa.types.is_floating(dtype) or pa.types.is_decimal(dtype) or pa.types.is_string(dtype):
+                # Safe casts fail on fractional or non-numeric values
+                pc.cast(array, pa.int64(), safe=True)
+                return None
+        elif origin is float:
+            if pa.types.is_integer(dtype) or pa.types.is_floating(dtype) or pa.types.is_decimal(dtype):
+                return None
+            if pa.types.is_boolean(dtype) or pa.types.is_string(dtype) or pa.types.is_large_string(dtype):
+                pc.cast(array, pa.float64())
+                return None
+        elif origin is str:
+            if pa.types.is_string(dtype) or pa.types.is_large_string(dtype):
+                return None
+            if file_format in _TEXT_FORMATS and not pa.types.is_nested(dtype):
+                return None
+        elif origin is datetime.datetime:
+            if pa.types.is_timestamp(dtype) or pa.types.is_date(dtype):
+                return None
+            if pa.types.is_string(dtype) or pa.types.is_large_string(dtype):
+                try:
+                    pc.cast(array, pa.timestamp("us"))
+                except pa.ArrowInvalid:
+                    # Timestamps with a UTC offset only cast to a timezone-aware type
+                    pc.cast(array, pa.timestamp("us", tz="UTC"))
+                return None
+        elif origin is datetime.date:
+            if pa.types.is_date(dtype) or pa.types.is_timestamp(dtype):
+                return None
+            if pa.types.is_string(dtype) or pa.types.is_large_string(dtype):
+                pc.cast(array, pa.date32())
+                return None
+        elif origin in (list, tuple, set):
+            if pa.types.is_list(dtype) or pa.types.is_large_list(dtype) or pa.types.is_fixed_size_list(dtype):
+                return None
+        elif origin is dict:
+            if pa.types.is_struct(dtype) or pa.types.is_map(dtype):
+                return None
+        else:
+            # Other types, e.g. Any or nested models, are not checked
+            return None
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        return str(e).splitlines()[0]
+    return f"found {dtype} values"
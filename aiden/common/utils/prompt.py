@@ -2,29 +2,43 @@
 This module provides utilities for working with agents defined using the smolagents library.
 """
 
+import copy
 import importlib
+from functools import lru_cache
+from typing import List, Optional
 
 import yaml
 
 from aiden.config import config
 
 
-def get_prompt_templates(base_template_name: str, override_template_name: str) -> dict:
+def get_prompt_templates(
+    base_template_name: str, override_template_name: str, allowed_packages: Optional[List[str]] = None
+) -> dict:
     """
     Given the name of a smolagents prompt template (the 'base template') and a plexe prompt template
     (the 'overriding template'), this function loads both templates and returns a merged template in which
     all keys from the overriding template overwrite the matching keys in the base template.
+
+    The merged templates are loaded once per process; each call returns a copy that the caller can modify. The
+    allowed packages mentioned by the templates default to the packages of the pandas engine.
     """
+    if allowed_packages is None:
+        allowed_packages = config.code_generation.allowed_packages
+    return copy.deepcopy(_load_prompt_templates(base_template_name, override_template_name, tuple(allowed_packages)))
+
+
+@lru_cache(maxsize=None)
+def _load_prompt_templates(base_template_name: str, override_template_name: str, allowed_packages: tuple) -> dict:
+    """Load and merge two prompt templates; the allowed packages are part of the cache key."""
     base_template: dict = yaml.safe_load(
         importlib.resources.files("smolagents.prompts").joinpath(base_template_name).read_text()
     )
     override_template: dict = yaml.safe_load(
         str(
             importlib.resources.files("aiden").joinpath("prompts").joinpath(override_template_name).read_text()
-        ).replace("{{allowed_packages}}", str(config.code_generation.allowed_packages))
+        ).replace("{{allowed_packages}}", str(list(allowed_packages)))
     )
-    # print(base_template["managed_agent"]["task"])
-    # print(override_template["managed_agent"]["task"])
 
     # Recursively merge two dictionaries to ensure deep merging
     def merge_dicts(base: dict, override: dict) -> dict:
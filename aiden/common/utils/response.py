@@ -2,8 +2,6 @@ import json
 import logging
 import re
 
-import black
-
 logging.getLogger("blib2to3.pgen2.driver").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
@@ -87,6 +85,9 @@ def extract_text_up_to_code(s):
 
 def format_code(code) -> str:
     """Format Python code using Black."""
+    # Black is slow to import and only needed once code has been generated
+    import black
+
     try:
         return black.format_str(code, mode=black.FileMode())
     except black.parsing.InvalidInput:  # type: ignore
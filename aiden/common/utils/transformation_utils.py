@@ -1,8 +1,14 @@
 """
-This module provides utility functions for working with model descriptions and metadata.
+This module provides utility functions for working with model descriptions, metadata and generated code.
 """
 
-from typing import Optional
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from aiden.common.dataset import Dataset
+from aiden.common.utils.output_validation import validate_output
 
 
 def format_code_snippet(code: Optional[str]) -> Optional[str]:
@@ -21,3 +27,60 @@ def format_code_snippet(code: Optional[str]) -> Optional[str]:
         # Return first 10 and last 10 lines with a note in the middle
         return "\n".join(lines[:10] + ["# ... additional lines omitted ..."] + lines[-10:])
     return code
+
+
+def replace_dataset_paths(code: str, paths: Dict[str, str]) -> Optional[str]:
+    """
+    Point the dataset paths written as string literals in generated code to other locations.
+
+    :param code: The source code as a string
+    :param paths: A mapping from the dataset paths used by the code to the paths to use instead
+    :return: The rewritten code, or None if one of the paths does not appear as a literal in the code
+    """
+    replacements = {}
+    for old, new in paths.items():
+        literals = {
+            f"{quote}{variant}{quote}": f"{quote}{new}{quote}"
+            for variant in {old, os.path.normpath(old)}
+            for quote in ('"', "'")
+            if f"{quote}{variant}{quote}" in code
+        }
+        if not literals:
+            return None
+        replacements.update(literals)
+    if not replacements:
+        return code
+    # Replace every literal in a single pass, longest first, so that a replaced path is never replaced again, e.g.
+    # when two datasets swap paths
+    pattern = re.compile("|".join(re.escape(literal) for literal in sorted(replacements, key=len, reverse=True)))
+    return pattern.sub(lambda match: replacements[match.group(0)], code)
+
+
+def check_output_dataset(path: str | Path, dataset: Dataset) -> List[str]:
+    """
+    Check that a transformation wrote an output file matching the schema of the expected output dataset.
+
+    The file is validated with vectorised pyarrow operations, reading only the columns of the schema, so the
+    check stays cheap for large outputs. See aiden.common.utils.output_validation for the checks made.
+
+    :param path: The path of the file written by the transformation
+    :param dataset: The expected output dataset
+    :return: The list of problems found, empty if the output is valid
+    """
+    return [str(problem) for problem in validate_output(path, dataset)]
+
+
+def count_rows(dataset: Dataset) -> Optional[int]:
+    """
+    Count the rows of a local dataset file, reading only the metadata when the format allows it.
+
+    :param dataset: The dataset to count the rows of
+    :return: The number of rows, or None if the file does not exist or cannot be read
+    """
+    if not dataset.exists():
+        return None
+
+    try:
+        return dataset.count_rows()
+    except Exception:
+        return None
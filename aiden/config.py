@@ -3,15 +3,17 @@ Configuration for the plexe library.
 """
 
 import importlib
+import importlib.util
 import logging
 import sys
 import warnings
 from dataclasses import dataclass, field
-from functools import cached_property
+from functools import cached_property, lru_cache
 from importlib.resources import files
-from typing import List
+from typing import TYPE_CHECKING, Dict, List
 
-from jinja2 import Environment, FileSystemLoader
+if TYPE_CHECKING:
+    from jinja2 import Environment
 
 TEMPLATE_DIR = files("aiden").joinpath("prompts")
 
@@ -21,15 +23,21 @@ warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 
+@lru_cache(maxsize=None)
 def is_package_available(package_name: str) -> bool:
-    """Check if a Python package is available/installed."""
+    """Check if a Python package is available/installed, without importing it. The result is cached."""
     try:
-        importlib.import_module(package_name)
-        return True
-    except ImportError:
+        return importlib.util.find_spec(package_name) is not None
+    except (ImportError, ValueError):
         return False
 
 
+def refresh_package_availability() -> None:
+    """Forget the cached package availability, e.g. after installing a package in the running process."""
+    is_package_available.cache_clear()
+    importlib.invalidate_caches()
+
+
 @dataclass(frozen=True)
 class _Config:
     @dataclass(frozen=True)
@@ -45,6 +53,82 @@ class _Config:
     @dataclass(frozen=True)
     class _ExecutionConfig:
         runfile_name: str = field(default="execution_script.py")
+        # Check the output file of each execution against the output dataset schema, and report mismatches as failures
+        validate_output: bool = field(default=True)
+        # Number of pre-warmed workers running local scripts; 0 spawns a fresh interpreter per script instead
+        warm_worker_pool_size: int = field(default=2)
+        # Compiled scripts kept by each warm worker, least recently used first out; 0 disables the cache
+        warm_worker_compile_cache_size: int = field(default=128)
+        # Ray cluster used for distributed execution; None starts a local cluster using all the cores
+        ray_address: str | None = field(default=None)
+        ray_num_cpus_per_task: float = field(default=1.0)
+        # Input files are put in the Ray object store in chunks of this size, to bound the memory of the driver
+        ray_chunk_size_mb: int = field(default=64)
+
+    @dataclass(frozen=True)
+    class _DockerConfig:
+        # Any Docker-compatible CLI can be used, e.g. 'podman'
+        binary: str = field(default="docker")
+        # Image running generated code; None builds one from the base image with the packages of the compute engine,
+        # at the versions installed on the host. Other images must provide Python and those packages
+        image: str | None = field(default=None)
+        base_image: str = field(default="python:3.11-slim")
+        # Number of long-lived containers kept per set of mounts; containers are reset between runs
+        pool_size: int = field(default=2)
+        cpus: float | None = field(default=1.0)
+        memory: str | None = field(default="2g")
+        network: str = field(default="none")
+
+    @dataclass(frozen=True)
+    class _CacheConfig:
+        # Root directory for on-disk caches; falls back to $AIDEN_CACHE_DIR, then the platform user cache dir
+        cache_dir: str | None = field(default=None)
+        response_cache_enabled: bool = field(default=True)
+        response_ttl_seconds: int = field(default=7 * 24 * 3600)
+        response_max_size_mb: int = field(default=512)
+        # Validated transformation sources, reused by builds with the same intent, providers and dataset schemas
+        build_cache_enabled: bool = field(default=True)
+        # Also key builds on the content of the input files, so that a build is redone when the data changes
+        build_cache_data_fingerprint: bool = field(default=False)
+        build_ttl_seconds: int = field(default=90 * 24 * 3600)
+        build_max_size_mb: int = field(default=64)
+        # Compiled prompt templates, shared by the processes using the same aiden installation
+        template_bytecode_cache_enabled: bool = field(default=True)
+
+    @dataclass(frozen=True)
+    class _ProfilingConfig:
+        # Dataset profiles are computed once per file version, and cached under '<cache root>/profiles'
+        enabled: bool = field(default=True)
+        cache_enabled: bool = field(default=True)
+        # Rows profiled per dataset; None profiles the whole file
+        max_rows: int | None = field(default=1_000_000)
+        top_k: int = field(default=5)
+        sample_values: int = field(default=5)
+
+    @dataclass(frozen=True)
+    class _RateLimitConfig:
+        # Limits are shared by every provider querying the same model within the process
+        max_concurrent_requests: int = field(default=8)
+        requests_per_minute: float | None = field(default=None)
+        rate_limit_cooldown_seconds: float = field(default=10.0)
+
+    @dataclass(frozen=True)
+    class _RegistryConfig:
+        # Code entries kept per build, least recently used first out; every executed candidate registers one
+        max_code_items: int = field(default=256)
+
+    @dataclass(frozen=True)
+    class _OptimizationConfig:
+        # Rows generated per input dataset for benchmarking, so that slow code shows before it meets production data
+        benchmark_rows: int = field(default=100_000)
+        # Rounds of optimisation after a correct candidate; each round is one generation and two executions
+        max_iterations: int = field(default=3)
+        # An optimised candidate must be this many times faster than the best code so far, else the loop stops
+        min_speedup: float = field(default=1.1)
+        # Functions of the cProfile report given to the model, by cumulative time
+        profile_top_n: int = field(default=25)
+        # Timed runs of the code after a profiled warm-up run, in the same process; their median is compared
+        benchmark_runs: int = field(default=3)
 
     @dataclass(frozen=True)
     class _CodeGenerationConfig:
@@ -73,6 +157,15 @@ class _Config:
             ]
         )
 
+        # Packages of the columnar compute engines that generated code can target instead of pandas
+        _engine_packages: Dict[str, List[str]] = field(
+            default_factory=lambda: {
+                "pyarrow": ["pyarrow", "numpy"],
+                "polars": ["polars", "pyarrow", "numpy"],
+                "duckdb": ["duckdb", "pyarrow", "numpy"],
+            }
+        )
+
         # Additional standard library modules for agent execution
         _standard_lib_modules: List[str] = field(
             default_factory=lambda: [
@@ -101,10 +194,24 @@ class _Config:
             ]
         )
 
+        @property
+        def engines(self) -> List[str]:
+            """The compute engines that generated code can target, starting with the default, pandas."""
+            return ["pandas", *self._engine_packages]
+
         @property
         def allowed_packages(self) -> List[str]:
             """Dynamically determine which packages are available and can be used."""
-            available_packages = self._base_packages.copy()
+            return self.engine_packages("pandas")
+
+        def engine_packages(self, engine: str = "pandas") -> List[str]:
+            """Determine which packages are available and can be used by code targeting a compute engine."""
+            if engine == "pandas":
+                available_packages = self._base_packages.copy()
+            elif engine in self._engine_packages:
+                available_packages = self._engine_packages[engine].copy()
+            else:
+                raise ValueError(f"Unknown compute engine '{engine}', expected one of {self.engines}")
 
             # Check if dagster packages are installed and add them if they are
             for package in self._dagster_packages:
@@ -134,6 +241,12 @@ class _Config:
     logging: _LoggingConfig = field(default_factory=_LoggingConfig)
     code_generation: _CodeGenerationConfig = field(default_factory=_CodeGenerationConfig)
     execution: _ExecutionConfig = field(default_factory=_ExecutionConfig)
+    docker: _DockerConfig = field(default_factory=_DockerConfig)
+    cache: _CacheConfig = field(default_factory=_CacheConfig)
+    profiling: _ProfilingConfig = field(default_factory=_ProfilingConfig)
+    rate_limit: _RateLimitConfig = field(default_factory=_RateLimitConfig)
+    registry: _RegistryConfig = field(default_factory=_RegistryConfig)
+    optimization: _OptimizationConfig = field(default_factory=_OptimizationConfig)
 
 
 @dataclass(frozen=True)
@@ -141,8 +254,26 @@ class _PromptTemplates:
     template_dir: str = field(default=TEMPLATE_DIR)
 
     @cached_property
-    def env(self) -> Environment:
-        return Environment(loader=FileSystemLoader(str(self.template_dir)))
+    def env(self) -> "Environment":
+        from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+        bytecode_cache = None
+        if config.cache.template_bytecode_cache_enabled:
+            from aiden.common.cache import get_cache_dir
+
+            bytecode_cache = FileSystemBytecodeCache(str(get_cache_dir("templates")))
+        # The templates ship with the package: each one is compiled once, and never checked for changes
+        return Environment(
+            loader=FileSystemLoader(str(self.template_dir)),
+            auto_reload=False,
+            cache_size=-1,
+            bytecode_cache=bytecode_cache,
+        )
+
+    def precompile(self) -> None:
+        """Compile every prompt template ahead of the first render, e.g. when a server starts."""
+        for template_name in self.env.list_templates(extensions=["jinja"]):
+            self.env.get_template(template_name)
 
     def _render(self, template_name: str, **kwargs) -> str:
         template = self.env.get_template(template_name)
@@ -152,7 +283,18 @@ class _PromptTemplates:
         return self._render("code_generator/system_prompt.jinja")
 
     def transformation_generate(
-        self, problem_statement, plan, history, input_datasets, output_dataset, allowed_packages, environment_type
+        self,
+        problem_statement,
+        plan,
+        history,
+        input_datasets,
+        output_dataset,
+        allowed_packages,
+        environment_type,
+        candidate=None,
+        streaming=None,
+        dataset_profiles=None,
+        engine=None,
     ) -> str:
         return self._render(
             "code_generator/generate.jinja",
@@ -163,10 +305,22 @@ class _PromptTemplates:
             output_dataset=output_dataset,
             allowed_packages=allowed_packages,
             environment_type=environment_type,
+            candidate=candidate,
+            streaming=streaming,
+            dataset_profiles=dataset_profiles,
+            engine=engine,
         )
 
     def transformation_fix(
-        self, transformation_code, plan, review, problems, allowed_packages, environment_type
+        self,
+        transformation_code,
+        plan,
+        review,
+        problems,
+        allowed_packages,
+        environment_type,
+        streaming=None,
+        engine=None,
     ) -> str:
         return self._render(
             "code_generator/fix.jinja",
@@ -176,10 +330,35 @@ class _PromptTemplates:
             problems=problems,
             allowed_packages=allowed_packages,
             environment_type=environment_type,
+            streaming=streaming,
+            engine=engine,
+        )
+
+    def transformation_optimize(
+        self,
+        transformation_code,
+        plan,
+        benchmark,
+        problems,
+        allowed_packages,
+        environment_type,
+        streaming=None,
+        engine=None,
+    ) -> str:
+        return self._render(
+            "code_generator/optimize.jinja",
+            transformation_code=transformation_code,
+            plan=plan,
+            benchmark=benchmark,
+            problems=problems,
+            allowed_packages=allowed_packages,
+            environment_type=environment_type,
+            streaming=streaming,
+            engine=engine,
         )
 
     def transformation_review(
-        self, problem_statement, plan, transformation_code, problems, allowed_packages, environment_type
+        self, problem_statement, plan, transformation_code, problems, allowed_packages, environment_type, engine=None
     ) -> str:
         return self._render(
             "code_generator/review.jinja",
@@ -189,6 +368,7 @@ class _PromptTemplates:
             problems=problems,
             allowed_packages=allowed_packages,
             environment_type=environment_type,
+            engine=engine,
         )
 
     def cot_system(self) -> str:
@@ -197,12 +377,16 @@ class _PromptTemplates:
     def cot_summarize(self, context: str) -> str:
         return self._render("utils/cot_summarize.jinja", context=context)
 
+    def cot_summarize_batch(self, contexts: list[str]) -> str:
+        return self._render("utils/cot_summarize_batch.jinja", contexts=contexts)
+
     def agent_builder_prompt(
         self,
         intent: str,
         input_datasets: list[str] | None = None,
         output_dataset: str | None = None,
         working_dir: str | None = None,
+        dataset_profiles: str | None = None,
     ) -> str:
         return self._render(
             "manager_prompt.jinja",
@@ -210,6 +394,7 @@ class _PromptTemplates:
             input_datasets=input_datasets,
             output_dataset=output_dataset,
             working_dir=working_dir,
+            dataset_profiles=dataset_profiles,
         )
 
 
@@ -219,8 +404,14 @@ config: _Config = _Config()
 prompt_templates: _PromptTemplates = _PromptTemplates()
 
 
+_logging_configured = False
+
+
 # Default logging configuration
 def configure_logging(level: str | int = logging.INFO, file: str | None = None) -> None:
+    global _logging_configured
+    _logging_configured = True
+
     # Configure the library's root logger
     sm_root_logger = logging.getLogger("aiden")
     sm_root_logger.setLevel(level)
@@ -244,4 +435,7 @@ def configure_logging(level: str | int = logging.INFO, file: str | None = None)
         sm_root_logger.addHandler(file_handler)
 
 
-configure_logging(level=config.logging.level)
+def ensure_logging_configured() -> None:
+    """Apply the default logging configuration, unless logging was already configured with configure_logging."""
+    if not _logging_configured:
+        configure_logging(level=config.logging.level)
@@ -8,7 +8,7 @@ for various output formats and visualization purposes.
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from dataclasses_json import DataClassJsonMixin
 
@@ -28,6 +28,26 @@ class CodeInfo(DataClassJsonMixin):
     transformation: Optional[str] = None
 
 
+@dataclass
+class UsageInfo(DataClassJsonMixin):
+    """Information about the LLM calls of the model build: tokens, cost and latency."""
+
+    totals: Dict[str, Any]
+    by_role: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def rows(self) -> List[str]:
+        """Summarise the totals of the build and of each agent role, one line each."""
+        return [f"{role}: {_format_usage(totals)}" for role, totals in [("total", self.totals), *self.by_role.items()]]
+
+
+def _format_usage(totals: Dict[str, Any]) -> str:
+    cost = f"${totals['cost_usd']:.4f}" if totals.get("cost_usd") is not None else "unknown cost"
+    return (
+        f"{totals['calls']} calls, {totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion "
+        f"tokens, {cost}, {totals['latency_seconds']:.1f}s"
+    )
+
+
 @dataclass
 class TransformationDescription(DataClassJsonMixin):
     """A comprehensive description of a model."""
@@ -37,6 +57,7 @@ class TransformationDescription(DataClassJsonMixin):
     intent: str
     schemas: SchemaInfo
     code: CodeInfo
+    usage: Optional[UsageInfo] = None
 
     def as_text(self) -> str:
         """Convert the model description to a formatted text string."""
@@ -57,6 +78,8 @@ class TransformationDescription(DataClassJsonMixin):
             f"    ```python\n{self.code.transformation or '# No transformation code available'}\n```",
             "",
         ]
+        if self.usage is not None:
+            lines += ["LLM Usage:", "\n".join(f"  - {row}" for row in self.usage.rows()), ""]
         return "\n".join(lines)
 
     def as_markdown(self) -> str:
@@ -82,4 +105,6 @@ class TransformationDescription(DataClassJsonMixin):
             "```",
             "",
         ]
+        if self.usage is not None:
+            lines += ["## LLM Usage", "\n".join(f"- {row}" for row in self.usage.rows()), ""]
         return "\n".join(lines)
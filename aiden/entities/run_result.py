@@ -0,0 +1,22 @@
+"""
+This module defines a RunResult dataclass for reporting the outcome of running a built transformation.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from dataclasses_json import DataClassJsonMixin
+
+
+@dataclass
+class RunResult(DataClassJsonMixin):
+    """The outcome, timing and data volumes of a run of a built transformation."""
+
+    success: bool
+    exec_time: float
+    rows_in: Dict[str, Optional[int]] = field(default_factory=dict)
+    rows_out: Optional[int] = None
+    peak_memory_mb: Optional[float] = None
+    output: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    step_results: List[Dict[str, Any]] = field(default_factory=list)
@@ -1,6 +1,343 @@
-from typing import Any
+"""
+Module: DockerExecutor for Isolated Python Code Execution in Containers
 
-from aiden.executors.executor import Executor, ExecutionResult
+This module provides an implementation of the `Executor` interface that runs generated code inside long-lived
+containers, for isolation of untrusted code without paying a container cold start on every run.
+
+Containers are started once per set of mounts and kept in a pool, which is shut down when the build or run that
+started it ends. They run with a read-only root filesystem, no network by default, and CPU and memory limits. The
+working directory and the dataset directories are bind-mounted at the same paths as on the host, so that generated
+code can use absolute dataset paths unchanged; relative dataset paths are made absolute. Only the working directory
+and the directories of the outputs are writable: the input datasets are mounted read-only. Between runs, every
+process started in the container is killed and its scratch space is wiped.
+
+Unless an image is configured, the image is built once from the base image with the packages of the compute engine,
+and every pool checks that its image provides these packages before running any code.
+
+The container runtime is driven through its command line interface, so any Docker-compatible CLI can be used.
+
+Classes:
+    - ContainerPool: A pool of long-lived containers sharing the same image, limits and mounts.
+    - DockerExecutor: A class to execute Python code snippets in a pooled container.
+"""
+
+import atexit
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from aiden.common.dataset import Dataset
+from aiden.common.environment import Environment
+from aiden.common.utils.transformation_utils import replace_dataset_paths
+from aiden.config import config
+from aiden.executors.executor import ExecutionResult, Executor
+from aiden.registries.objects import ObjectRegistry
+
+logger = logging.getLogger(__name__)
+
+# Kills every process of the container except its init process, and wipes the scratch space
+RESET_COMMAND = ["sh", "-c", "kill -9 -1 2>/dev/null; rm -rf /tmp/* /tmp/.[!.]* 2>/dev/null; true"]
+
+_built_images: Set[str] = set()
+_build_lock = threading.Lock()
+
+
+def ensure_runtime_image(base_image: str, packages: Sequence[str], binary: str = "docker") -> str:
+    """
+    Return the tag of an image with the given packages installed on a base image, building it if it does not exist.
+
+    The packages are pinned to the versions installed on the host, if any, so that generated code behaves the same
+    in the containers as in the local executors.
+
+    :param base_image: the image to install the packages on, which must provide Python and pip
+    :param packages: the packages to install
+    :param binary: the Docker-compatible command line interface to use
+    :return: the tag of the image
+    """
+    requirements = [_requirement(package) for package in packages]
+    digest = hashlib.sha256(json.dumps([base_image, requirements]).encode("utf-8")).hexdigest()[:12]
+    tag = f"aiden-runtime:{digest}"
+    with _build_lock:
+        if tag in _built_images:
+            return tag
+        inspected = subprocess.run([binary, "image", "inspect", tag], capture_output=True, text=True, timeout=60)
+        if inspected.returncode != 0:
+            logger.info(f"Building image {tag} from {base_image} with {', '.join(requirements)}")
+            dockerfile = f"FROM {base_image}\nRUN pip install --no-cache-dir {shlex.join(requirements)}\n"
+            built = subprocess.run(
+                [binary, "build", "-t", tag, "-"], input=dockerfile, capture_output=True, text=True, timeout=1800
+            )
+            if built.returncode != 0:
+                raise RuntimeError(f"Failed to build image {tag} from {base_image}: {built.stderr.strip()[-500:]}")
+        _built_images.add(tag)
+    return tag
+
+
+def _requirement(package: str) -> str:
+    try:
+        return f"{package}=={importlib.metadata.version(package)}"
+    except importlib.metadata.PackageNotFoundError:
+        return package
+
+
+class ContainerPool:
+    """
+    Pool of long-lived containers with the same image, resource limits and bind mounts.
+    """
+
+    def __init__(
+        self,
+        image: Optional[str],
+        mounts: List[str],
+        workdir: str,
+        size: int,
+        binary: str = "docker",
+        cpus: Optional[float] = None,
+        memory: Optional[str] = None,
+        network: str = "none",
+        packages: Sequence[str] = (),
+        base_image: Optional[str] = None,
+        read_only_mounts: Sequence[str] = (),
+    ):
+        """
+        Initialise the pool; containers are started on demand.
+
+        :param image: the container image, None to build one with the packages on the base image
+        :param mounts: host directories bind-mounted read-write at the same path in the containers
+        :param workdir: the working directory of the processes run in the containers
+        :param size: maximum number of containers, and hence of concurrent runs
+        :param binary: the Docker-compatible command line interface to use
+        :param cpus: maximum number of CPUs of each container, None for no limit
+        :param memory: maximum memory of each container (e.g. '2g'), None for no limit
+        :param network: the network of the containers, 'none' to disable networking
+        :param packages: packages that generated code imports, checked in the first container started
+        :param base_image: the image to build the container image from, defaults to the docker configuration
+        :param read_only_mounts: host files or directories bind-mounted read-only at the same path in the containers
+        """
+        if size < 1:
+            raise ValueError("Container pool size must be at least 1")
+        self.image = image
+        self.mounts = mounts
+        self.read_only_mounts = list(read_only_mounts)
+        self.workdir = workdir
+        self.size = size
+        self.binary = binary
+        self.cpus = cpus
+        self.memory = memory
+        self.network = network
+        self.packages = list(packages)
+        self.base_image = base_image or config.docker.base_image
+        # Builds and runs using the pool; it is shut down when the last one releases it
+        self.owners: Set[int] = set()
+        self._checked = False
+        self._idle: List[str] = []
+        self._started = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def _start_container(self) -> str:
+        """Start a container that idles until it is given work, and return its id."""
+        if self.image is None:
+            self.image = ensure_runtime_image(self.base_image, self.packages, self.binary)
+        command = [self.binary, "run", "-d", "--rm", "--read-only", "--tmpfs", "/tmp", "--network", self.network]
+        if self.cpus:
+            command += ["--cpus", str(self.cpus)]
+        if self.memory:
+            command += ["--memory", self.memory]
+        # Mount parents before the paths nested in them, so that nested mounts are not hidden by their parents
+        volumes = [(mount, "") for mount in self.mounts] + [(mount, ":ro") for mount in self.read_only_mounts]
+        for mount, mode in sorted(volumes, key=lambda volume: len(Path(volume[0]).parts)):
+            command += ["-v", f"{mount}:{mount}{mode}"]
+        command += ["-w", self.workdir, "--name", f"aiden-{uuid.uuid4().hex[:12]}", self.image, "sleep", "infinity"]
+
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=120)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Failed to start container from image {self.image}: {completed.stderr.strip()}")
+        container_id = completed.stdout.strip().splitlines()[-1]
+        logger.debug(f"Started container {container_id} from image {self.image}")
+        if not self._checked:
+            self._check_packages(container_id)
+        return container_id
+
+    def _check_packages(self, container_id: str) -> None:
+        """Fail fast if the image cannot import the packages that generated code uses."""
+        if self.packages:
+            imports = f"import {', '.join(package.replace('-', '_') for package in self.packages)}"
+            completed = subprocess.run(
+                [self.binary, "exec", container_id, "python", "-c", imports],
+                capture_output=True,
+                text=True,
+                timeout=120,
+            )
+            if completed.returncode != 0:
+                self.remove(container_id)
+                raise RuntimeError(
+                    f"Image {self.image} does not provide the packages required by generated code "
+                    f"({', '.join(self.packages)}): {completed.stderr.strip()[-300:]}. Use an image providing "
+                    f"them, or leave the image unset to build one."
+                )
+        self._checked = True
+
+    def reset(self, container_id: str) -> bool:
+        """
+        Kill every process left in a container by the previous run and wipe its scratch space.
+
+        :param container_id: the container to reset
+        :return: whether the container was reset and can be reused
+        """
+        try:
+            completed = subprocess.run(
+                [self.binary, "exec", container_id, *RESET_COMMAND], capture_output=True, text=True, timeout=30
+            )
+            return completed.returncode == 0
+        except (subprocess.TimeoutExpired, OSError):
+            return False
+
+    def remove(self, container_id: str) -> None:
+        """
+        Remove a container, killing it if it is running.
+
+        :param container_id: the container to remove
+        """
+        try:
+            subprocess.run([self.binary, "rm", "-f", container_id], capture_output=True, timeout=30)
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.warning(f"Failed to remove container {container_id}: {e}")
+
+    @contextmanager
+    def acquire(self):
+        """
+        Context manager providing exclusive use of a container, which is reset when released.
+        """
+        container_id = self._checkout()
+        try:
+            yield container_id
+        finally:
+            self._checkin(container_id)
+
+    def _checkout(self) -> str:
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Container pool is shut down")
+                if self._idle:
+                    return self._idle.pop()
+                if self._started < self.size:
+                    self._started += 1
+                    break
+                self._condition.wait()
+
+        # Start the container outside the lock, as it can take a while
+        try:
+            return self._start_container()
+        except Exception:
+            with self._condition:
+                self._started -= 1
+                self._condition.notify()
+            raise
+
+    def _checkin(self, container_id: str) -> None:
+        reusable = not self._closed and self.reset(container_id)
+        if not reusable:
+            self.remove(container_id)
+        with self._condition:
+            if reusable:
+                self._idle.append(container_id)
+            else:
+                self._started -= 1
+            self._condition.notify()
+
+    def shutdown(self) -> None:
+        """
+        Remove all idle containers and refuse further runs.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._started -= len(idle)
+            self._condition.notify_all()
+        for container_id in idle:
+            self.remove(container_id)
+
+
+_container_pools: Dict[Tuple, ContainerPool] = {}
+_container_pools_lock = threading.Lock()
+
+
+def get_container_pool(
+    image: Optional[str],
+    mounts: List[str],
+    workdir: str,
+    read_only_mounts: Sequence[str] = (),
+    owner: Optional[object] = None,
+    **options,
+) -> ContainerPool:
+    """
+    Return the shared container pool for an image, set of mounts and working directory.
+
+    :param image: the container image, None to build one with the packages on the base image
+    :param mounts: host directories bind-mounted read-write in the containers
+    :param workdir: the working directory of the processes run in the containers
+    :param read_only_mounts: host files or directories bind-mounted read-only in the containers
+    :param owner: the build or run using the pool, which must release it with release_container_pools when it
+        ends; pools without an owner are only shut down at exit
+    :param options: overrides of the size, binary, cpus, memory and network settings of the docker configuration,
+        and the packages required by generated code
+    :return: the shared ContainerPool
+    """
+    settings = {
+        "size": config.docker.pool_size,
+        "binary": config.docker.binary,
+        "cpus": config.docker.cpus,
+        "memory": config.docker.memory,
+        "network": config.docker.network,
+        "packages": (),
+        **options,
+    }
+    settings["packages"] = tuple(settings["packages"])
+    key = (image, tuple(mounts), tuple(read_only_mounts), workdir, tuple(sorted(settings.items())))
+    with _container_pools_lock:
+        if key not in _container_pools:
+            _container_pools[key] = ContainerPool(
+                image=image, mounts=mounts, workdir=workdir, read_only_mounts=read_only_mounts, **settings
+            )
+        pool = _container_pools[key]
+        if owner is not None:
+            pool.owners.add(id(owner))
+        return pool
+
+
+def release_container_pools(owner: object) -> None:
+    """
+    Release the container pools used by a build or run, shutting down the pools that no other owner uses.
+
+    :param owner: the owner given to get_container_pool
+    """
+    released = []
+    with _container_pools_lock:
+        for key, pool in list(_container_pools.items()):
+            if id(owner) in pool.owners:
+                pool.owners.discard(id(owner))
+                if not pool.owners:
+                    released.append(_container_pools.pop(key))
+    for pool in released:
+        pool.shutdown()
+
+
+@atexit.register
+def _shutdown_container_pools() -> None:
+    for pool in _container_pools.values():
+        pool.shutdown()
 
 
 class DockerExecutor(Executor):
@@ -9,14 +346,204 @@ class DockerExecutor(Executor):
 
     The `DockerExecutor` class implements the `Executor` interface, allowing Python code
     snippets to be executed in an isolated Docker container with strict isolation, output capture,
-    and timeout enforcement.
+    and timeout enforcement. Containers are taken from a pool of long-lived containers rather than
+    created for each run.
+
+    The image, pool size and resource limits default to the docker configuration, and can be overridden per
+    environment with the 'image', 'binary', 'pool_size', 'cpus', 'memory' and 'network' keys of the environment
+    metadata. Without an image, one is built with the packages of the compute engine of the environment.
     """
 
-    def __init__(self, code: str, timeout: int = 3600, **kwargs: Any) -> None:
-        raise NotImplementedError("DockerExecutor is not yet implemented")
+    def __init__(
+        self,
+        execution_id: str,
+        code: str,
+        working_dir: Path | str,
+        timeout: int,
+        environment: Environment,
+        code_execution_file_name: str = config.execution.runfile_name,
+        datasets: Optional[List[Dataset]] = None,
+        outputs: Optional[List[str]] = None,
+    ):
+        """
+        Initialize the DockerExecutor.
+
+        Args:
+            execution_id (str): Unique identifier for this execution.
+            code (str): The Python code to execute.
+            working_dir (Path | str): The working directory for execution, mounted in the container.
+            timeout (int): The maximum allowed execution time in seconds.
+            environment (Environment): The environment to use for execution.
+            code_execution_file_name (str): The filename to use for the executed script.
+            datasets (List[Dataset], optional): Datasets whose directories are mounted in the container;
+                defaults to all the datasets in the object registry.
+            outputs (List[str], optional): Paths of the files written by the code, whose directories are mounted
+                writable in the container; defaults to the dataset paths that do not exist yet. The other datasets
+                are mounted read-only.
+        """
+        super().__init__(code, timeout)
+        self.root_dir = Path(working_dir).resolve()
+        self.working_dir = self.root_dir / execution_id
+        self.working_dir.mkdir(parents=True, exist_ok=True)
+        self.code_file_name = code_execution_file_name
+        self.code_file = None
+        self.environment = environment
+        self.datasets = datasets if datasets is not None else list(ObjectRegistry().get_all(Dataset).values())
+        if outputs is None:
+            outputs = [
+                dataset.path for dataset in self.datasets if dataset.is_local and not Path(dataset.path).exists()
+            ]
+        self.outputs = outputs
+        self.process = None
+        self.container_id = None
+        self._cancelled = False
+
+        metadata = environment.metadata or {}
+        options = {key: metadata[key] for key in ("binary", "cpus", "memory", "network") if key in metadata}
+        if "pool_size" in metadata:
+            options["size"] = metadata["pool_size"]
+        mounts, read_only_mounts = self._mounts()
+        self.pool = get_container_pool(
+            image=metadata.get("image", config.docker.image),
+            mounts=mounts,
+            # Processes run in the mounted working directory, as the rest of the root filesystem is read-only
+            workdir=str(self.root_dir),
+            read_only_mounts=read_only_mounts,
+            # The pool lives as long as the build or run whose registry is active, which releases it when it ends
+            owner=ObjectRegistry(),
+            packages=config.code_generation.engine_packages(environment.engine),
+            **options,
+        )
+
+    def _mounts(self) -> Tuple[List[str], List[str]]:
+        """
+        Return the paths to mount read-write and read-only, without redundant nesting.
+
+        The working directory and the directories of the outputs are writable. The inputs are read-only: their
+        directories, or the input paths themselves when their directory is writable.
+        """
+        directories = {self.root_dir}
+        for path in self.outputs:
+            directory = Path(path).resolve().parent
+            # Output directories may not exist yet, and must exist to be mounted
+            directory.mkdir(parents=True, exist_ok=True)
+            directories.add(directory)
+        writable = []
+        for directory in sorted(directories, key=lambda d: len(d.parts)):
+            if not any(directory.is_relative_to(mount) for mount in writable):
+                writable.append(directory)
+
+        outputs = {Path(path).resolve() for path in self.outputs}
+        inputs = set()
+        for dataset in self.datasets:
+            path = Path(dataset.path).resolve()
+            if not dataset.is_local or path in outputs or not path.exists():
+                continue
+            in_writable = any(path.parent.is_relative_to(mount) for mount in writable)
+            inputs.add(path if in_writable else path.parent)
+
+        read_only = []
+        for path in sorted(inputs, key=lambda p: len(p.parts)):
+            # A read-only mount covers the paths nested in it, unless a writable mount lies in between
+            covered = any(
+                path.is_relative_to(mount)
+                and not any(path.is_relative_to(w) and w.is_relative_to(mount) and w != mount for w in writable)
+                for mount in read_only
+            )
+            if not covered:
+                read_only.append(path)
+        return [str(mount) for mount in sorted(writable)], [str(mount) for mount in sorted(read_only)]
+
+    def _absolute_paths(self, code: str) -> str:
+        """Make the relative dataset paths of the code absolute, as the processes run in the working directory."""
+        for path in [dataset.path for dataset in self.datasets if dataset.is_local] + list(self.outputs):
+            if not os.path.isabs(path):
+                code = replace_dataset_paths(code, {path: str(Path(path).resolve())}) or code
+        return code
+
+    def _command(self) -> List[str]:
+        if self.environment.is_dagster:
+            return ["dagster", "job", "execute", "-f", str(self.code_file)]
+        return ["python", str(self.code_file)]
 
     def run(self) -> ExecutionResult:
-        raise NotImplementedError("DockerExecutor is not yet implemented")
+        """Execute code in a pooled container and return results."""
+        logger.debug(f"DockerExecutor is executing code with working directory: {self.working_dir}")
+        start_time = time.time()
+
+        try:
+            self.code_file = self.working_dir / self.code_file_name
+            module_setup = "import os\nimport sys\nfrom pathlib import Path\n\n"
+            with open(self.code_file, "w", encoding="utf-8") as f:
+                f.write(module_setup + self._absolute_paths(self.code))
+
+            with self.pool.acquire() as container_id:
+                if self._cancelled:
+                    raise RuntimeError("Execution was cancelled")
+                self.container_id = container_id
+                start_time = time.time()
+                self.process = subprocess.Popen(
+                    [self.pool.binary, "exec", container_id, *self._command()],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                )
+                try:
+                    stdout, stderr = self.process.communicate(timeout=self.timeout)
+                except subprocess.TimeoutExpired:
+                    # Stop the client; the processes left in the container are killed when it is reset
+                    self.process.kill()
+                    self.process.communicate()
+                    return ExecutionResult(
+                        term_out=[],
+                        exec_time=self.timeout,
+                        exception=TimeoutError(
+                            f"Execution exceeded {self.timeout}s timeout - individual run timeout limit reached"
+                        ),
+                    )
+                finally:
+                    self.container_id = None
+            exec_time = time.time() - start_time
+
+            if self._cancelled:
+                raise RuntimeError("Execution was cancelled")
+            if self.process.returncode != 0:
+                return ExecutionResult(
+                    term_out=[stdout],
+                    exec_time=exec_time,
+                    exception=RuntimeError(f"Process exited with code {self.process.returncode}: {stderr}"),
+                )
+            return ExecutionResult(term_out=[stdout], exec_time=exec_time)
+
+        except Exception as e:
+            return ExecutionResult(
+                term_out=[f"Process failed with exception: {str(e)}"],
+                exec_time=time.time() - start_time,
+                exception=e,
+            )
+        finally:
+            self.cleanup()
+
+    def cancel(self) -> None:
+        """
+        Stop the run, if any; the processes left in the container are killed when the container is reset.
+        """
+        self._cancelled = True
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+        container_id = self.container_id
+        if container_id is not None:
+            self.pool.reset(container_id)
 
     def cleanup(self) -> None:
-        raise NotImplementedError("DockerExecutor is not yet implemented")
+        """
+        Clean up resources after execution while preserving the outputs.
+        """
+        logger.debug(f"Cleaning up resources for execution in {self.working_dir}")
+        try:
+            if self.code_file:
+                self.code_file.unlink(missing_ok=True)
+            if self.process and self.process.poll() is None:
+                self.process.kill()
+        except Exception as e:
+            logger.warning(f"Error during resource cleanup: {str(e)}")
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -12,11 +12,14 @@ class ExecutionResult:
         term_out (list[str]): The terminal output from the execution.
         exec_time (float): The time taken to execute the code.
         exception (Exception): Any exception that occurred during execution.
+        step_results (list[dict]): Per-step outcome (name, status, duration, error) for executions made of several
+            steps, such as the assets of a dagster job.
     """
 
     term_out: list[str]
     exec_time: float
     exception: Optional[Exception] = field(default=None)
+    step_results: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class Executor(ABC):
@@ -45,6 +48,13 @@ class Executor(ABC):
         """
         pass
 
+    def cancel(self) -> None:
+        """
+        Stop a running execution as soon as possible; run() then returns a result with an exception.
+        Executors that cannot be interrupted ignore the request.
+        """
+        pass
+
     @abstractmethod
     def cleanup(self) -> None:
         """
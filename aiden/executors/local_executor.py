@@ -5,6 +5,10 @@ This module provides an implementation of the `Executor` interface for executing
 in an isolated process. It captures stdout, stderr, exceptions, and stack traces, and enforces
 timeout limits on execution.
 
+Scripts are run by a pool of pre-warmed workers when available (see `aiden.executors.worker_pool`), which avoids
+paying interpreter startup and package imports on every run. Dagster scripts are then materialised in process rather
+than through the `dagster job execute` CLI, and the per-asset timings and failures are returned with the result.
+
 Classes:
     - RedirectQueue: A helper class to redirect stdout and stderr to a multiprocessing Queue.
     - LocalExecutor: A class to execute Python code snippets in an isolated process.
@@ -22,11 +26,15 @@ import logging
 import os
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
+from typing import List, Optional
 
 from aiden.config import config
 from aiden.executors.executor import ExecutionResult, Executor
+from aiden.executors.worker_pool import WorkerPool, get_worker_pool
+from aiden.common.dataset import Dataset
 from aiden.common.environment import Environment
 
 logger = logging.getLogger(__name__)
@@ -48,6 +56,9 @@ class LocalExecutor(Executor):
         timeout: int,
         environment: Environment,
         code_execution_file_name: str = config.execution.runfile_name,
+        worker_pool: Optional[WorkerPool] = None,
+        datasets: Optional[List[Dataset]] = None,
+        outputs: Optional[List[str]] = None,
     ):
         """
         Initialize the LocalExecutor.
@@ -56,10 +67,14 @@ class LocalExecutor(Executor):
             execution_id (str): Unique identifier for this execution.
             code (str): The Python code to execute.
             working_dir (Path | str): The working directory for execution.
-            datasets (Dict[str, str]): Datasets to be used for execution.
             timeout (int): The maximum allowed execution time in seconds.
             environment (Environment): The environment to use for execution.
             code_execution_file_name (str): The filename to use for the executed script.
+            worker_pool (WorkerPool, optional): Pool of warm workers for local scripts; defaults to the shared pool.
+            datasets (List[Dataset], optional): Datasets used by the code. Unused, as local processes read the
+                datasets from the host filesystem; accepted for compatibility with the other executors.
+            outputs (List[str], optional): Paths of the files written by the code. Unused, as local processes
+                write to the host filesystem; accepted for compatibility with the other executors.
         """
         super().__init__(code, timeout)
         # Create a unique working directory for this execution
@@ -72,6 +87,15 @@ class LocalExecutor(Executor):
         self.code_file = None
         self.process = None
         self.environment = environment
+        self.worker_pool = worker_pool
+        if self.worker_pool is None and environment.type in ("local", "dagster"):
+            # Workers preload the packages of the compute engine of the environment, one pool per engine
+            self.worker_pool = get_worker_pool(config.code_generation.engine_packages(environment.engine))
+        self.max_rss_kb = None
+        # Cancellation may be requested from another thread while run() is in progress
+        self._cancel_lock = threading.Lock()
+        self._cancelled = False
+        self._worker = None
 
     def run(self) -> ExecutionResult:
         """Execute code in a subprocess and return results."""
@@ -85,6 +109,11 @@ class LocalExecutor(Executor):
             with open(self.code_file, "w", encoding="utf-8") as f:
                 f.write(module_setup + self.code)
 
+            if self._cancelled:
+                raise RuntimeError("Execution was cancelled")
+            if self.worker_pool is not None:
+                return self._run_in_worker(start_time)
+
             # Execute the code in a subprocess
             if self.environment.type == "local":
                 self.process = subprocess.Popen(
@@ -172,6 +201,69 @@ class LocalExecutor(Executor):
             # Always clean up resources regardless of execution path
             self.cleanup()
 
+    def _run_in_worker(self, start_time: float) -> ExecutionResult:
+        """Execute the code file in a child of a warm worker and return results."""
+        stdout_file = self.working_dir / "stdout.log"
+        stderr_file = self.working_dir / "stderr.log"
+        result_file = self.working_dir / "result.json"
+        try:
+            with self.worker_pool.acquire() as worker:
+                with self._cancel_lock:
+                    if self._cancelled:
+                        raise RuntimeError("Execution was cancelled")
+                    self._worker = worker
+                try:
+                    result = worker.run(
+                        self.code_file,
+                        cwd=os.getcwd(),
+                        timeout=self.timeout,
+                        stdout_file=stdout_file,
+                        stderr_file=stderr_file,
+                        mode="dagster" if self.environment.is_dagster else "script",
+                        result_file=result_file,
+                    )
+                except RuntimeError as e:
+                    if self._cancelled:
+                        raise RuntimeError("Execution was cancelled") from e
+                    raise
+        finally:
+            with self._cancel_lock:
+                self._worker = None
+            for file in (stdout_file, stderr_file, result_file):
+                file.unlink(missing_ok=True)
+        exec_time = time.time() - start_time
+        self.max_rss_kb = result.max_rss_kb
+        step_results = result.details.get("steps", [])
+
+        if result.timed_out:
+            return ExecutionResult(
+                term_out=[],
+                exec_time=self.timeout,
+                exception=TimeoutError(
+                    f"Execution exceeded {self.timeout}s timeout - individual run timeout limit reached"
+                ),
+            )
+        if result.returncode != 0:
+            return ExecutionResult(
+                term_out=[result.stdout],
+                exec_time=exec_time,
+                exception=RuntimeError(f"Process exited with code {result.returncode}: {result.stderr}"),
+                step_results=step_results,
+            )
+        return ExecutionResult(term_out=[result.stdout], exec_time=exec_time, step_results=step_results)
+
+    def cancel(self) -> None:
+        """
+        Kill the process running the code, if any; a cancelled execution returns a result with an exception.
+        """
+        with self._cancel_lock:
+            self._cancelled = True
+            if self._worker is not None:
+                # Killing the worker also kills the job; the pool replaces the dead worker
+                self._worker.kill()
+            elif self.process is not None and self.process.poll() is None:
+                self.process.kill()
+
     def cleanup(self):
         """
         Clean up resources after execution while preserving model artifacts.
@@ -0,0 +1,301 @@
+"""
+Module: RayExecutor for Distributed Python Code Execution
+
+This module provides an implementation of the `Executor` interface that runs generated code as Ray tasks, so that
+concurrent executions (e.g. code candidates) are spread across the cores and nodes of a Ray cluster. Without a
+configured cluster address, a local cluster using all the cores of the machine is started.
+
+Input datasets are passed by reference: the content of each input file is streamed into the Ray object store in
+chunks, once per version of the file, and each node materialises it at most once in a local cache instead of every
+task re-reading it from the driver. On the driver node, the original files are used directly. The output files
+written by a task on another node are shipped back to the driver. Scripts run in the working directory of their
+execution, created on the node of the task, with their relative dataset paths made absolute.
+
+Each execution is a single task running the whole script: the generated code may join or aggregate its inputs, so
+splitting them into partitions processed by separate tasks would not give the same output in general.
+
+Ray is an optional dependency: `_get_executor_class` falls back to the LocalExecutor when it is not installed.
+
+Classes:
+    - RayExecutor: A class to execute Python code snippets as Ray tasks.
+"""
+
+import hashlib
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import ray
+
+from aiden.common.dataset import Dataset
+from aiden.common.environment import Environment
+from aiden.common.utils.transformation_utils import replace_dataset_paths
+from aiden.config import config
+from aiden.executors.executor import ExecutionResult, Executor
+from aiden.registries.objects import ObjectRegistry
+
+logger = logging.getLogger(__name__)
+
+# Object references of the chunks of the dataset files put in the object store, keyed by path, modification time
+# and size
+_dataset_refs: Dict[Tuple[str, float, int], List["ray.ObjectRef"]] = {}
+_ray_lock = threading.Lock()
+
+
+def _driver_node_id() -> str:
+    """Return the id of the node of the driver, on whose filesystem the datasets are."""
+    return ray.get_runtime_context().get_node_id()
+
+
+def _ensure_ray() -> None:
+    """Connect to the configured Ray cluster, or start a local one, if not already done."""
+    with _ray_lock:
+        if not ray.is_initialized():
+            ray.init(address=config.execution.ray_address, ignore_reinit_error=True, log_to_driver=False)
+
+
+def _put_dataset(path: Path, chunk_size: Optional[int] = None) -> Tuple[Tuple[str, float, int], List["ray.ObjectRef"]]:
+    """Put a dataset file in the object store once per version of the file, streaming it in chunks."""
+    chunk_size = chunk_size or config.execution.ray_chunk_size_mb * 1024 * 1024
+    stat = path.stat()
+    key = (str(path), stat.st_mtime, stat.st_size)
+    with _ray_lock:
+        if key not in _dataset_refs:
+            # Forget the previous versions of the file
+            for old_key in [k for k in _dataset_refs if k[0] == key[0]]:
+                del _dataset_refs[old_key]
+            # Only one chunk at a time is held in the memory of the driver
+            refs = []
+            with open(path, "rb") as f:
+                while chunk := f.read(chunk_size):
+                    refs.append(ray.put(chunk))
+            _dataset_refs[key] = refs
+        return key, _dataset_refs[key]
+
+
+def _materialise_dataset(key: Tuple[str, float, int], refs: List["ray.ObjectRef"]) -> str:
+    """Return a path on the current node holding the given version of a dataset file."""
+    path, mtime, size = key
+    if os.path.exists(path):
+        stat = os.stat(path)
+        if stat.st_mtime == mtime and stat.st_size == size:
+            return path
+
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:16]
+    local_path = Path(tempfile.gettempdir()) / "aiden-ray-datasets" / digest / Path(path).name
+    if not local_path.exists():
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = local_path.with_suffix(local_path.suffix + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            for ref in refs:
+                f.write(ray.get(ref))
+        os.replace(tmp_path, local_path)
+    return str(local_path)
+
+
+@ray.remote(max_retries=0)
+def _run_script(
+    code: str,
+    code_file: str,
+    command: List[str],
+    cwd: str,
+    timeout: int,
+    datasets: List[Tuple[str, Tuple[str, float, int], List["ray.ObjectRef"]]],
+    written_paths: List[str],
+    driver_node_id: str,
+) -> Dict:
+    """Run a script on the node of the task and return its outcome."""
+    # Use the interpreter of the worker, whose path may differ from the driver's
+    command = [sys.executable if part == "python" else part for part in command]
+    on_driver_node = ray.get_runtime_context().get_node_id() == driver_node_id
+    if not on_driver_node:
+        # Point the code at the node-local copies of the datasets, as they are written in the code
+        for code_path, key, refs in datasets:
+            local_path = _materialise_dataset(key, refs)
+            if local_path != key[0]:
+                code = replace_dataset_paths(code, {code_path: local_path}) or code
+        os.makedirs(cwd, exist_ok=True)
+        os.makedirs(os.path.dirname(code_file), exist_ok=True)
+        for path in written_paths:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(code_file, "w", encoding="utf-8") as f:
+        f.write(code)
+
+    start_time = time.time()
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, cwd=cwd, timeout=timeout)
+        outcome = {"returncode": process.returncode, "stdout": process.stdout, "stderr": process.stderr}
+    except subprocess.TimeoutExpired:
+        outcome = {"returncode": None, "stdout": "", "stderr": "", "timed_out": True}
+    outcome["exec_time"] = time.time() - start_time
+
+    # Ship back the files written by the script when they are not on the driver's filesystem
+    outcome["files"] = {}
+    if not on_driver_node:
+        for path in written_paths:
+            if os.path.exists(path) and os.path.getmtime(path) >= start_time:
+                with open(path, "rb") as f:
+                    outcome["files"][path] = f.read()
+    return outcome
+
+
+def _receive_files(files: Dict[str, bytes]) -> None:
+    """Write the files shipped back by a task from another node."""
+    for path, content in files.items():
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(content)
+
+
+class RayExecutor(Executor):
+    """
+    Execute Python code snippets as tasks on a Ray cluster.
+
+    The `RayExecutor` class implements the `Executor` interface. Each run is a Ray task running the script
+    in a subprocess on the node of the task, with output capture and timeout enforcement.
+    """
+
+    def __init__(
+        self,
+        execution_id: str,
+        code: str,
+        working_dir: Path | str,
+        timeout: int,
+        environment: Environment,
+        code_execution_file_name: str = config.execution.runfile_name,
+        datasets: Optional[List[Dataset]] = None,
+        outputs: Optional[List[str]] = None,
+    ):
+        """
+        Initialize the RayExecutor.
+
+        Args:
+            execution_id (str): Unique identifier for this execution.
+            code (str): The Python code to execute.
+            working_dir (Path | str): The working directory for execution.
+            timeout (int): The maximum allowed execution time in seconds.
+            environment (Environment): The environment to use for execution.
+            code_execution_file_name (str): The filename to use for the executed script.
+            datasets (List[Dataset], optional): Datasets used by the code; the files of the input datasets are
+                passed by reference to the task. Defaults to all the datasets in the object registry.
+            outputs (List[str], optional): Paths of the files written by the code, shipped back when the task runs
+                on another node; the datasets at these paths are not inputs, even if their files already exist.
+                Defaults to the paths of the datasets whose files do not exist yet.
+        """
+        super().__init__(code, timeout)
+        self.working_dir = Path(working_dir).resolve() / execution_id
+        self.working_dir.mkdir(parents=True, exist_ok=True)
+        self.code_file = self.working_dir / code_execution_file_name
+        self.environment = environment
+        self.datasets = datasets if datasets is not None else list(ObjectRegistry().get_all(Dataset).values())
+        self.outputs = outputs
+        self._ref = None
+        self._cancelled = False
+
+    def _command(self) -> List[str]:
+        if self.environment.is_dagster:
+            return ["dagster", "job", "execute", "-f", str(self.code_file)]
+        return ["python", str(self.code_file)]
+
+    def _inputs_and_outputs(self) -> Tuple[List[Path], List[str]]:
+        """Split the local datasets by role: the input files to pass by reference, and the output paths."""
+        if self.outputs is not None:
+            outputs = [str(Path(path).resolve()) for path in self.outputs]
+        else:
+            outputs = [str(Path(d.path).resolve()) for d in self.datasets if d.is_local and not Path(d.path).is_file()]
+        inputs = []
+        for dataset in self.datasets:
+            path = Path(dataset.path).resolve()
+            if dataset.is_local and str(path) not in outputs and path.is_file():
+                inputs.append(dataset)
+        return inputs, outputs
+
+    def _absolute_paths(self, code: str) -> str:
+        """Make the relative dataset paths of the code absolute, as the script runs in the working directory."""
+        for dataset in self.datasets:
+            if dataset.is_local and not os.path.isabs(dataset.path):
+                code = replace_dataset_paths(code, {dataset.path: str(Path(dataset.path).resolve())}) or code
+        for path in self.outputs or []:
+            if not os.path.isabs(path):
+                code = replace_dataset_paths(code, {path: str(Path(path).resolve())}) or code
+        return code
+
+    def run(self) -> ExecutionResult:
+        """Execute code in a Ray task and return results."""
+        logger.debug(f"RayExecutor is executing code with working directory: {self.working_dir}")
+        start_time = time.time()
+
+        try:
+            _ensure_ray()
+            input_datasets, outputs = self._inputs_and_outputs()
+            inputs = [
+                (str(Path(dataset.path).resolve()), *_put_dataset(Path(dataset.path).resolve()))
+                for dataset in input_datasets
+            ]
+
+            module_setup = "import os\nimport sys\nfrom pathlib import Path\n\n"
+            self._ref = _run_script.options(num_cpus=config.execution.ray_num_cpus_per_task).remote(
+                module_setup + self._absolute_paths(self.code),
+                str(self.code_file),
+                self._command(),
+                # The working directory of the execution, also created on other nodes, unlike the driver's cwd
+                str(self.working_dir),
+                self.timeout,
+                inputs,
+                outputs,
+                _driver_node_id(),
+            )
+            if self._cancelled:
+                ray.cancel(self._ref, force=True)
+            # The task enforces the timeout itself; the grace period covers scheduling and data transfer
+            outcome = ray.get(self._ref, timeout=self.timeout + 60)
+
+            _receive_files(outcome["files"])
+
+            if outcome.get("timed_out"):
+                return ExecutionResult(
+                    term_out=[],
+                    exec_time=self.timeout,
+                    exception=TimeoutError(
+                        f"Execution exceeded {self.timeout}s timeout - individual run timeout limit reached"
+                    ),
+                )
+            if outcome["returncode"] != 0:
+                return ExecutionResult(
+                    term_out=[outcome["stdout"]],
+                    exec_time=outcome["exec_time"],
+                    exception=RuntimeError(f"Process exited with code {outcome['returncode']}: {outcome['stderr']}"),
+                )
+            return ExecutionResult(term_out=[outcome["stdout"]], exec_time=outcome["exec_time"])
+
+        except Exception as e:
+            error = RuntimeError("Execution was cancelled") if self._cancelled else e
+            return ExecutionResult(
+                term_out=[f"Process failed with exception: {str(error)}"],
+                exec_time=time.time() - start_time,
+                exception=error,
+            )
+        finally:
+            self.cleanup()
+
+    def cancel(self) -> None:
+        """
+        Cancel the Ray task running the code, if any.
+        """
+        self._cancelled = True
+        if self._ref is not None:
+            ray.cancel(self._ref, force=True)
+
+    def cleanup(self) -> None:
+        """
+        Clean up resources after execution while preserving the outputs.
+        """
+        try:
+            self.code_file.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Error during resource cleanup: {str(e)}")
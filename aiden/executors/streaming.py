@@ -0,0 +1,43 @@
+"""
+This module builds executable scripts for streaming transformations.
+
+In streaming mode, the generated code does not read and write whole files: it exposes a per-batch function, and
+the script executed by the executors wraps it with the streaming runtime, which feeds it batches of the streamed
+input dataset and writes the outputs incrementally. The runtime is embedded in the script rather than imported,
+so the script runs in any executor, including containers and remote nodes without aiden installed.
+"""
+
+from pathlib import Path
+
+from aiden.common.dataset import Dataset
+
+STREAMING_FUNCTION = "transform_batch"
+
+_RUNTIME_SOURCE = Path(__file__).with_name("streaming_runtime.py").read_text(encoding="utf-8")
+
+
+def build_streaming_script(source: str, input_dataset: Dataset, output_dataset: Dataset, batch_size: int) -> str:
+    """
+    Wrap the source of a streaming transformation into a script that streams a dataset through it.
+
+    :param source: the generated source, defining the per-batch function
+    :param input_dataset: the dataset streamed through the per-batch function
+    :param output_dataset: the dataset written incrementally from the results of the per-batch function
+    :param batch_size: the maximum number of rows per batch
+    :return: the executable script
+    """
+    # The schemas are passed as mappings of column names to type names, as the runtime cannot import aiden
+    input_schema = Dataset.format_schema(input_dataset.schema)
+    output_schema = Dataset.format_schema(output_dataset.schema)
+    call = (
+        f"_aiden_streaming['run_streaming']({STREAMING_FUNCTION}, {input_dataset.path!r}, {input_dataset.format!r}, "
+        f"{output_dataset.path!r}, {output_dataset.format!r}, {batch_size}, {input_schema!r}, {output_schema!r})"
+    )
+    return (
+        f"{source}\n\n\n"
+        "# Aiden streaming runtime, executed in its own namespace\n"
+        "_aiden_streaming = {}\n"
+        f"exec(compile({_RUNTIME_SOURCE!r}, 'aiden_streaming_runtime', 'exec'), _aiden_streaming)\n\n"
+        "if __name__ == '__main__':\n"
+        f"    {call}\n"
+    )
@@ -0,0 +1,169 @@
+"""
+Runtime feeding the per-batch function of a streaming transformation.
+
+A streaming transformation exposes `transform_batch(batch: pd.DataFrame) -> pd.DataFrame`. This runtime reads the
+streamed input dataset in batches of bounded size with pyarrow, calls the function on each batch and writes the
+results incrementally, so that memory use depends on the batch size rather than on the size of the files.
+
+The schemas of the datasets, as mappings of column names to type names (e.g. {"amount": "float"}), fix the types of
+the columns read from CSV files and of the columns written to Parquet and Arrow files, which would otherwise be
+inferred from the first block or batch.
+
+The source of this module is embedded in the executed script (see `aiden.executors.streaming`), so that it runs in
+any executor without aiden being importable. It must only depend on the standard library, pandas and pyarrow.
+"""
+
+import os
+import time
+
+# Arrow types of the schema type names
+_ARROW_TYPES = {"int": "int64", "float": "float64", "str": "string", "bool": "bool"}
+
+
+def arrow_types(schema):
+    """Return the Arrow types of the columns of a schema whose type name is known."""
+    import pyarrow as pa
+
+    return {
+        column: pa.type_for_alias(_ARROW_TYPES[type_name])
+        for column, type_name in (schema or {}).items()
+        if type_name in _ARROW_TYPES
+    }
+
+
+def iter_batches(path, fmt, batch_size, schema=None):
+    """Yield the rows of a dataset file as pandas DataFrames of at most batch_size rows."""
+    import pyarrow as pa
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        for record_batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_size):
+            yield record_batch.to_pandas()
+    elif fmt == "csv":
+        import pyarrow.csv as pv
+
+        # Column types are taken from the schema, the others are inferred on the first block and kept for the file
+        convert_options = pv.ConvertOptions(column_types=arrow_types(schema), strings_can_be_null=True)
+        for record_batch in pv.open_csv(path, convert_options=convert_options):
+            for offset in range(0, record_batch.num_rows, batch_size):
+                yield record_batch.slice(offset, batch_size).to_pandas()
+    elif fmt in ("json", "jsonl"):
+        import pandas as pd
+
+        with open(path, encoding="utf-8") as f:
+            first = f.read(1024).lstrip()[:1]
+        if first == "[":
+            raise ValueError(
+                f"Streaming requires line-delimited JSON, with one record per line, but {path} is a JSON array"
+            )
+        yield from pd.read_json(path, lines=True, chunksize=batch_size)
+    elif fmt in ("arrow", "feather", "ipc"):
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                record_batch = reader.get_batch(i)
+                for offset in range(0, record_batch.num_rows, batch_size):
+                    yield record_batch.slice(offset, batch_size).to_pandas()
+    else:
+        raise ValueError(f"Streaming is not supported for the '{fmt}' format")
+
+
+class BatchWriter:
+    """Write DataFrames to a dataset file incrementally, as JSON lines for the JSON formats."""
+
+    def __init__(self, path, fmt, schema=None):
+        self.path = path
+        self.fmt = fmt
+        self.schema = schema or {}
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._schema = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, df):
+        import pyarrow as pa
+
+        if self.fmt == "csv":
+            if self._file is None:
+                self._file = open(self.path, "w", encoding="utf-8", newline="")
+                df.to_csv(self._file, index=False)
+            else:
+                df.to_csv(self._file, index=False, header=False)
+        elif self.fmt in ("json", "jsonl"):
+            if self._file is None:
+                self._file = open(self.path, "w", encoding="utf-8")
+            if len(df):
+                records = df.to_json(orient="records", lines=True)
+                # Recent pandas versions end the records with a newline, older ones do not
+                self._file.write(records if records.endswith("\n") else records + "\n")
+        elif self.fmt in ("parquet", "arrow", "feather", "ipc"):
+            if self._writer is None:
+                # Columns of the output schema have its types, the others the types of the first batch
+                inferred = pa.Table.from_pandas(df, preserve_index=False).schema
+                types = arrow_types(self.schema)
+                self._open(pa.schema([(field.name, types.get(field.name, field.type)) for field in inferred]))
+            self._writer.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False))
+        else:
+            raise ValueError(f"Streaming is not supported for the '{self.fmt}' format")
+        self.rows += len(df)
+
+    def _open(self, schema):
+        import pyarrow as pa
+
+        self._schema = schema
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self.path, schema)
+        else:
+            self._writer = pa.ipc.new_file(self.path, schema)
+
+    def close(self):
+        if self._file is None and self._writer is None:
+            # No batch was written: still create a readable output file, with the columns of the output schema
+            if self.fmt in ("parquet", "arrow", "feather", "ipc"):
+                import pyarrow as pa
+
+                types = arrow_types(self.schema)
+                self._open(pa.schema([(column, types.get(column, pa.string())) for column in self.schema]))
+            else:
+                with open(self.path, "w", encoding="utf-8", newline="") as f:
+                    if self.fmt == "csv" and self.schema:
+                        f.write(",".join(self.schema) + "\n")
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run_streaming(
+    transform_batch,
+    input_path,
+    input_format,
+    output_path,
+    output_format,
+    batch_size,
+    input_schema=None,
+    output_schema=None,
+):
+    """Stream a dataset through transform_batch, and return the numbers of rows read and written."""
+    start_time = time.time()
+    rows_in, batches = 0, 0
+    writer = BatchWriter(output_path, output_format, output_schema)
+    try:
+        for batch in iter_batches(input_path, input_format, batch_size, input_schema):
+            rows_in += len(batch)
+            batches += 1
+            result = transform_batch(batch)
+            if result is not None:
+                writer.write(result)
+    finally:
+        writer.close()
+    print(
+        f"Streamed {rows_in} rows in {batches} batches, wrote {writer.rows} rows " f"in {time.time() - start_time:.3f}s"
+    )
+    return rows_in, writer.rows
@@ -0,0 +1,218 @@
+"""
+Entry point of a pre-warmed Python worker process used by the WorkerPool.
+
+The worker imports the allowed packages once at startup, then serves jobs received as JSON lines on stdin. Each
+job is run in a child forked from the warm worker, so that it starts with every package already imported but
+with a fresh module namespace and no state leaking from previous jobs. The child's stdout and stderr are
+redirected to the files named in the job, and the worker answers with a JSON line describing the outcome.
+
+Jobs in "dagster" mode load the script as a module and materialise its Definitions in process, instead of
+booting the dagster CLI for every run; the per-step outcome is written as JSON to the job's result file.
+
+This file is executed as a standalone script rather than imported as part of the aiden package, so that the
+worker does not pay for importing aiden and its dependencies. It must only depend on the standard library.
+"""
+
+import builtins
+import hashlib
+import importlib
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+from collections import OrderedDict
+
+# Do not let the modules next to this script shadow the packages used by the generated code
+if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(os.path.abspath(__file__)):
+    sys.path.pop(0)
+
+# Compiled code objects, keyed by a hash of the source: identical scripts are compiled only once per worker. The
+# least recently used entries are evicted beyond the size given by the pool, so long-lived workers stay bounded
+_compiled = OrderedDict()
+_compiled_max_size = 128
+
+
+def _preload(modules):
+    """Import the given modules, ignoring the ones that are not installed."""
+    loaded = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except Exception:
+            pass
+    return loaded
+
+
+def _compile(code_file):
+    """Return the compiled code object for a script, compiling it on first use."""
+    with open(code_file, "r", encoding="utf-8") as f:
+        source = f.read()
+    key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    if key in _compiled:
+        _compiled.move_to_end(key)
+        return _compiled[key]
+    code = compile(source, code_file, "exec")
+    if _compiled_max_size > 0:
+        _compiled[key] = code
+        while len(_compiled) > _compiled_max_size:
+            _compiled.popitem(last=False)
+    return code
+
+
+def _run_child(job, code):
+    """Run a job in the forked child process; never returns."""
+    exit_code = 0
+    try:
+        # Redirect the standard streams at the file descriptor level, so that subprocesses inherit them too
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        stdout_fd = os.open(job["stdout_file"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        stderr_fd = os.open(job["stderr_file"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", buffering=1, closefd=False)
+        sys.stderr = open(2, "w", buffering=1, closefd=False)
+
+        if job.get("env") is not None:
+            os.environ.clear()
+            os.environ.update(job["env"])
+        os.chdir(job["cwd"])
+        sys.argv = [job["code_file"]]
+        sys.path.insert(0, os.path.dirname(job["code_file"]))
+
+        namespace = {"__name__": "__main__", "__file__": job["code_file"], "__builtins__": builtins}
+        if job.get("mode") == "dagster":
+            namespace["__name__"] = "__aiden_dagster_job__"
+            exec(code, namespace)
+            exit_code = _materialize_dagster(namespace, job.get("result_file"))
+        else:
+            exec(code, namespace)
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except Exception:
+            pass
+    os._exit(exit_code)
+
+
+def _materialize_dagster(namespace, result_file):
+    """Materialise the Definitions, job or assets defined by a dagster module in process; return the exit code."""
+    import dagster as dg
+
+    definitions = [value for value in namespace.values() if isinstance(value, dg.Definitions)]
+    jobs = [value for value in namespace.values() if isinstance(value, dg.JobDefinition)]
+    assets = [value for value in namespace.values() if isinstance(value, dg.AssetsDefinition)]
+
+    instance = dg.DagsterInstance.ephemeral()
+    if definitions:
+        defs = definitions[0]
+        resolve = getattr(defs, "resolve_implicit_global_asset_job_def", None) or defs.get_implicit_global_asset_job_def
+        result = resolve().execute_in_process(instance=instance, raise_on_error=False)
+    elif len(jobs) == 1:
+        result = jobs[0].execute_in_process(instance=instance, raise_on_error=False)
+    elif assets:
+        result = dg.materialize(assets, instance=instance, raise_on_error=False)
+    else:
+        print("No dagster Definitions, single job or assets found in the module", file=sys.stderr)
+        return 1
+
+    errors = {}
+    for event in result.get_step_failure_events():
+        failure = event.step_failure_data
+        errors[event.step_key] = failure.error.to_string() if failure and failure.error else "Step failed"
+
+    steps = []
+    for stats in instance.get_run_step_stats(result.run_id):
+        duration = None
+        if stats.start_time is not None and stats.end_time is not None:
+            duration = stats.end_time - stats.start_time
+        status = stats.status.value.lower() if stats.status else "unknown"
+        steps.append(
+            {"name": stats.step_key, "status": status, "duration": duration, "error": errors.get(stats.step_key)}
+        )
+        print(f"Step '{stats.step_key}' {status}" + (f" in {duration:.3f}s" if duration is not None else ""))
+
+    for step_key, error in errors.items():
+        print(f"Step '{step_key}' failed:\n{error}", file=sys.stderr)
+
+    if result_file:
+        with open(result_file, "w", encoding="utf-8") as f:
+            json.dump({"success": result.success, "steps": steps}, f)
+    return 0 if result.success else 1
+
+
+def _wait(pid, timeout):
+    """Wait for a child with a timeout, killing it if the timeout expires."""
+    deadline = time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        waited_pid, status, rusage = os.wait4(pid, os.WNOHANG)
+        if waited_pid == pid:
+            return os.waitstatus_to_exitcode(status), False, rusage.ru_maxrss
+        if time.monotonic() >= deadline:
+            os.kill(pid, signal.SIGKILL)
+            _, status, rusage = os.wait4(pid, 0)
+            return os.waitstatus_to_exitcode(status), True, rusage.ru_maxrss
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+def _handle(job):
+    """Run a single job and return the response to send back."""
+    try:
+        code = _compile(job["code_file"])
+    except SyntaxError:
+        with open(job["stdout_file"], "w", encoding="utf-8"):
+            pass
+        with open(job["stderr_file"], "w", encoding="utf-8") as f:
+            f.write(traceback.format_exc())
+        return {"returncode": 1, "timed_out": False, "max_rss_kb": 0}
+
+    pid = os.fork()
+    if pid == 0:
+        _run_child(job, code)
+
+    returncode, timed_out, max_rss_kb = _wait(pid, job["timeout"])
+    return {"returncode": returncode, "timed_out": timed_out, "max_rss_kb": max_rss_kb}
+
+
+def main():
+    global _compiled_max_size
+    preload = json.loads(sys.argv[1]) if len(sys.argv) > 1 else []
+    if len(sys.argv) > 2:
+        _compiled_max_size = int(sys.argv[2])
+    protocol_out = sys.stdout
+    loaded = _preload(preload)
+    protocol_out.write(json.dumps({"ready": True, "preloaded": loaded}) + "\n")
+    protocol_out.flush()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        try:
+            response = _handle(job)
+        except Exception:
+            response = {"returncode": 1, "timed_out": False, "max_rss_kb": 0, "error": traceback.format_exc()}
+        protocol_out.write(json.dumps(response) + "\n")
+        protocol_out.flush()
+
+
+if __name__ == "__main__":
+    main()
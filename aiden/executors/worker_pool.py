@@ -0,0 +1,304 @@
+"""
+This module provides a pool of pre-warmed Python worker processes for executing generated code.
+
+Starting a fresh interpreter for every candidate script re-pays the interpreter startup and the import of heavy
+packages such as pandas, numpy and pyarrow. The workers in this pool import the allowed packages once, and then
+run each script in a child process forked from the warm worker: every job gets a fresh namespace and full process
+isolation, without the startup cost.
+
+Classes:
+    - WorkerResult: The outcome of a job run by a worker.
+    - WarmWorker: A single pre-warmed worker process.
+    - WorkerPool: A bounded pool of warm workers shared by the executors.
+"""
+
+import atexit
+import json
+import logging
+import os
+import select
+import signal
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiden.config import config
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).with_name("warm_worker.py")
+
+
+def worker_pool_supported() -> bool:
+    """Return whether warm workers can be used on this platform (they rely on fork)."""
+    return hasattr(os, "fork") and sys.platform != "win32"
+
+
+@dataclass
+class WorkerResult:
+    """
+    Outcome of a job run by a warm worker.
+
+    Attributes:
+        returncode (int): The exit code of the job, negative if it was killed by a signal.
+        stdout (str): The standard output of the job.
+        stderr (str): The standard error of the job.
+        timed_out (bool): Whether the job was killed because it exceeded its timeout.
+        max_rss_kb (int): The peak resident set size of the job process, in kilobytes.
+        details (dict): Structured outcome written by the job to its result file, if any.
+    """
+
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    max_rss_kb: int = 0
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+class WarmWorker:
+    """
+    A long-lived Python process with preloaded packages that runs scripts in forked children.
+    """
+
+    def __init__(self, preload: List[str], compile_cache_size: Optional[int] = None):
+        """
+        Start the worker and wait for it to finish importing the preloaded packages.
+
+        :param preload: names of the modules to import in the worker before serving jobs
+        :param compile_cache_size: number of compiled scripts the worker keeps, defaults to the configured size
+        """
+        if compile_cache_size is None:
+            compile_cache_size = config.execution.warm_worker_compile_cache_size
+        self.preload = preload
+        self.compile_cache_size = compile_cache_size
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", str(WORKER_SCRIPT), json.dumps(preload), str(compile_cache_size)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            # Run in a dedicated process group, so that a job and its worker can be killed together
+            start_new_session=True,
+        )
+        ready = self.process.stdout.readline()
+        if not ready:
+            self.kill()
+            raise RuntimeError("Warm worker exited during startup")
+        self.preloaded = json.loads(ready).get("preloaded", [])
+        logger.debug(f"Warm worker {self.process.pid} ready with preloaded packages {self.preloaded}")
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(
+        self,
+        code_file: Path,
+        cwd: Path | str,
+        timeout: float,
+        stdout_file: Path,
+        stderr_file: Path,
+        env: Optional[Dict[str, str]] = None,
+        mode: str = "script",
+        result_file: Optional[Path] = None,
+    ) -> WorkerResult:
+        """
+        Run a script in a fresh child of the worker.
+
+        :param code_file: the script to run as '__main__'
+        :param cwd: the working directory of the job
+        :param timeout: maximum execution time in seconds, after which the job is killed
+        :param stdout_file: file receiving the standard output of the job
+        :param stderr_file: file receiving the standard error of the job
+        :param env: environment variables of the job; defaults to the current environment
+        :param mode: 'script' to run the file as '__main__', or 'dagster' to materialise its definitions in process
+        :param result_file: file receiving the structured outcome of the job, used by the 'dagster' mode
+        :return: the outcome of the job
+        :raises RuntimeError: if the worker process died while running the job
+        """
+        job = {
+            "code_file": str(code_file),
+            "cwd": str(cwd),
+            "timeout": timeout,
+            "stdout_file": str(stdout_file),
+            "stderr_file": str(stderr_file),
+            "env": dict(os.environ) if env is None else env,
+            "mode": mode,
+            "result_file": str(result_file) if result_file else None,
+        }
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.kill()
+            raise RuntimeError(f"Warm worker is not accepting jobs: {e}") from e
+
+        # The worker enforces the job timeout itself; the grace period only protects against a hung worker
+        readable, _, _ = select.select([self.process.stdout], [], [], timeout + 30)
+        response = self.process.stdout.readline() if readable else ""
+        if not response:
+            self.kill()
+            raise RuntimeError("Warm worker died while running a job")
+
+        outcome = json.loads(response)
+        return WorkerResult(
+            returncode=outcome["returncode"],
+            stdout=_read_text(stdout_file),
+            stderr=_read_text(stderr_file) + outcome.get("error", ""),
+            timed_out=outcome.get("timed_out", False),
+            max_rss_kb=outcome.get("max_rss_kb", 0),
+            details=_read_json(result_file) if result_file else {},
+        )
+
+    def kill(self) -> None:
+        """
+        Kill the worker together with any job it is running.
+        """
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+class WorkerPool:
+    """
+    Bounded pool of warm workers. Workers are started on demand and replaced if they die.
+    """
+
+    def __init__(self, size: int, preload: List[str], compile_cache_size: Optional[int] = None):
+        """
+        Initialise the pool.
+
+        :param size: maximum number of workers, and hence of concurrent jobs
+        :param preload: names of the modules every worker imports at startup
+        :param compile_cache_size: number of compiled scripts each worker keeps, defaults to the configured size
+        """
+        if size < 1:
+            raise ValueError("Worker pool size must be at least 1")
+        self.size = size
+        self.preload = list(preload)
+        self.compile_cache_size = compile_cache_size
+        self._idle: List[WarmWorker] = []
+        self._started = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+    @contextmanager
+    def acquire(self):
+        """
+        Context manager providing exclusive use of a worker, blocking while all workers are busy.
+        """
+        worker = self._checkout()
+        try:
+            yield worker
+        finally:
+            self._checkin(worker)
+
+    def _checkout(self) -> WarmWorker:
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Worker pool is shut down")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive:
+                        return worker
+                    self._started -= 1
+                if self._started < self.size:
+                    self._started += 1
+                    break
+                self._condition.wait()
+
+        # Start the new worker outside the lock, as importing the preloaded packages takes a while
+        try:
+            return WarmWorker(self.preload, self.compile_cache_size)
+        except Exception:
+            with self._condition:
+                self._started -= 1
+                self._condition.notify()
+            raise
+
+    def _checkin(self, worker: WarmWorker) -> None:
+        with self._condition:
+            if worker.alive and not self._closed:
+                self._idle.append(worker)
+            else:
+                worker.kill()
+                self._started -= 1
+            self._condition.notify()
+
+    def warm_up(self) -> None:
+        """
+        Start all the workers of the pool ahead of the first job.
+        """
+        workers = [self._checkout() for _ in range(self.size - len(self._idle))]
+        for worker in workers:
+            self._checkin(worker)
+
+    def shutdown(self) -> None:
+        """
+        Kill all idle workers and refuse further jobs.
+        """
+        with self._condition:
+            self._closed = True
+            for worker in self._idle:
+                worker.kill()
+            self._started -= len(self._idle)
+            self._idle = []
+            self._condition.notify_all()
+
+
+_worker_pools: Dict[Tuple[int, Tuple[str, ...]], WorkerPool] = {}
+_worker_pools_lock = threading.Lock()
+
+
+def get_worker_pool(preload: Optional[List[str]] = None) -> Optional[WorkerPool]:
+    """
+    Return the shared worker pool for a set of preloaded packages, or None if warm workers are disabled.
+
+    :param preload: names of the modules to preload; defaults to the allowed packages for generated code
+    :return: the shared WorkerPool, or None if the pool is disabled or not supported on this platform
+    """
+    size = config.execution.warm_worker_pool_size
+    if size < 1 or not worker_pool_supported():
+        return None
+
+    if preload is None:
+        preload = config.code_generation.allowed_packages
+    key = (size, tuple(preload))
+    with _worker_pools_lock:
+        if key not in _worker_pools:
+            _worker_pools[key] = WorkerPool(size=size, preload=list(preload))
+        return _worker_pools[key]
+
+
+@atexit.register
+def _shutdown_worker_pools() -> None:
+    for pool in _worker_pools.values():
+        pool.shutdown()
+
+
+def _read_text(path: Path) -> str:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
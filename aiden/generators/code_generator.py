@@ -13,14 +13,17 @@ Classes:
     TrainingCodeGenerator: A class to generate, fix, and review machine learning model training code.
 """
 
+import asyncio
+import concurrent.futures
 import json
 import logging
-from typing import Dict, List
+from typing import Any, Dict, List
 
 from pydantic import BaseModel
 
 from aiden.common.dataset import Dataset
 from aiden.common.environment import Environment
+from aiden.common.profiler import describe_datasets
 from aiden.common.provider import Provider
 from aiden.registries.objects import ObjectRegistry
 from aiden.common.utils.response import extract_code
@@ -60,25 +63,97 @@ class TransformationCodeGenerator:
         :param [str] output_dataset_name: The name of the dataset to store the transformation results.
         :return str: The generated transformation code.
         """
-        registry = ObjectRegistry()
-        input_datasets = registry.get_multiple(Dataset, input_datasets_names)
-        output_dataset = registry.get(Dataset, output_dataset_name)
-
         return extract_code(
             self.provider.query(
                 system_message=prompt_templates.transformation_system(),
-                user_message=prompt_templates.transformation_generate(
-                    problem_statement=problem_statement,
-                    plan=plan,
-                    input_datasets=[str(v) for _, v in input_datasets.items()],
-                    output_dataset=str(output_dataset),
-                    history=self.history,
-                    allowed_packages=config.code_generation.allowed_packages,
-                    environment_type=self.environment.type,
-                ),
+                user_message=self._generate_prompt(problem_statement, plan, input_datasets_names, output_dataset_name),
             )
         )
 
+    def generate_transformation_code_candidates(
+        self,
+        problem_statement: str,
+        plan: str,
+        input_datasets_names: List[str],
+        output_dataset_name: str,
+        n: int,
+    ) -> List[str]:
+        """
+        Generates several independent candidate implementations of the solution plan concurrently.
+
+        :param [str] problem_statement: The description of the problem to be solved.
+        :param [str] plan: The proposed solution plan.
+        :param [List[str]] input_datasets_names: The names of the datasets to use for transformation.
+        :param [str] output_dataset_name: The name of the dataset to store the transformation results.
+        :param [int] n: The number of candidates to generate.
+        :return List[str]: The generated candidates; candidates whose generation failed are left out.
+        """
+        system_message = prompt_templates.transformation_system()
+        user_messages = [
+            self._generate_prompt(
+                problem_statement,
+                plan,
+                input_datasets_names,
+                output_dataset_name,
+                candidate={"index": i + 1, "total": n},
+            )
+            for i in range(n)
+        ]
+
+        async def generate_all():
+            # The candidates are deliberate repeats: cached responses would give back the candidates of a previous
+            # call instead of new ones, so the response cache is bypassed
+            return await asyncio.gather(
+                *[
+                    self.provider.aquery(system_message, user_message, use_cache=False)
+                    for user_message in user_messages
+                ],
+                return_exceptions=True,
+            )
+
+        candidates = []
+        for i, response in enumerate(_run_coroutine(generate_all())):
+            if isinstance(response, BaseException):
+                logger.warning(f"Generation of candidate {i + 1} of {n} failed: {str(response)[:50]}")
+                continue
+            candidates.append(extract_code(response))
+        if not candidates:
+            raise RuntimeError(f"Generation of all {n} transformation code candidates failed")
+        return candidates
+
+    def _generate_prompt(
+        self,
+        problem_statement: str,
+        plan: str,
+        input_datasets_names: List[str],
+        output_dataset_name: str,
+        candidate: Dict[str, int] | None = None,
+    ) -> str:
+        registry = ObjectRegistry()
+        input_datasets = registry.get_multiple(Dataset, input_datasets_names)
+        output_dataset = registry.get(Dataset, output_dataset_name)
+
+        datasets = [str(v) for _, v in input_datasets.items()]
+        streaming = None
+        if self.environment.is_streaming:
+            # The runtime streams the first input dataset; the code reads the other ones itself
+            streaming = {"dataset": datasets[0], "batch_size": self.environment.batch_size}
+            datasets = datasets[1:]
+
+        return prompt_templates.transformation_generate(
+            problem_statement=problem_statement,
+            plan=plan,
+            input_datasets=datasets,
+            output_dataset=str(output_dataset),
+            history=self.history,
+            allowed_packages=config.code_generation.engine_packages(self.environment.engine),
+            environment_type=self.environment.type,
+            candidate=candidate,
+            streaming=streaming,
+            dataset_profiles=describe_datasets(list(input_datasets.values())),
+            engine=self.environment.engine,
+        )
+
     def fix_transformation_code(
         self,
         transformation_code: str,
@@ -109,8 +184,12 @@ class TransformationCodeGenerator:
                         transformation_code=transformation_code,
                         review=review,
                         problems=problems,
-                        allowed_packages=config.code_generation.allowed_packages,
+                        allowed_packages=config.code_generation.engine_packages(self.environment.engine),
                         environment_type=self.environment.type,
+                        streaming=(
+                            {"batch_size": self.environment.batch_size} if self.environment.is_streaming else None
+                        ),
+                        engine=self.environment.engine,
                     ),
                     response_format=FixResponse,
                 )
@@ -118,6 +197,50 @@ class TransformationCodeGenerator:
         )
         return extract_code(response.code)
 
+    def optimize_transformation_code(
+        self,
+        transformation_code: str,
+        plan: str,
+        benchmark: Dict[str, Any],
+        problems: str | None = None,
+    ) -> str:
+        """
+        Rewrites correct transformation code to run faster, based on a benchmark of the code.
+
+        :param [str] transformation_code: The correct transformation code to optimise.
+        :param [str] plan: The solution plan implemented by the code.
+        :param [Dict[str, Any]] benchmark: The benchmark of the code: the 'rows' of each input dataset, the wall
+            time 'exec_time', the 'peak_memory_mb' and the cProfile 'profile' report.
+        :param [str] problems: Why previous optimisation attempts were rejected, if any.
+        :return str: The optimised transformation code.
+        """
+
+        class OptimizeResponse(BaseModel):
+            plan: str
+            code: str
+
+        response: OptimizeResponse = OptimizeResponse(
+            **json.loads(
+                self.provider.query(
+                    system_message=prompt_templates.transformation_system(),
+                    user_message=prompt_templates.transformation_optimize(
+                        plan=plan,
+                        transformation_code=transformation_code,
+                        benchmark=benchmark,
+                        problems=problems,
+                        allowed_packages=config.code_generation.engine_packages(self.environment.engine),
+                        environment_type=self.environment.type,
+                        streaming=(
+                            {"batch_size": self.environment.batch_size} if self.environment.is_streaming else None
+                        ),
+                        engine=self.environment.engine,
+                    ),
+                    response_format=OptimizeResponse,
+                )
+            )
+        )
+        return extract_code(response.code)
+
     def review_transformation_code(
         self, transformation_code: str, problem_statement: str, plan: str, problems: str | None = None
     ) -> str:
@@ -137,8 +260,9 @@ class TransformationCodeGenerator:
                 plan=plan,
                 transformation_code=transformation_code,
                 problems=problems,
-                allowed_packages=config.code_generation.allowed_packages,
+                allowed_packages=config.code_generation.engine_packages(self.environment.engine),
                 environment_type=self.environment.type,
+                engine=self.environment.engine,
             ),
         )
 
@@ -154,3 +278,13 @@ class TransformationCodeGenerator:
         self, transformation_tests: str, transformation_code: str, problem_statement: str, plan: str
     ) -> str:
         raise NotImplementedError("Review of the transformation tests is not yet implemented.")
+
+
+def _run_coroutine(coroutine):
+    """Run a coroutine to completion, also when called from a thread that already runs an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
@@ -1,34 +1,122 @@
 """
 This module provides a generic Registry pattern implementation for storing and retrieving objects by name or prefix.
+
+Registries are scoped: `ObjectRegistry()` returns the registry activated in the current context, e.g. the
+registry of the build running in the current thread or task, and the process-wide root registry otherwise. Each
+scope can read through to a parent registry, which it never modifies, so that builds running concurrently in the
+same process share common objects without seeing or clearing each other's objects.
+
+Items are indexed by type, then by name, so that lookups do not depend on the number of objects of other types. The
+number of items kept per type can be bounded, for transient objects such as the code of every candidate: past the
+bound, the least recently used items of the type are dropped.
 """
 
-from typing import Dict, List, Type, TypeVar
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Type, TypeVar
 
 T = TypeVar("T")
 
+# Registry returned by ObjectRegistry() in the current context, if one was activated
+_active_registry: ContextVar[Optional["ObjectRegistry"]] = ContextVar("aiden_object_registry", default=None)
+
 
 class ObjectRegistry:
     """
     Registry for storing and retrieving objects by name.
 
-    This class implements the Singleton pattern so that registry instances are shared
-    across the application. It provides methods for registering, retrieving, and
-    managing objects in a type-safe manner.
+    Instantiating this class returns the registry of the current context, so that registry instances are shared
+    across the application within a build, and by default across the process. It provides methods for
+    registering, retrieving, and managing objects in a type-safe manner. All methods are thread-safe.
     """
 
-    _instance = None
-    _items = {}
+    _root = None
+    _root_lock = threading.Lock()
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ObjectRegistry, cls).__new__(cls)
-            cls._items = {}
-        return cls._instance
+        active = _active_registry.get()
+        if active is not None:
+            return active
+        return cls.root()
+
+    @classmethod
+    def root(cls) -> "ObjectRegistry":
+        """
+        Return the process-wide root registry, used when no registry is active in the current context.
+
+        :return: the root registry
+        """
+        with cls._root_lock:
+            if cls._root is None:
+                cls._root = cls.create()
+            return cls._root
+
+    @classmethod
+    def create(
+        cls, parent: Optional["ObjectRegistry"] = None, retention: Optional[Dict[Type, int]] = None
+    ) -> "ObjectRegistry":
+        """
+        Create a new, empty registry scope.
+
+        :param parent: registry whose items are visible from the new scope, read-only, unless shadowed
+        :param retention: maximum number of items kept per type, for the types whose number of items is bounded
+        :return: the new registry
+        """
+        registry = super().__new__(cls)
+        registry._items = {}
+        registry._parent = parent
+        registry._retention = dict(retention or {})
+        registry._lock = threading.RLock()
+        return registry
+
+    @contextmanager
+    def activate(self):
+        """
+        Context manager making this registry the one returned by `ObjectRegistry()` in the current context.
+
+        Contexts are inherited by asyncio tasks, but not by new threads: code running in other threads must
+        activate the registry again.
+        """
+        token = _active_registry.set(self)
+        try:
+            yield self
+        finally:
+            _active_registry.reset(token)
+
+    @property
+    def parent(self) -> Optional["ObjectRegistry"]:
+        """The read-only parent of this registry, if any."""
+        return self._parent
+
+    def set_retention(self, t: Type[T], max_items: Optional[int]) -> None:
+        """
+        Bound the number of items of a type kept in this registry, dropping the least recently used ones.
+
+        :param t: type prefix for the items
+        :param max_items: maximum number of items kept, or None to keep every item
+        """
+        with self._lock:
+            if max_items is None:
+                self._retention.pop(t, None)
+            else:
+                self._retention[t] = max_items
+                self._evict(t)
 
     @staticmethod
     def _get_uri(t: Type[T], name: str) -> str:
         return f"{str(t)}://{name}"
 
+    def _evict(self, t: Type[T]) -> None:
+        """Drop the least recently used items of a type beyond its retention bound; the lock must be held."""
+        max_items = self._retention.get(t)
+        items = self._items.get(t)
+        if max_items is None or items is None:
+            return
+        while len(items) > max_items:
+            items.popitem(last=False)
+
     def register(self, t: Type[T], name: str, item: T) -> None:
         """
         Register an item with a given name.
@@ -37,10 +125,12 @@ class ObjectRegistry:
         :param name: identifier for the item - must be unique within the prefix
         :param item: the item to register
         """
-        uri = self._get_uri(t, name)
-        if uri in self._items:
-            raise ValueError(f"Item '{uri}' already registered, use a different name")
-        self._items[uri] = item
+        with self._lock:
+            items = self._items.setdefault(t, OrderedDict())
+            if name in items:
+                raise ValueError(f"Item '{self._get_uri(t, name)}' already registered, use a different name")
+            items[name] = item
+            self._evict(t)
 
     def register_multiple(self, t: Type[T], items: Dict[str, T]) -> None:
         """
@@ -54,17 +144,21 @@ class ObjectRegistry:
 
     def get(self, t: Type[T], name: str) -> T:
         """
-        Retrieve an item by name.
+        Retrieve an item by name, from this registry or else from its parent.
 
         :param t: type prefix for the item
         :param name: the name of the item to retrieve
         :return: The registered item
         :raises KeyError: If the item is not found in the registry
         """
-        uri = self._get_uri(t, name)
-        if uri not in self._items:
-            raise KeyError(f"Item '{uri}' not found in registry")
-        return self._items[uri]
+        with self._lock:
+            items = self._items.get(t)
+            if items is not None and name in items:
+                items.move_to_end(name)
+                return items[name]
+        if self._parent is not None:
+            return self._parent.get(t, name)
+        raise KeyError(f"Item '{self._get_uri(t, name)}' not found in registry")
 
     def get_multiple(self, t: Type[T], names: List[str]) -> Dict[str, T]:
         """
@@ -79,23 +173,30 @@ class ObjectRegistry:
 
     def get_all(self, t: Type[T]) -> Dict[str, T]:
         """
-        Retrieve all items for a given prefix.
+        Retrieve all items for a given prefix, including the items of the parent registry.
 
         :param t: type prefix for the items
         :return: Dictionary mapping item names to items
         """
-        return {name: item for name, item in self._items.items() if name.startswith(str(t))}
+        items = self._parent.get_all(t) if self._parent is not None else {}
+        with self._lock:
+            items.update({self._get_uri(t, name): item for name, item in self._items.get(t, {}).items()})
+        return items
 
     def clear(self) -> None:
         """
-        Clear all registered items.
+        Clear all items registered in this registry; the parent registry is left unchanged.
         """
-        self._items.clear()
+        with self._lock:
+            self._items.clear()
 
     def list(self) -> List[str]:
         """
-        List all registered item names.
+        List all registered item names, including the items of the parent registry.
 
         :return: List of item names in the registry
         """
-        return list(self._items.keys())
+        names = self._parent.list() if self._parent is not None else []
+        with self._lock:
+            local = [self._get_uri(t, name) for t, items in self._items.items() for name in items]
+        return list(dict.fromkeys(names + local))
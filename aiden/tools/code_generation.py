@@ -6,12 +6,15 @@ from smolagents import Tool, tool
 from aiden.common.environment import Environment
 from aiden.common.provider import Provider
 from aiden.generators import TransformationCodeGenerator
+from aiden.registries.objects import ObjectRegistry
 
 logger = logging.getLogger(__name__)
 
 
 def get_generate_transformation_code(llm_to_use: str, environment: Environment) -> Tool:
     """Returns a tool function to generate transformation code with the model ID pre-filled."""
+    # Tools run in threads that do not inherit the context: keep the registry of the build creating the tool
+    registry = ObjectRegistry()
 
     @tool
     def generate_transformation_code(
@@ -32,13 +35,17 @@ def get_generate_transformation_code(llm_to_use: str, environment: Environment)
             Generated transformation code as a string
         """
         generator = TransformationCodeGenerator(Provider(llm_to_use), environment)
-        return generator.generate_transformation_code(task, solution_plan, input_datasets_names, output_dataset_name)
+        with registry.activate():
+            return generator.generate_transformation_code(
+                task, solution_plan, input_datasets_names, output_dataset_name
+            )
 
     return generate_transformation_code
 
 
 def get_fix_transformation_code(llm_to_use: str, environment: Environment) -> Tool:
     """Returns a tool function to fix transformation code with the model ID pre-filled."""
+    registry = ObjectRegistry()
 
     @tool
     def fix_transformation_code(
@@ -60,6 +67,7 @@ def get_fix_transformation_code(llm_to_use: str, environment: Environment) -> To
             Fixed transformation code as a string
         """
         generator = TransformationCodeGenerator(Provider(llm_to_use), environment)
-        return generator.fix_transformation_code(transformation_code, solution_plan, review, issue)
+        with registry.activate():
+            return generator.fix_transformation_code(transformation_code, solution_plan, review, issue)
 
     return fix_transformation_code
@@ -5,8 +5,12 @@ These tools automatically handle model artifact registration through the Artifac
 ensuring that artifacts generated during the execution can be retrieved later in the pipeline.
 """
 
+import concurrent.futures
 import logging
+import shutil
 import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Dict, List, Optional, Type
 
 from smolagents import Tool, tool
@@ -16,8 +20,15 @@ from aiden.registries.objects import ObjectRegistry
 from aiden.entities.code import Code
 from aiden.entities.node import Node
 from aiden.common.dataset import Dataset
+from aiden.executors.docker_executor import DockerExecutor
+from aiden.executors.executor import Executor
 from aiden.executors.local_executor import LocalExecutor
+from aiden.executors.streaming import build_streaming_script
 from aiden.callbacks import BuildStateInfo, Callback
+from aiden.common.provider import Provider
+from aiden.common.utils.output_validation import validate_output
+from aiden.common.utils.transformation_utils import check_output_dataset, replace_dataset_paths
+from aiden.generators import TransformationCodeGenerator
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +43,8 @@ def get_executor_tool(distributed: bool = False, environment: Optional[Environme
     Returns:
         A callable tool function for executing code
     """
+    # Tools run in threads that do not inherit the context: keep the registry of the build creating the tool
+    registry = ObjectRegistry()
 
     @tool
     def execute_code(
@@ -53,100 +66,371 @@ def get_executor_tool(distributed: bool = False, environment: Optional[Environme
             timeout: Maximum execution time in seconds
 
         Returns:
-            A dictionary containing execution results with model artifacts and their registry names
+            A dictionary containing execution results with model artifacts and their registry names, and the
+            'problems' found in the output file if it does not match the schema of the output dataset
         """
-        # Log the distributed flag
-        logger.debug(f"execute_training_code called with distributed={distributed}")
+        with registry.activate():
+            # Log the distributed flag
+            logger.debug(f"execute_training_code called with distributed={distributed}")
 
-        # Create default environment if none provided
-        env = environment or Environment(type="local")
+            # Create default environment if none provided
+            env = environment or Environment(type="local")
 
-        # Log the environment
-        logger.debug(f"execute_training_code called with environment={env}")
+            # Log the environment
+            logger.debug(f"execute_training_code called with environment={env}")
 
-        object_registry = ObjectRegistry()
+            object_registry = registry
 
-        execution_id = f"{node_id}-{uuid.uuid4()}"
-        try:
-            # Get actual datasets from registry
-            input_datasets = object_registry.get_multiple(Dataset, input_dataset_names)
-            output_dataset = object_registry.get(Dataset, output_dataset_name)
-            # Create a node to store execution results
-            node = Node(solution_plan="")  # We only need this for execute_node
-
-            # Get callbacks from the registry and notify them
-            node.training_code = code
-
-            # Create state info once for all callbacks
-            state_info = BuildStateInfo(
-                intent="Unknown",  # Will be filled by agent context
-                provider="Unknown",  # Will be filled by agent context
-                input_datasets=[v for _, v in input_datasets.items()],
-                output_dataset=output_dataset,
-                iteration=0,  # Default value, no longer used for MLFlow run naming
-                node=node,
-            )
+            execution_id = f"{node_id}-{uuid.uuid4()}"
+            try:
+                # Get actual datasets from registry
+                input_datasets = object_registry.get_multiple(Dataset, input_dataset_names)
+                output_dataset = object_registry.get(Dataset, output_dataset_name)
+                # Create a node to store execution results
+                node = Node(solution_plan="")  # We only need this for execute_node
+
+                # Get callbacks from the registry and notify them
+                node.training_code = code
+
+                # Create state info once for all callbacks
+                state_info = BuildStateInfo(
+                    intent="Unknown",  # Will be filled by agent context
+                    provider="Unknown",  # Will be filled by agent context
+                    input_datasets=[v for _, v in input_datasets.items()],
+                    output_dataset=output_dataset,
+                    iteration=0,  # Default value, no longer used for MLFlow run naming
+                    node=node,
+                )
+
+                # Notify all callbacks about execution start
+                _notify_callbacks(object_registry.get_all(Callback), "start", state_info)
+
+                # Import here to avoid circular imports
+                from aiden.config import config
+
+                # Get the appropriate executor class via the factory
+                executor_class = _get_executor_class(distributed=distributed, environment=env)
+
+                # Create an instance of the executor
+                logger.debug(f"Creating {executor_class.__name__} for execution ID: {execution_id}")
+                executor = executor_class(
+                    execution_id=execution_id,
+                    code=_executable_code(code, env, list(input_datasets.values()), output_dataset),
+                    working_dir=working_dir,
+                    timeout=timeout,
+                    code_execution_file_name=config.execution.runfile_name,
+                    environment=env,
+                    outputs=[output_dataset.path],
+                )
+
+                # Execute and collect results - LocalExecutor.run() handles cleanup internally
+                logger.debug(f"Executing node {node} using executor {executor}")
+                result = executor.run()
+                logger.debug(f"Execution result: {result}")
+                node.execution_time = result.exec_time
+                node.execution_stdout = result.term_out
+                node.exception_was_raised = result.exception is not None
+                node.exception = result.exception or None
+
+                node.training_code = code
+
+                # Notify callbacks about the execution end with the same state_info
+                # The node reference in state_info automatically reflects the updates to node
+                _notify_callbacks(object_registry.get_all(Callback), "end", state_info)
+
+                # Check if the execution failed in any way
+                if node.exception is not None:
+                    raise RuntimeError(f"Execution failed with exception: {node.exception}")
+
+                # Exiting cleanly does not mean that the output is right: check it against the output schema
+                if config.execution.validate_output and output_dataset.is_local:
+                    problems = validate_output(output_dataset.path, output_dataset)
+                    if problems:
+                        return {
+                            "success": False,
+                            "exception": "Output does not match the output dataset schema: "
+                            + "; ".join(str(problem) for problem in problems),
+                            "problems": [problem.to_dict() for problem in problems],
+                        }
+
+                # Register code and artifacts
+                object_registry.register(Code, execution_id, Code(node.training_code))
+
+                # Return results
+                response = {
+                    "success": not node.exception_was_raised,
+                    "exception": str(node.exception) if node.exception else None,
+                    "transformation_code_id": execution_id,
+                }
+                if result.step_results:
+                    response["steps"] = result.step_results
+                return response
+            except Exception as e:
+                # Log full stack trace at debug level
+                import traceback
+
+                logger.debug(f"Error executing training code: {str(e)}\n{traceback.format_exc()}")
+
+                return {
+                    "success": False,
+                    "exception": str(e),
+                }
+
+    return execute_code
+
+
+def get_candidates_executor_tool(
+    llm_to_use: str, environment: Environment, candidates: int, distributed: bool = False
+) -> Tool:
+    """Get a tool that generates several code candidates concurrently and executes them in parallel.
+
+    Args:
+        llm_to_use: The model to use for code generation
+        environment: The Environment object to use for execution
+        candidates: The number of candidates to generate
+        distributed: Whether to spread the candidates over a distributed execution backend
+
+    Returns:
+        A callable tool function for generating and executing code candidates
+    """
+    registry = ObjectRegistry()
+
+    @tool
+    def generate_and_execute_candidates(
+        task: str,
+        solution_plan: str,
+        input_datasets_names: List[str],
+        output_dataset_name: str,
+        working_dir: str,
+        timeout: int,
+    ) -> Dict:
+        """Generates several candidate implementations of the solution plan concurrently and executes them in
+        parallel. The first candidate that runs successfully and writes the expected output columns is kept, and the
+        other candidates are cancelled. Use this tool to generate and execute the transformation code; if no
+        candidate succeeds, fix the returned code and execute it with the other tools.
+
+        Args:
+            task: The task definition
+            solution_plan: The solution plan to implement
+            input_datasets_names: Names of datasets to use for transformation
+            output_dataset_name: Name of the dataset to store the transformation results
+            working_dir: Directory to use for execution
+            timeout: Maximum execution time in seconds of each candidate
 
-            # Notify all callbacks about execution start
-            _notify_callbacks(object_registry.get_all(Callback), "start", state_info)
+        Returns:
+            A dictionary with the 'success' flag, the 'transformation_code_id' and 'code' of the winning candidate
+            (or the code of the first candidate if none succeeded), the 'exception' if no candidate succeeded, and
+            a report of the outcome of each candidate
+        """
+        with registry.activate():
+            try:
+                generator = TransformationCodeGenerator(Provider(llm_to_use), environment)
+                codes = generator.generate_transformation_code_candidates(
+                    task, solution_plan, input_datasets_names, output_dataset_name, candidates
+                )
+                return run_candidates(
+                    codes, working_dir, input_datasets_names, output_dataset_name, timeout, environment, distributed
+                )
+            except Exception as e:
+                import traceback
+
+                logger.debug(f"Error generating or executing candidates: {str(e)}\n{traceback.format_exc()}")
+                return {"success": False, "exception": str(e)}
+
+    return generate_and_execute_candidates
+
+
+@dataclass
+class _Candidate:
+    """A code candidate together with the executor and node tracking its execution."""
+
+    index: int
+    code: str
+    execution_id: str
+    output_path: Path
+    executor: Executor
+    node: Node = field(default_factory=lambda: Node(solution_plan=""))
+    problems: List[str] = field(default_factory=list)
+    cancelled: bool = False
+
+    @property
+    def succeeded(self) -> bool:
+        return self.node.exception is None and not self.problems and not self.cancelled
+
+
+def run_candidates(
+    codes: List[str],
+    working_dir: str,
+    input_dataset_names: List[str],
+    output_dataset_name: str,
+    timeout: int,
+    environment: Optional[Environment] = None,
+    distributed: bool = False,
+) -> Dict:
+    """Execute several code candidates and keep the first one that succeeds and writes a valid output.
+
+    When the output dataset path appears as a literal in every candidate, the candidates run in parallel, each writing
+    to its own output file; the output of the winner is then copied to the output dataset path and the other
+    candidates are cancelled. Otherwise the candidates run one after the other, until one succeeds.
 
-            # Import here to avoid circular imports
-            from aiden.config import config
+    Args:
+        codes: The code of each candidate
+        working_dir: Directory to use for execution
+        input_dataset_names: List of dataset names to retrieve from the registry
+        output_dataset_name: Name of the dataset the candidates must create
+        timeout: Maximum execution time in seconds of each candidate
+        environment: The Environment object to use for execution. If None, a default local environment will be used.
+        distributed: Whether to spread the candidates over a distributed execution backend
 
-            # Get the appropriate executor class via the factory
-            executor_class = _get_executor_class(distributed=distributed, environment=env)
+    Returns:
+        A dictionary with the outcome of the winning candidate, if any, and a report for each candidate
+    """
+    from aiden.config import config
 
-            # Create an instance of the executor
-            logger.debug(f"Creating {executor_class.__name__} for execution ID: {execution_id}")
-            executor = executor_class(
+    env = environment or Environment(type="local")
+    object_registry = ObjectRegistry()
+    input_datasets = object_registry.get_multiple(Dataset, input_dataset_names)
+    output_dataset = object_registry.get(Dataset, output_dataset_name)
+    executor_class = _get_executor_class(distributed=distributed, environment=env)
+    batch_id = uuid.uuid4()
+
+    # Give each candidate its own output file, so that parallel candidates do not overwrite each other's output
+    execution_ids = [f"candidate-{index}-{batch_id}" for index in range(1, len(codes) + 1)]
+    output_paths = [
+        Path(working_dir).resolve() / execution_id / f"output{Path(output_dataset.path).suffix}"
+        for execution_id in execution_ids
+    ]
+    executable_codes = [_executable_code(code, env, list(input_datasets.values()), output_dataset) for code in codes]
+    isolated_codes = [
+        replace_dataset_paths(code, {output_dataset.path: str(output_path)})
+        for code, output_path in zip(executable_codes, output_paths)
+    ]
+    parallel = len(codes) > 1 and all(code is not None for code in isolated_codes)
+    if not parallel:
+        logger.debug("Output path not found in every candidate, executing candidates sequentially")
+        isolated_codes = executable_codes
+        output_paths = [Path(output_dataset.path)] * len(codes)
+
+    candidates = [
+        _Candidate(
+            index=index,
+            code=code,
+            execution_id=execution_id,
+            output_path=output_path,
+            executor=executor_class(
                 execution_id=execution_id,
-                code=code,
+                code=isolated_code,
                 working_dir=working_dir,
                 timeout=timeout,
                 code_execution_file_name=config.execution.runfile_name,
                 environment=env,
-            )
-
-            # Execute and collect results - LocalExecutor.run() handles cleanup internally
-            logger.debug(f"Executing node {node} using executor {executor}")
-            result = executor.run()
-            logger.debug(f"Execution result: {result}")
-            node.execution_time = result.exec_time
-            node.execution_stdout = result.term_out
-            node.exception_was_raised = result.exception is not None
-            node.exception = result.exception or None
-
-            node.training_code = code
-
-            # Notify callbacks about the execution end with the same state_info
-            # The node reference in state_info automatically reflects the updates to node
-            _notify_callbacks(object_registry.get_all(Callback), "end", state_info)
-
-            # Check if the execution failed in any way
-            if node.exception is not None:
-                raise RuntimeError(f"Execution failed with exception: {node.exception}")
-
-            # Register code and artifacts
-            object_registry.register(Code, execution_id, Code(node.training_code))
-
-            # Return results
-            return {
-                "success": not node.exception_was_raised,
-                "exception": str(node.exception) if node.exception else None,
-                "transformation_code_id": execution_id,
-            }
-        except Exception as e:
-            # Log full stack trace at debug level
-            import traceback
-
-            logger.debug(f"Error executing training code: {str(e)}\n{traceback.format_exc()}")
+                outputs=[str(output_path)],
+            ),
+        )
+        for index, (code, execution_id, output_path, isolated_code) in enumerate(
+            zip(codes, execution_ids, output_paths, isolated_codes), start=1
+        )
+    ]
+
+    def notify(candidate: _Candidate, event_type: str) -> None:
+        candidate.node.training_code = candidate.code
+        state_info = BuildStateInfo(
+            intent="Unknown",
+            provider="Unknown",
+            input_datasets=list(input_datasets.values()),
+            output_dataset=output_dataset,
+            iteration=0,
+            node=candidate.node,
+        )
+        _notify_callbacks(object_registry.get_all(Callback), event_type, state_info)
+
+    def execute(candidate: _Candidate) -> _Candidate:
+        result = candidate.executor.run()
+        candidate.node.execution_time = result.exec_time
+        candidate.node.execution_stdout = result.term_out
+        candidate.node.exception_was_raised = result.exception is not None
+        candidate.node.exception = result.exception
+        if result.exception is None and not candidate.cancelled:
+            candidate.problems = check_output_dataset(candidate.output_path, output_dataset)
+        return candidate
+
+    winner = None
+    if parallel:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+            for candidate in candidates:
+                notify(candidate, "start")
+            futures = [pool.submit(execute, candidate) for candidate in candidates]
+            for future in concurrent.futures.as_completed(futures):
+                if future.cancelled():
+                    continue
+                candidate = future.result()
+                notify(candidate, "end")
+                if winner is None and candidate.succeeded:
+                    winner = candidate
+                    # The first valid candidate wins: stop the others instead of waiting for them
+                    for other, other_future in zip(candidates, futures):
+                        if not other_future.done():
+                            other.cancelled = True
+                            other_future.cancel()
+                            other.executor.cancel()
+    else:
+        for candidate in candidates:
+            notify(candidate, "start")
+            execute(candidate)
+            notify(candidate, "end")
+            if candidate.succeeded:
+                winner = candidate
+                break
+
+    report = [
+        {
+            "candidate": candidate.index,
+            "success": candidate is winner,
+            "cancelled": candidate.cancelled,
+            "exec_time": candidate.node.execution_time,
+            "exception": str(candidate.node.exception) if candidate.node.exception else "; ".join(candidate.problems),
+        }
+        for candidate in candidates
+    ]
+
+    if winner is None:
+        return {
+            "success": False,
+            "exception": "No candidate succeeded, see the candidates report for the error of each candidate",
+            "code": codes[0],
+            "candidates": report,
+        }
+
+    if parallel:
+        Path(output_dataset.path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(winner.output_path, output_dataset.path)
+    object_registry.register(Code, winner.execution_id, Code(winner.code))
+    return {
+        "success": True,
+        "exception": None,
+        "transformation_code_id": winner.execution_id,
+        "code": winner.code,
+        "candidates": report,
+    }
+
+
+def _executable_code(
+    code: str, environment: Environment, input_datasets: List[Dataset], output_dataset: Dataset
+) -> str:
+    """Get the script to execute for generated code: in streaming mode, the code is wrapped with the streaming runtime.
 
-            return {
-                "success": False,
-                "exception": str(e),
-            }
+    Args:
+        code: The generated code
+        environment: The Environment the code is executed in
+        input_datasets: The input datasets, the first of which is streamed in streaming mode
+        output_dataset: The output dataset, written incrementally in streaming mode
 
-    return execute_code
+    Returns:
+        The code of the script to execute
+    """
+    if not environment.is_streaming:
+        return code
+    return build_streaming_script(code, input_datasets[0], output_dataset, environment.batch_size)
 
 
 def _get_executor_class(distributed: bool = False, environment: Environment | None = None) -> Type:
@@ -165,13 +449,18 @@ def _get_executor_class(distributed: bool = False, environment: Environment | No
     # Create default environment if none provided
     env = environment or Environment(type="local")
 
+    if env.metadata.get("isolation") == "docker":
+        logger.debug("Using DockerExecutor (isolation=docker)")
+        return DockerExecutor
+
     if env.type == "local":
         if distributed:
             try:
                 # Try to import Ray executor
+                from aiden.executors.ray_executor import RayExecutor
 
                 logger.debug("Using Ray for distributed execution")
-                return LocalExecutor
+                return RayExecutor
             except ImportError:
                 # Fall back to process executor if Ray is not available
                 logger.warning("Ray not available, falling back to LocalExecutor")
@@ -0,0 +1,465 @@
+"""
+Tools related to the optimisation of transformation code that already executes correctly.
+
+The code is benchmarked on synthetic input datasets, scaled up from the schemas of the real input datasets: it runs
+once under cProfile to warm up, then several times in the same process, and the median wall time of these runs, the
+peak memory and the cProfile report are given to the model to rewrite the code. An optimised
+candidate is only kept if its output on the real input datasets is identical to the output of the original code,
+and if it is faster on the synthetic datasets; the optimisation stops as soon as a candidate brings no speedup.
+"""
+
+import json
+import logging
+import shutil
+import statistics
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from smolagents import Tool, tool
+
+from aiden.common.dataset import _ARROW_FORMATS, Dataset
+from aiden.common.environment import Environment
+from aiden.common.provider import Provider
+from aiden.common.synthetic import Reference, generate_dataset, infer_references
+from aiden.common.utils.transformation_utils import count_rows, replace_dataset_paths
+from aiden.entities.code import Code
+from aiden.generators import TransformationCodeGenerator
+from aiden.registries.objects import ObjectRegistry
+from aiden.tools.execution import _executable_code, _get_executor_class
+
+logger = logging.getLogger(__name__)
+
+# Printed by the benchmark script between the output of the code and the profile report
+_PROFILE_MARKER = "=== aiden profile ==="
+# Printed by the benchmark script before the wall times of the timed runs of the code
+_TIMINGS_MARKER = "=== aiden timings ==="
+
+
+@dataclass
+class Benchmark:
+    """The measurements of a run of transformation code."""
+
+    success: bool
+    # The median wall time of the timed runs of the code, or the time of the whole execution if not timed
+    exec_time: float
+    peak_memory_mb: Optional[float] = None
+    # The cProfile report of the run, by cumulative time
+    profile: str = ""
+    # The number of rows of each input dataset, by dataset name
+    rows: Dict[str, Optional[int]] = field(default_factory=dict)
+    error: Optional[str] = None
+    # The wall time of each timed run
+    timings: List[float] = field(default_factory=list)
+
+    def to_dict(self, with_profile: bool = True) -> Dict[str, Any]:
+        summary = {
+            "rows": self.rows,
+            "exec_time": round(self.exec_time, 3),
+            "peak_memory_mb": round(self.peak_memory_mb, 1) if self.peak_memory_mb else None,
+        }
+        if with_profile:
+            summary["profile"] = self.profile
+        return summary
+
+
+def get_optimizer_tool(llm_to_use: str, environment: Environment, distributed: bool = False) -> Tool:
+    """Get a tool that optimises transformation code that executed successfully.
+
+    Args:
+        llm_to_use: The model to use for the optimisation of the code
+        environment: The Environment object to use for execution
+        distributed: Whether to execute the code on a distributed execution backend
+
+    Returns:
+        A callable tool function for optimising transformation code
+    """
+    # Tools run in threads that do not inherit the context: keep the registry of the build creating the tool
+    registry = ObjectRegistry()
+
+    @tool
+    def optimize_transformation_code(
+        transformation_code_id: str,
+        solution_plan: str,
+        input_datasets_names: List[str],
+        output_dataset_name: str,
+        working_dir: str,
+        timeout: int,
+    ) -> Dict:
+        """Optimises transformation code that executed successfully, so that it runs faster on large datasets. The
+        code is profiled on larger synthetic datasets and rewritten, for example to replace row-wise loops with
+        vectorised operations; a rewrite is only kept if it writes exactly the same output on the real datasets.
+        Use this tool once, after the code executed successfully.
+
+        Args:
+            transformation_code_id: The 'transformation_code_id' returned by the successful execution of the code
+            solution_plan: The solution plan implemented by the code
+            input_datasets_names: Names of datasets to use for transformation
+            output_dataset_name: Name of the dataset to store the transformation results
+            working_dir: Directory to use for execution
+            timeout: Maximum execution time in seconds of each run of the code
+
+        Returns:
+            A dictionary with the 'success' flag, the 'transformation_code_id' and 'code' of the fastest correct
+            code (the original code if no rewrite was faster), the 'speedup' over the original code, and a report
+            of each optimisation attempt
+        """
+        with registry.activate():
+            try:
+                generator = TransformationCodeGenerator(Provider(llm_to_use), environment)
+                return optimize_code(
+                    transformation_code_id,
+                    solution_plan,
+                    input_datasets_names,
+                    output_dataset_name,
+                    working_dir,
+                    timeout,
+                    generator,
+                    environment=environment,
+                    distributed=distributed,
+                )
+            except Exception as e:
+                import traceback
+
+                logger.debug(f"Error optimising transformation code: {str(e)}\n{traceback.format_exc()}")
+                return {"success": False, "exception": str(e), "transformation_code_id": transformation_code_id}
+
+    return optimize_transformation_code
+
+
+def optimize_code(
+    transformation_code_id: str,
+    plan: str,
+    input_dataset_names: List[str],
+    output_dataset_name: str,
+    working_dir: str,
+    timeout: int,
+    generator: TransformationCodeGenerator,
+    environment: Optional[Environment] = None,
+    distributed: bool = False,
+    rows: Optional[int] = None,
+    max_iterations: Optional[int] = None,
+    min_speedup: Optional[float] = None,
+    top_n: Optional[int] = None,
+    runs: Optional[int] = None,
+) -> Dict:
+    """Optimise registered transformation code, keeping only the rewrites that are faster and whose output is identical.
+
+    Args:
+        transformation_code_id: The registry name of the code to optimise, which must execute successfully
+        plan: The solution plan implemented by the code
+        input_dataset_names: List of dataset names to retrieve from the registry
+        output_dataset_name: Name of the dataset the code creates
+        working_dir: Directory to use for execution; the benchmark datasets are created and removed there
+        timeout: Maximum execution time in seconds of each run of the code
+        generator: The generator rewriting the code
+        environment: The Environment object to use for execution. If None, a default local environment will be used.
+        distributed: Whether to execute the code on a distributed execution backend
+        rows: Rows generated per input dataset for benchmarking, defaults to optimization.benchmark_rows
+        max_iterations: Maximum number of rewrites, defaults to optimization.max_iterations
+        min_speedup: Speedup a rewrite must bring to be kept, defaults to optimization.min_speedup
+        top_n: Functions of the profile report given to the model, defaults to optimization.profile_top_n
+        runs: Timed runs of each benchmark after its warm-up run, defaults to optimization.benchmark_runs
+
+    Returns:
+        A dictionary with the outcome of the optimisation and a report of each attempt
+    """
+    from aiden.config import config
+
+    env = environment or Environment(type="local")
+    rows = rows if rows is not None else config.optimization.benchmark_rows
+    max_iterations = max_iterations if max_iterations is not None else config.optimization.max_iterations
+    min_speedup = min_speedup if min_speedup is not None else config.optimization.min_speedup
+    top_n = top_n if top_n is not None else config.optimization.profile_top_n
+    runs = runs if runs is not None else config.optimization.benchmark_runs
+
+    object_registry = ObjectRegistry()
+    code = object_registry.get(Code, transformation_code_id).code
+    if env.is_dagster:
+        return {
+            "success": False,
+            "exception": "Optimisation is not supported for dagster environments, keep the transformation code",
+            "transformation_code_id": transformation_code_id,
+        }
+
+    input_datasets = list(object_registry.get_multiple(Dataset, input_dataset_names).values())
+    output_dataset = object_registry.get(Dataset, output_dataset_name)
+    root = Path(working_dir).resolve() / f"optimization-{uuid.uuid4()}"
+
+    def bind(source: str, inputs: List[Dataset], output: Dataset) -> Optional[str]:
+        script = _executable_code(source, env, input_datasets, output_dataset)
+        paths = {original.path: dataset.path for original, dataset in zip(input_datasets, inputs)}
+        paths[output_dataset.path] = output.path
+        return replace_dataset_paths(script, {old: new for old, new in paths.items() if old != new})
+
+    def measure(source: str) -> Benchmark:
+        script = bind(source, synthetic_inputs, benchmark_output)
+        if script is None:
+            return Benchmark(success=False, exec_time=0.0, error="the dataset paths are not string literals")
+        benchmark = benchmark_code(
+            script,
+            root,
+            timeout,
+            env,
+            distributed,
+            datasets=[*synthetic_inputs, benchmark_output],
+            outputs=[benchmark_output.path],
+            top_n=top_n,
+            runs=runs,
+        )
+        benchmark.rows = synthetic_rows
+        return benchmark
+
+    def check(source: str, index: int) -> Tuple[Optional[Dataset], Optional[str]]:
+        output = _scratch_dataset(output_dataset, root / f"check-{index}")
+        script = bind(source, input_datasets, output)
+        if script is None:
+            return None, "the dataset paths are not string literals"
+        result = benchmark_code(
+            script,
+            root,
+            timeout,
+            env,
+            distributed,
+            datasets=[*input_datasets, output],
+            outputs=[output.path],
+            top_n=0,
+            runs=0,
+        )
+        if not result.success:
+            return None, result.error
+        if not output.exists():
+            return None, f"the output file {output.path} was not created"
+        return output, None
+
+    try:
+        synthetic_inputs = _synthetic_inputs(input_datasets, root / "synthetic", rows)
+        synthetic_rows = {
+            dataset.name: count_rows(synthetic) for dataset, synthetic in zip(input_datasets, synthetic_inputs)
+        }
+        benchmark_output = _scratch_dataset(output_dataset, root / "benchmark")
+
+        baseline = measure(code)
+        if not baseline.success:
+            return {
+                "success": False,
+                "exception": f"The code could not be benchmarked on synthetic data: {baseline.error}",
+                "transformation_code_id": transformation_code_id,
+            }
+        reference, error = check(code, 0)
+        if reference is None:
+            return {
+                "success": False,
+                "exception": f"The code could not be executed on the real data: {error}",
+                "transformation_code_id": transformation_code_id,
+            }
+
+        best_code, best = code, baseline
+        attempts = []
+        rejected = []
+        for iteration in range(1, max_iterations + 1):
+            try:
+                candidate = generator.optimize_transformation_code(
+                    best_code, plan, best.to_dict(), "\n".join(rejected) or None
+                )
+            except Exception as e:
+                attempts.append({"attempt": iteration, "accepted": False, "reason": f"generation failed: {e}"})
+                break
+
+            output, error = check(candidate, iteration)
+            benchmark = None
+            if output is None:
+                reason = f"the code failed on the real data: {error}"
+            elif not _same_output(reference, output):
+                reason = "the output differs from the output of the original code on the real data"
+            else:
+                benchmark = measure(candidate)
+                reason = None if benchmark.success else f"the code failed on the synthetic data: {benchmark.error}"
+
+            if reason is not None:
+                attempts.append({"attempt": iteration, "accepted": False, "reason": reason})
+                rejected.append(f"Attempt {iteration} was rejected: {reason}")
+                continue
+            if benchmark.exec_time * min_speedup > best.exec_time:
+                # Another rewrite of code that the model cannot speed up further is unlikely to help
+                attempts.append(
+                    {
+                        "attempt": iteration,
+                        "accepted": False,
+                        "reason": "no further speedup",
+                        **benchmark.to_dict(False),
+                    }
+                )
+                break
+            attempts.append({"attempt": iteration, "accepted": True, **benchmark.to_dict(False)})
+            best_code, best = candidate, benchmark
+
+        if best_code is not code:
+            transformation_code_id = f"optimized-{uuid.uuid4()}"
+            object_registry.register(Code, transformation_code_id, Code(best_code))
+        logger.info(f"Optimisation of the transformation code: {baseline.exec_time:.2f}s -> {best.exec_time:.2f}s")
+        return {
+            "success": True,
+            "exception": None,
+            "transformation_code_id": transformation_code_id,
+            "code": best_code,
+            "optimized": best_code is not code,
+            "speedup": round(baseline.exec_time / best.exec_time, 2) if best.exec_time else None,
+            "baseline": baseline.to_dict(False),
+            "best": best.to_dict(False),
+            "attempts": attempts,
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def benchmark_code(
+    code: str,
+    working_dir: Path | str,
+    timeout: int,
+    environment: Optional[Environment] = None,
+    distributed: bool = False,
+    datasets: Optional[List[Dataset]] = None,
+    outputs: Optional[List[str]] = None,
+    top_n: Optional[int] = None,
+    runs: Optional[int] = None,
+) -> Benchmark:
+    """Execute a script once under cProfile, then time several runs of it in the same process, and measure its peak
+    memory. Timing the runs in the process leaves out the start of the interpreter and of the executor, and the
+    profiled run warms up the imports and file caches, so that the median of the timed runs is stable.
+
+    Args:
+        code: The executable script, whose dataset paths point to the datasets to run on
+        working_dir: Directory to use for execution
+        timeout: Maximum execution time in seconds
+        environment: The Environment object to use for execution. If None, a default local environment will be used.
+        distributed: Whether to execute the script on a distributed execution backend
+        datasets: The datasets read and written by the script, for the executors that need to mount them
+        outputs: The paths written by the script, for the executors that need to ship them back
+        top_n: Functions of the profile report to keep, defaults to optimization.profile_top_n; 0 skips profiling
+        runs: Timed runs after the profiled one, defaults to optimization.benchmark_runs; with no profiling and no
+            timed runs, the script runs once and the whole execution is timed
+
+    Returns:
+        The measurements of the run; the peak memory is only known for the executors reporting it
+    """
+    from aiden.config import config
+
+    env = environment or Environment(type="local")
+    top_n = top_n if top_n is not None else config.optimization.profile_top_n
+    runs = runs if runs is not None else config.optimization.benchmark_runs
+    executor_class = _get_executor_class(distributed=distributed, environment=env)
+    executor = executor_class(
+        execution_id=f"benchmark-{uuid.uuid4()}",
+        code=_benchmark_script(code, top_n, runs) if top_n or runs else code,
+        working_dir=working_dir,
+        timeout=timeout,
+        code_execution_file_name=config.execution.runfile_name,
+        environment=env,
+        datasets=datasets,
+        outputs=outputs,
+    )
+    result = executor.run()
+
+    output = "".join(str(out) for out in result.term_out or [])
+    profile = output.split(_PROFILE_MARKER, 1)[1].strip() if _PROFILE_MARKER in output else ""
+    timings = []
+    if _TIMINGS_MARKER in output:
+        timings = json.loads(output.split(_TIMINGS_MARKER, 1)[1].strip().splitlines()[0])
+    max_rss_kb = getattr(executor, "max_rss_kb", None)
+    return Benchmark(
+        success=result.exception is None,
+        exec_time=statistics.median(timings) if timings else result.exec_time,
+        peak_memory_mb=max_rss_kb / 1024 if max_rss_kb else None,
+        profile=profile,
+        error=str(result.exception) if result.exception else None,
+        timings=timings,
+    )
+
+
+def _benchmark_script(code: str, top_n: int, runs: int) -> str:
+    """
+    Wrap a script so that it runs once under cProfile, then the given number of times with each run timed, and
+    prints the wall times of the timed runs and the top of the profile report after its output.
+    """
+    return (
+        "import cProfile as _aiden_cprofile\n"
+        "import io as _aiden_io\n"
+        "import json as _aiden_json\n"
+        "import pstats as _aiden_pstats\n"
+        "import time as _aiden_time\n\n"
+        f"_aiden_code = compile({code!r}, 'transformation.py', 'exec')\n"
+        "_aiden_profiler = _aiden_cprofile.Profile()\n"
+        f"if {top_n}:\n"
+        "    _aiden_profiler.enable()\n"
+        "try:\n"
+        "    exec(_aiden_code, {'__name__': '__main__'})\n"
+        "finally:\n"
+        "    _aiden_profiler.disable()\n"
+        "_aiden_timings = []\n"
+        f"for _ in range({runs}):\n"
+        "    _aiden_start = _aiden_time.perf_counter()\n"
+        "    exec(_aiden_code, {'__name__': '__main__'})\n"
+        "    _aiden_timings.append(_aiden_time.perf_counter() - _aiden_start)\n"
+        f"print({_TIMINGS_MARKER!r})\n"
+        "print(_aiden_json.dumps(_aiden_timings))\n"
+        f"if {top_n}:\n"
+        "    _aiden_report = _aiden_io.StringIO()\n"
+        "    _aiden_stats = _aiden_pstats.Stats(_aiden_profiler, stream=_aiden_report)\n"
+        f"    _aiden_stats.sort_stats('cumulative').print_stats({top_n})\n"
+        f"    print({_PROFILE_MARKER!r})\n"
+        "    print(_aiden_report.getvalue())\n"
+    )
+
+
+def _synthetic_inputs(datasets: List[Dataset], directory: Path, rows: int) -> List[Dataset]:
+    """
+    Generate synthetic copies of the input datasets, whose foreign keys only hold the keys of the synthetic datasets
+    they reference, so that joins are benchmarked on matching keys. The keys are inferred from the real datasets.
+    Datasets without a schema are benchmarked on their own file.
+    """
+    references = infer_references(datasets)
+    synthetic = {
+        dataset.name: _scratch_dataset(dataset, directory) for dataset in datasets if dataset.schema is not None
+    }
+    # The referenced datasets are generated first; references that would form a cycle are dropped
+    pending = [dataset.name for dataset in datasets if dataset.name in synthetic]
+    while pending:
+        ready = [
+            name
+            for name in pending
+            if all(ref.dataset.name not in pending for ref in references.get(name, {}).values())
+        ]
+        name = ready[0] if ready else pending[0]
+        pending.remove(name)
+        generated = {
+            column: Reference(synthetic.get(ref.dataset.name, ref.dataset), ref.column)
+            for column, ref in references.get(name, {}).items()
+            if ref.dataset.name not in pending
+        }
+        generate_dataset(synthetic[name], rows, references=generated, seed=0)
+    return [synthetic.get(dataset.name, dataset) for dataset in datasets]
+
+
+def _scratch_dataset(dataset: Dataset, directory: Path) -> Dataset:
+    """Get a dataset with the name, format and schema of another dataset, stored in a scratch directory."""
+    directory.mkdir(parents=True, exist_ok=True)
+    return Dataset(
+        path=str(directory / Path(dataset.path).name),
+        format=dataset.format,
+        _name=dataset.name,
+        schema=dataset.schema,
+    )
+
+
+def _same_output(expected: Dataset, actual: Dataset) -> bool:
+    """Check that two output files hold the same rows in the same order, with the same columns and types."""
+    if Path(expected.path).read_bytes() == Path(actual.path).read_bytes():
+        return True
+    if expected.format.lower() not in _ARROW_FORMATS:
+        return False
+    try:
+        return expected.to_arrow_dataset().to_table().equals(actual.to_arrow_dataset().to_table())
+    except Exception:
+        return False
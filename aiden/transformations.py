@@ -1,3 +1,7 @@
+import dataclasses
+import hashlib
+import importlib.metadata
+import json
 import logging
 import os
 import uuid
@@ -6,17 +10,23 @@ from pathlib import Path
 from typing import Dict, List, Optional, Union
 
 
-from aiden.agents import AidenAgent
 from aiden.common.dataset import Dataset
+from aiden.common.cache import get_build_cache
+from aiden.common.checkpoint import BuildCheckpoint
 from aiden.common.environment import Environment, get_environment
+from aiden.common.profiler import describe_datasets, fingerprint
 from aiden.common.provider import ProviderConfig
+from aiden.common.usage import LEDGER_NAME, UsageLedger, UsageRecord
 from aiden.registries.objects import ObjectRegistry
 from aiden.common.utils.transformation_state import TransformationState
-from aiden.common.utils.transformation_utils import format_code_snippet
-from aiden.config import prompt_templates
-from aiden.entities.description import CodeInfo, SchemaInfo, TransformationDescription
+from aiden.common.utils.transformation_utils import count_rows, format_code_snippet, replace_dataset_paths
+from aiden.config import config, ensure_logging_configured, prompt_templates
+from aiden.entities.code import Code
+from aiden.entities.description import CodeInfo, SchemaInfo, TransformationDescription, UsageInfo
+from aiden.entities.run_result import RunResult
+from aiden.executors.streaming import build_streaming_script
 from aiden.callbacks import Callback, ChainOfThoughtModelCallback, BuildStateInfo
-from aiden.common.utils.cot import ConsoleEmitter
+from aiden.common.utils.cot import ConsoleEmitter, HeuristicStepSummarizer, LLMStepSummarizer, StepSummarizer
 
 
 # Define placeholders for classes that will be implemented later
@@ -36,6 +46,8 @@ class Transformation:
         intent (str): A human-readable, natural language description of the model's expected intent.
         output_schema (dict): A mapping of output key names to their types.
         input_schema (dict): A mapping of input key names to their types.
+        engine (str): The compute engine targeted by the generated code: 'pandas' (the default), 'pyarrow',
+            'polars' or 'duckdb'. Overrides the 'engine' metadata of the environment.
 
     Example:
         model = Transformation(
@@ -53,7 +65,9 @@ class Transformation:
         self,
         intent: str,
         environment: Optional[Union[dict, "Environment"]] = None,
+        engine: Optional[str] = None,
     ):
+        ensure_logging_configured()
         self.intent: str = intent
         self.input_datasets: List["Dataset"]
         self.output_dataset: "Dataset"
@@ -65,6 +79,11 @@ class Transformation:
             self.environment = environment
         else:
             self.environment = get_environment(**environment)
+        if engine is not None:
+            # The engine is an environment setting, so that it reaches the agents, executors and build checkpoint
+            self.environment = dataclasses.replace(
+                self.environment, metadata={**self.environment.metadata, "engine": engine}
+            )
 
         # The Transformation's mutable state is defined by these fields
         self.state: TransformationState = TransformationState.DRAFT
@@ -79,6 +98,9 @@ class Transformation:
         # Initialize metadata dictionary
         self.metadata: Dict[str, str] = {}
 
+        # Usage of the LLM calls of the last build, by agent role
+        self.usage: Optional[UsageLedger] = None
+
         # Set working directory based on environment
         if (self.environment.is_local or self.environment.is_dagster) and self.environment.workdir:
             self.working_dir = str(Path(self.environment.workdir) / self.run_id)
@@ -86,8 +108,12 @@ class Transformation:
         else:
             raise ValueError("A valid working directory is required in the environment configuration")
 
-        # Registries used to make datasets, artifacts and other objects available across the system
-        self.object_registry = ObjectRegistry()
+        # Registries used to make datasets, artifacts and other objects available across the system; objects
+        # registered in the root registry are shared, read-only, by every transformation
+        self.object_registry = _build_registry()
+
+        # Sources bound to the datasets of previous runs, keyed by the dataset paths they were bound to
+        self._bound_sources: Dict[tuple, str] = {}
 
     def build(
         self,
@@ -96,19 +122,180 @@ class Transformation:
         provider: str | ProviderConfig = "openai/gpt-4o",
         verbose: bool = False,
         callbacks: List[Callback] = None,
-        chain_of_thought: bool = True,
+        chain_of_thought: bool | str | StepSummarizer = True,
+        candidates: int = 1,
+        distributed: bool = False,
+        optimize: bool = False,
+        use_cache: bool = True,
+    ) -> None:
+        """
+        Build the transformation using the multi-agent system.
+
+        :param input_datasets: the datasets to transform
+        :param output_dataset: the dataset to produce
+        :param provider: the provider to use for all agents, or a ProviderConfig with one provider per role
+        :param verbose: whether to display detailed agent logs
+        :param callbacks: callbacks to notify during the build
+        :param chain_of_thought: whether to display the agents' chain of thought, and how to summarise each step:
+            True or "llm" for LLM summaries using the tool provider, "heuristic" for rule-based summaries without
+            any LLM call, or a custom StepSummarizer; False disables the chain of thought
+        :param candidates: number of code candidates generated concurrently and executed in parallel; the first
+            one that succeeds and writes the expected output wins. Trades tokens for a lower wall-clock time
+        :param distributed: whether to execute the generated code on a Ray cluster (local or configured with
+            execution.ray_address) rather than on this machine only; requires Ray to be installed
+        :param optimize: whether to optimise the code once it executes correctly: the code is profiled on synthetic
+            datasets of optimization.benchmark_rows rows and rewritten until it gets no faster, keeping only the
+            rewrites whose output on the input datasets is identical. Trades tokens and build time for faster runs
+        :param use_cache: whether to reuse the source of a previous build with the same intent, providers,
+            environment and dataset schemas, instead of running the agents, and to store the source of this build
+        """
+        if candidates < 1:
+            raise ValueError(f"candidates must be at least 1, got {candidates}")
+
+        # Convert string provider to config if needed
+        if isinstance(provider, str):
+            provider_config = ProviderConfig(default_provider=provider)
+        else:
+            provider_config = provider
+
+        build_cache_key = None
+        if use_cache and config.cache.build_cache_enabled:
+            build_cache_key = _build_cache_key(
+                self.intent, provider_config, self.environment, input_datasets, output_dataset, optimize
+            )
+            if self._load_cached_build(build_cache_key, input_datasets, output_dataset):
+                return
+
+        # Record the build arguments, so that the build can be resumed if it is interrupted
+        checkpoint = BuildCheckpoint(self.working_dir)
+        checkpoint.start(
+            {
+                "intent": self.intent,
+                "input_datasets": [_dataset_to_dict(dataset) for dataset in input_datasets],
+                "output_dataset": _dataset_to_dict(output_dataset),
+                "providers": vars(provider_config),
+                "chain_of_thought": chain_of_thought if isinstance(chain_of_thought, (bool, str)) else True,
+                "candidates": candidates,
+                "distributed": distributed,
+                "optimize": optimize,
+                "use_cache": use_cache,
+            }
+        )
+
+        # Each build has its own registry scope, so that concurrent builds in the process do not interfere
+        self.object_registry = _build_registry()
+        with self.object_registry.activate():
+            self._build(
+                input_datasets,
+                output_dataset,
+                provider_config,
+                verbose,
+                callbacks,
+                chain_of_thought,
+                candidates,
+                distributed,
+                optimize,
+                build_cache_key,
+                checkpoint,
+            )
+
+    def resume(
+        self,
+        working_dir: Optional[str] = None,
+        verbose: bool = False,
+        callbacks: List[Callback] = None,
     ) -> None:
+        """
+        Resume a build that was interrupted, e.g. by a crash, a provider outage or a timeout.
 
-        # Ensure the object registry is cleared before building
-        self.object_registry.clear()
+        The agents run again with the arguments of the interrupted build, but the model and tool calls that
+        already succeeded are replayed from the build checkpoint instead of being made again, so the build
+        continues from its last completed step.
 
+        :param working_dir: the working directory of the interrupted build, defaults to the one of this
+            transformation; use it to resume a build started by another process
+        :param verbose: whether to display detailed agent logs
+        :param callbacks: callbacks to notify during the build
+        """
+        working_dir = str(working_dir or self.working_dir)
+        if not BuildCheckpoint.exists(working_dir):
+            raise ValueError(f"No build checkpoint found in {working_dir}")
+
+        checkpoint = BuildCheckpoint(working_dir)
+        build = checkpoint.load()
+        if build["intent"] != self.intent:
+            raise ValueError("The checkpointed build has a different intent than this transformation")
+
+        # Continue in the working directory of the interrupted build, which the agents' prompts refer to
+        self.working_dir = working_dir
+        self.run_id = Path(working_dir).name
+        input_datasets = [_dataset_from_dict(dataset) for dataset in build["input_datasets"]]
+        output_dataset = _dataset_from_dict(build["output_dataset"])
+        provider_config = ProviderConfig(**build["providers"])
+        # Checkpoints of older versions do not record the optimisation option
+        optimize = build.get("optimize", False)
+
+        build_cache_key = None
+        if build["use_cache"] and config.cache.build_cache_enabled:
+            build_cache_key = _build_cache_key(
+                self.intent, provider_config, self.environment, input_datasets, output_dataset, optimize
+            )
+
+        # Each build has its own registry scope, so that concurrent builds in the process do not interfere
+        self.object_registry = _build_registry()
+        with self.object_registry.activate():
+            self._build(
+                input_datasets,
+                output_dataset,
+                provider_config,
+                verbose,
+                callbacks,
+                build["chain_of_thought"],
+                build["candidates"],
+                build["distributed"],
+                optimize,
+                build_cache_key,
+                checkpoint,
+            )
+        self.metadata["checkpoint_replayed_calls"] = str(checkpoint.replayed_calls)
+
+    def _build(
+        self,
+        input_datasets: List["Dataset"],
+        output_dataset: "Dataset",
+        provider_config: ProviderConfig,
+        verbose: bool,
+        callbacks: Optional[List[Callback]],
+        chain_of_thought: bool | str | StepSummarizer,
+        candidates: int,
+        distributed: bool,
+        optimize: bool,
+        build_cache_key: Optional[str],
+        checkpoint: BuildCheckpoint,
+    ) -> None:
+        """
+        Run the agents to build the transformation, journaling their progress in the build checkpoint.
+
+        The registry of the build must be active in the current context.
+        """
         # Initialize callbacks list if not provided
         callbacks = callbacks or []
 
+        # Record the LLM calls of the build in its ledger, created first so that the summarizer records in it too
+        self.usage = UsageLedger()
+        self.object_registry.register(UsageLedger, LEDGER_NAME, self.usage)
+        self.usage.add_listener(self._on_llm_call)
+
         # Add chain of thought callback if requested
         cot_callable = None
         if chain_of_thought:
-            cot_model_callback = ChainOfThoughtModelCallback(emitter=ConsoleEmitter())
+            summarizer = _get_step_summarizer(chain_of_thought, provider_config)
+            cot_model_callback = ChainOfThoughtModelCallback(
+                emitter=ConsoleEmitter(),
+                summarizer=summarizer,
+                # Summaries without LLM calls are cheap enough to emit inline, once per step
+                background=not isinstance(summarizer, HeuristicStepSummarizer),
+            )
             callbacks.append(cot_model_callback)
 
             # Get the underlying callback for use with agents
@@ -118,12 +305,6 @@ class Transformation:
         self.object_registry.register_multiple(Callback, {f"{i}": c for i, c in enumerate(callbacks)})
 
         try:
-            # Convert string provider to config if needed
-            if isinstance(provider, str):
-                provider_config = ProviderConfig(default_provider=provider)
-            else:
-                provider_config = provider
-
             # We use the tool_provider for schema resolution and tool operations
             # TODO: provider_obj = Provider(model=provider_config.tool_provider)
             self.state = TransformationState.BUILDING
@@ -169,8 +350,12 @@ class Transformation:
                 input_datasets=[f"`{dataset}`" for dataset in input_datasets],
                 output_dataset=f"`{output_dataset}`",
                 working_dir=self.working_dir,
+                dataset_profiles=describe_datasets(input_datasets),
             )
 
+            # The agents import smolagents and the LLM clients, which are slow to import
+            from aiden.agents import AidenAgent
+
             agent = AidenAgent(
                 manager_model_id=provider_config.manager_provider,
                 data_expert_model_id=provider_config.data_expert_provider,
@@ -180,6 +365,11 @@ class Transformation:
                 max_steps=30,
                 verbose=verbose,
                 chain_of_thought_callable=cot_callable,
+                candidates=candidates,
+                distributed=distributed,
+                optimize=optimize,
+                checkpoint=checkpoint,
+                ledger=self.usage,
             )
             generated = agent.run(
                 agent_prompt,
@@ -231,11 +421,19 @@ class Transformation:
             self.metadata["ops_provider"] = str(provider_config.tool_provider)
             self.metadata["tool_provider"] = str(provider_config.tool_provider)
             self.metadata["env_type"] = self.environment.type
+            self.metadata["engine"] = self.environment.engine
+            self._store_usage_metadata()
 
             self.state = TransformationState.READY
+            checkpoint.finish()
+
+            if build_cache_key is not None:
+                self.metadata["build_cache"] = "miss"
+                self._store_cached_build(build_cache_key)
 
         except Exception as e:
             self.state = TransformationState.ERROR
+            self._store_usage_metadata()
             # Log full stack trace at debug level
             import traceback
 
@@ -244,6 +442,170 @@ class Transformation:
             # Log a shorter message at error level
             logger.error(f"Error during model building: {str(e)[:50]}")
             raise e
+        finally:
+            from aiden.executors.docker_executor import release_container_pools
+
+            # Stop the summary worker of the chain of thought, also when the build fails before its end
+            if cot_callable is not None:
+                cot_callable.close()
+            # Remove the containers started for the build, as their mounts are specific to it
+            release_container_pools(self.object_registry)
+
+    def _on_llm_call(self, record: UsageRecord) -> None:
+        """Stream the usage of an LLM call of the build to the callbacks."""
+        for callback in self.object_registry.get_all(Callback).values():
+            try:
+                callback.on_llm_call(record)
+            except Exception as e:
+                logger.warning(f"Error in callback {callback.__class__.__name__}.on_llm_call: {str(e)[:50]}")
+
+    def _store_usage_metadata(self) -> None:
+        """Store the usage totals of the build in the metadata, with the totals of each agent role as JSON."""
+        totals = self.usage.totals()
+        for key in ("calls", "prompt_tokens", "completion_tokens", "cost_usd", "latency_seconds", "retries"):
+            self.metadata[f"llm_{key}"] = str(totals[key])
+        self.metadata["llm_usage_by_role"] = json.dumps(self.usage.totals_by_role())
+
+    def run(
+        self,
+        input_datasets: List["Dataset"],
+        output_dataset: "Dataset",
+        timeout: int = 3600,
+        distributed: bool = False,
+    ) -> RunResult:
+        """
+        Run the built transformation on new datasets, without the agents.
+
+        The datasets must have the same formats and schemas as the datasets used to build the transformation: the
+        dataset paths of the generated code are rebound to the paths of the new datasets. Input datasets are
+        matched to the build datasets by name, or else by position. The bound source is compiled once and cached,
+        and executed by the executor of the environment, e.g. on the warm worker pool for local environments.
+
+        :param input_datasets: the datasets to transform
+        :param output_dataset: the dataset to produce
+        :param timeout: maximum execution time in seconds
+        :param distributed: whether to run on the distributed execution backend, if available
+        :return: the outcome of the run, with its timing, rows in and out and peak memory
+        """
+        from aiden.executors.docker_executor import release_container_pools
+        from aiden.tools.execution import _get_executor_class
+
+        if self.state != TransformationState.READY or not self.transformer_source:
+            raise RuntimeError("The transformation must be built before it can be run")
+
+        source = self._bind_source(input_datasets, output_dataset)
+        rows_in = {dataset.name: count_rows(dataset) for dataset in input_datasets}
+
+        executor_class = _get_executor_class(distributed=distributed, environment=self.environment)
+        # The containers started for the run, if any, are owned by the registry of the transformation
+        with self.object_registry.activate():
+            try:
+                executor = executor_class(
+                    execution_id=f"run-{uuid.uuid4()}",
+                    code=source,
+                    working_dir=Path(self.working_dir) / "runs",
+                    timeout=timeout,
+                    environment=self.environment,
+                    datasets=[*input_datasets, output_dataset],
+                    outputs=[output_dataset.path],
+                )
+                result = executor.run()
+            finally:
+                release_container_pools(self.object_registry)
+
+        max_rss_kb = getattr(executor, "max_rss_kb", None)
+        return RunResult(
+            success=result.exception is None,
+            exec_time=result.exec_time,
+            rows_in=rows_in,
+            rows_out=count_rows(output_dataset) if result.exception is None else None,
+            peak_memory_mb=max_rss_kb / 1024 if max_rss_kb else None,
+            output=result.term_out,
+            error=str(result.exception) if result.exception else None,
+            step_results=result.step_results,
+        )
+
+    def _bind_source(self, input_datasets: List["Dataset"], output_dataset: "Dataset") -> str:
+        """
+        Return the transformation source with its dataset paths pointing to the given datasets.
+
+        :param input_datasets: the datasets to transform
+        :param output_dataset: the dataset to produce
+        :return: the bound source, compiled once to check it before its first run
+        """
+        if len(input_datasets) != len(self.input_datasets):
+            raise ValueError(f"Expected {len(self.input_datasets)} input datasets, got {len(input_datasets)}")
+
+        by_name = {dataset.name: dataset for dataset in input_datasets}
+        if set(by_name) == {dataset.name for dataset in self.input_datasets}:
+            pairs = [(built, by_name[built.name]) for built in self.input_datasets]
+        else:
+            pairs = list(zip(self.input_datasets, input_datasets))
+        pairs.append((self.output_dataset, output_dataset))
+
+        key = tuple((built.path, new.path) for built, new in pairs)
+        if key not in self._bound_sources:
+            streaming = self.environment.is_streaming
+            if streaming:
+                # The streamed input and the output are not in the source, they are given to the streaming runtime
+                streamed_dataset = pairs[0][1]
+                pairs = pairs[1:-1]
+
+            source = _rebind_source(self.transformer_source, [(built.path, new.path) for built, new in pairs])
+            if streaming:
+                source = build_streaming_script(source, streamed_dataset, output_dataset, self.environment.batch_size)
+            compile(source, "<transformation>", "exec")
+            self._bound_sources[key] = source
+        return self._bound_sources[key]
+
+    def _load_cached_build(self, key: str, input_datasets: List["Dataset"], output_dataset: "Dataset") -> bool:
+        """
+        Restore the result of a previous build from the build cache, if any.
+
+        :param key: the build cache key
+        :param input_datasets: the datasets to transform
+        :param output_dataset: the dataset to produce
+        :return: whether a cached build was restored
+        """
+        cached = get_build_cache().get(key)
+        if cached is None:
+            return False
+
+        entry = json.loads(cached)
+        datasets = [*input_datasets, output_dataset]
+        if self.environment.is_streaming:
+            # The streamed input and the output are not in the source, they are given to the streaming runtime
+            datasets = datasets[1:-1]
+        try:
+            source = _rebind_source(
+                entry["source"], [(entry["paths"][dataset.name], dataset.path) for dataset in datasets]
+            )
+        except (KeyError, ValueError) as e:
+            logger.debug(f"Cached build {key} cannot be reused: {e}")
+            return False
+
+        logger.info("Reusing the transformation of a previous build with the same intent and datasets")
+        self.input_datasets = input_datasets
+        self.output_dataset = output_dataset
+        self.transformer_source = source
+        self.metadata.update(entry["metadata"])
+        self.metadata["build_cache"] = "hit"
+        self.metadata["build_cache_key"] = key
+        self.state = TransformationState.READY
+        return True
+
+    def _store_cached_build(self, key: str) -> None:
+        """
+        Store the result of this build in the build cache.
+
+        :param key: the build cache key
+        """
+        entry = {
+            "source": self.transformer_source,
+            "paths": {dataset.name: dataset.path for dataset in [*self.input_datasets, self.output_dataset]},
+            "metadata": {k: v for k, v in self.metadata.items() if not k.startswith("build_cache")},
+        }
+        get_build_cache().set(key, json.dumps(entry, default=str), model=self.metadata.get("provider"))
 
     def save(self, path: str) -> None:
         """
@@ -290,6 +652,11 @@ class Transformation:
             transformation=format_code_snippet(self.transformer_source),
         )
 
+        # Usage of the LLM calls of the build, if it was built in this session
+        usage = None
+        if self.usage is not None:
+            usage = UsageInfo(totals=self.usage.totals(), by_role=self.usage.totals_by_role())
+
         # Assemble and return the complete model description
         return TransformationDescription(
             id=self.identifier,
@@ -297,4 +664,116 @@ class Transformation:
             intent=self.intent,
             schemas=schemas,
             code=code,
+            usage=usage,
         )
+
+
+def _build_registry() -> ObjectRegistry:
+    """Create the registry scope of a build, reading through to the root registry."""
+    return ObjectRegistry.create(parent=ObjectRegistry.root(), retention={Code: config.registry.max_code_items})
+
+
+def _build_cache_key(
+    intent: str,
+    provider_config: ProviderConfig,
+    environment: Environment,
+    input_datasets: List["Dataset"],
+    output_dataset: "Dataset",
+    optimize: bool = False,
+) -> str:
+    """
+    Compute the build cache key of a build from everything that determines the generated transformation.
+
+    :param intent: the intent of the transformation
+    :param provider_config: the providers of the agents
+    :param environment: the environment the transformation is generated for
+    :param input_datasets: the datasets to transform
+    :param output_dataset: the dataset to produce
+    :param optimize: whether the build optimises the generated code
+    :return: a hex digest identifying the build
+    """
+
+    def describe(dataset: "Dataset", with_data: bool) -> dict:
+        description = {"name": dataset.name, "format": dataset.format, "schema": Dataset.format_schema(dataset.schema)}
+        if with_data and dataset.exists():
+            description["data"] = fingerprint(dataset)
+        return description
+
+    with_data = config.cache.build_cache_data_fingerprint
+    metadata = {k: v for k, v in environment.metadata.items() if k not in ("image", "binary", "pool_size")}
+    build = {
+        "intent": intent,
+        "providers": vars(provider_config),
+        "environment": {"type": environment.type, "metadata": metadata},
+        "inputs": [describe(dataset, with_data) for dataset in input_datasets],
+        "output": describe(output_dataset, False),
+        "version": _aiden_version(),
+    }
+    if optimize:
+        # Only keyed when set, so that the builds cached before the option existed are still found
+        build["optimize"] = True
+    payload = json.dumps(build, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _dataset_to_dict(dataset: "Dataset") -> dict:
+    """Describe a dataset for the build checkpoint."""
+    return {
+        "name": dataset.name,
+        "path": dataset.path,
+        "format": dataset.format,
+        "schema": Dataset.format_schema(dataset.schema) or None,
+    }
+
+
+def _dataset_from_dict(description: dict) -> "Dataset":
+    """Recreate a dataset described in the build checkpoint."""
+    dataset = Dataset(path=description["path"], format=description["format"], schema=description["schema"])
+    dataset.name = description["name"]
+    return dataset
+
+
+def _aiden_version() -> str:
+    """Return the installed version of aiden, which is part of the build cache key."""
+    try:
+        return importlib.metadata.version("aiden-ai")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _rebind_source(source: str, paths: List[tuple]) -> str:
+    """
+    Rebind the dataset paths of a transformation source.
+
+    :param source: the transformation source
+    :param paths: pairs of the dataset path in the source and the path to bind it to
+    :return: the rebound source
+    :raises ValueError: if a path to rebind is not a literal in the source
+    """
+    mapping = {old: new for old, new in paths if old != new}
+    # All the paths are rebound at once, as rebinding them one by one would rewrite paths that were already rebound
+    rebound = replace_dataset_paths(source, mapping)
+    if rebound is None:
+        missing = next(old for old, new in mapping.items() if replace_dataset_paths(source, {old: new}) is None)
+        raise ValueError(f"Cannot rebind dataset path {missing}: it is not a literal in the transformation")
+    return rebound
+
+
+def _get_step_summarizer(
+    chain_of_thought: bool | str | StepSummarizer, provider_config: ProviderConfig
+) -> StepSummarizer:
+    """
+    Resolve the 'chain_of_thought' build option to a step summarizer.
+
+    :param chain_of_thought: True or "llm", "heuristic", or a custom StepSummarizer
+    :param provider_config: the provider configuration of the build
+    :return: the summarizer to use for the chain of thought
+    """
+    if chain_of_thought is True or chain_of_thought == "llm":
+        # Summaries are tool operations, so they use the tool provider rather than a hard-coded default model
+        return LLMStepSummarizer(model=provider_config.tool_provider)
+    if chain_of_thought == "heuristic":
+        return HeuristicStepSummarizer()
+    if isinstance(chain_of_thought, str):
+        raise ValueError(f"Unknown chain of thought mode: {chain_of_thought}, expected 'llm' or 'heuristic'")
+    return chain_of_thought
@@ -0,0 +1,70 @@
+"""
+Unit tests for the response cache module.
+"""
+
+import os
+import time
+
+from pydantic import BaseModel
+
+from aiden.common.cache import ResponseCache, get_cache_dir, get_response_cache
+
+
+class SampleResponse(BaseModel):
+    title: str
+
+
+def test_get_cache_dir_uses_env(isolated_cache_dir):
+    """Test that the cache root honours AIDEN_CACHE_DIR."""
+    path = get_cache_dir("responses")
+    assert path == isolated_cache_dir / "responses"
+    assert path.is_dir()
+    assert get_response_cache().cache_dir == path
+
+
+def test_make_key_is_content_addressed():
+    """Test that keys change with every component of the request."""
+    key = ResponseCache.make_key("openai/gpt-4o", "system", "user")
+    assert key == ResponseCache.make_key("openai/gpt-4o", "system", "user")
+    assert key != ResponseCache.make_key("openai/gpt-4o-mini", "system", "user")
+    assert key != ResponseCache.make_key("openai/gpt-4o", "system", "other user")
+    assert key != ResponseCache.make_key("openai/gpt-4o", "system", "user", SampleResponse)
+
+
+def test_set_and_get(tmp_path):
+    """Test storing and retrieving a response."""
+    cache = ResponseCache(tmp_path)
+    key = ResponseCache.make_key("openai/gpt-4o", "system", "user")
+
+    assert cache.get(key) is None
+    cache.set(key, "cached response")
+    assert cache.get(key) == "cached response"
+
+    cache.clear()
+    assert cache.get(key) is None
+
+
+def test_ttl_expiry(tmp_path):
+    """Test that expired entries are treated as misses."""
+    cache = ResponseCache(tmp_path, ttl_seconds=0)
+    key = ResponseCache.make_key("openai/gpt-4o", "system", "user")
+    cache.set(key, "stale")
+    time.sleep(0.01)
+
+    assert cache.get(key) is None
+
+
+def test_size_eviction_removes_least_recently_used(tmp_path):
+    """Test that the least recently used entries are evicted once the size limit is exceeded."""
+    cache = ResponseCache(tmp_path, max_size_bytes=250)
+    keys = [ResponseCache.make_key("openai/gpt-4o", "system", f"user {i}") for i in range(3)]
+
+    cache.set(keys[0], "a" * 50)
+    cache.set(keys[1], "b" * 50)
+    # Make the first entry the oldest one
+    old = time.time() - 100
+    os.utime(cache._path(keys[0]), (old, old))
+    cache.set(keys[2], "c" * 50)
+
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) == "c" * 50
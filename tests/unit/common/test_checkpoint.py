@@ -0,0 +1,98 @@
+"""
+Unit tests for build checkpoints.
+"""
+
+import uuid
+
+import pytest
+from smolagents import ToolCallingAgent, tool
+from smolagents.models import ChatMessage, ChatMessageToolCall, ChatMessageToolCallFunction, Model
+
+from aiden.common.checkpoint import BuildCheckpoint
+from aiden.entities.code import Code
+from aiden.registries.objects import ObjectRegistry
+
+
+class _ScriptedModel(Model):
+    """Model calling the code tool, then giving the final answer, and failing after a number of calls."""
+
+    def __init__(self, fail_after=None):
+        super().__init__(model_id="scripted")
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def generate(self, messages, stop_sequences=None, response_format=None, tools_to_call_from=None, **kwargs):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise RuntimeError("provider outage")
+        done = any("code-" in str(message.content) for message in messages if message.role == "tool-response")
+        name, arguments = ("final_answer", {"answer": "done"}) if done else ("make_code", {"text": "print(1)"})
+        return ChatMessage(
+            role="assistant",
+            content="",
+            tool_calls=[
+                ChatMessageToolCall(
+                    function=ChatMessageToolCallFunction(name=name, arguments=arguments), id="call", type="function"
+                )
+            ],
+        )
+
+
+def _agent(model, tool_calls):
+    @tool
+    def make_code(text: str) -> str:
+        """Register code and return its id.
+
+        Args:
+            text: The code to register
+        """
+        tool_calls.append(text)
+        name = f"code-{uuid.uuid4()}"
+        ObjectRegistry().register(Code, name, Code(text))
+        return name
+
+    return ToolCallingAgent(model=model, tools=[make_code], max_steps=5, verbosity_level=0)
+
+
+def test_resume_replays_completed_calls(tmp_path):
+    """Test that a resumed build replays the calls made before the interruption, and continues live."""
+    ObjectRegistry().clear()
+    checkpoint = BuildCheckpoint(tmp_path)
+    checkpoint.start({"intent": "test"})
+    tool_calls = []
+    agent = _agent(_ScriptedModel(fail_after=1), tool_calls)
+    checkpoint.attach(agent)
+    with pytest.raises(Exception, match="provider outage"):
+        agent.run("register some code")
+    assert len(tool_calls) == 1
+    assert [step["step_number"] for step in checkpoint.steps()][:1] == [1]
+
+    # Resume in a fresh process state: empty registry, new agent and checkpoint objects
+    ObjectRegistry().clear()
+    resumed = BuildCheckpoint(tmp_path)
+    assert resumed.load()["intent"] == "test"
+    model = _ScriptedModel()
+    agent = _agent(model, tool_calls)
+    resumed.attach(agent)
+
+    assert agent.run("register some code") == "done"
+    assert model.calls == 1
+    assert len(tool_calls) == 1
+    assert resumed.replayed_calls == 2
+    assert list(ObjectRegistry().get_all(Code).values()) == [Code("print(1)")]
+
+    resumed.finish()
+    assert resumed.load()["state"] == "ready"
+    assert BuildCheckpoint.exists(tmp_path)
+
+
+def test_start_discards_previous_journal(tmp_path):
+    """Test that starting a build does not replay the calls of a previous build."""
+    checkpoint = BuildCheckpoint(tmp_path)
+    checkpoint.start({"intent": "test"})
+    checkpoint.attach(_agent(_ScriptedModel(), []))
+    checkpoint._append("key", {"value": 1})
+
+    fresh = BuildCheckpoint(tmp_path)
+    fresh.start({"intent": "test"})
+    assert fresh._take("key") is None
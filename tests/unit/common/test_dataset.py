@@ -2,6 +2,9 @@
 Unit test for the dataset module.
 """
 
+import pandas as pd
+import pyarrow.compute as pc
+import pytest
 from pydantic import BaseModel
 
 from aiden.common.dataset import Dataset
@@ -26,3 +29,47 @@ def test_dataset():
     assert dataset.get_metadata() == {}
     dataset.add_metadata("source", "test")
     assert dataset.get_metadata() == {"source": "test"}
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "json", "feather"])
+def test_dataset_lazy_loading(tmp_path, fmt):
+    """Test that dataset files are read lazily, with projection and predicate pushdown."""
+    df = pd.DataFrame({"id": range(10), "name": [f"n{i}" for i in range(10)]})
+    path = tmp_path / f"data.{fmt}"
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "json":
+        df.to_json(path, orient="records", lines=True)
+    else:
+        df.to_feather(path)
+    dataset = Dataset(path=str(path), format=fmt)
+
+    assert len(dataset) == 10
+    assert dataset.count_rows(filter=pc.field("id") >= 7) == 3
+    assert dataset.arrow_schema().names == ["id", "name"]
+    assert dataset.head(3)["id"].tolist() == [0, 1, 2]
+    assert dataset.get_metadata() == {} and dataset._data is None
+
+    loaded = dataset.load(columns=["name"], filter=pc.field("id") < 2)
+    assert list(loaded.columns) == ["name"]
+    assert loaded["name"].tolist() == ["n0", "n1"]
+
+    assert dataset.get_data()["id"].tolist() == list(range(10))
+    assert dataset["name"].tolist()[-1] == "n9"
+
+
+def test_dataset_lazy_loading_missing_file(tmp_path):
+    """Test that a dataset without a file behaves as an empty dataset, and that the file view follows changes."""
+    path = tmp_path / "data.csv"
+    dataset = Dataset(path=str(path), format="csv")
+    assert len(dataset) == 0
+    assert dataset.get_data() is None
+    with pytest.raises(ValueError, match="not loaded"):
+        dataset.head()
+
+    path.write_text("a\n1\n")
+    assert len(dataset) == 1
+    path.write_text("a\n1\n2\n3\n")
+    assert len(dataset) == 3
@@ -6,6 +6,8 @@ import os
 from unittest.mock import patch
 from pathlib import Path
 
+import pytest
+
 from aiden.common.environment import Environment, get_environment
 
 
@@ -65,3 +67,16 @@ def test_dagster_environment(mock_exists, mock_resolve, mock_expanduser, mock_mk
         env = get_environment(workdir="./test_dagster_env_dir")
         assert env.type == "dagster"
         assert env.is_dagster is True
+
+
+def test_environment_engine(tmp_path):
+    """Test that the compute engine defaults to pandas, and that unsupported engines are rejected."""
+    assert Environment(type="local", workdir=str(tmp_path)).engine == "pandas"
+    assert Environment(type="local", workdir=str(tmp_path), metadata={"engine": "pyarrow"}).engine == "pyarrow"
+
+    with pytest.raises(ValueError, match="Unsupported compute engine"):
+        Environment(type="local", workdir=str(tmp_path), metadata={"engine": "spark"})
+    with pytest.raises(ValueError, match="only supported in local environments"):
+        Environment(type="dagster", workdir=str(tmp_path), metadata={"engine": "pyarrow"})
+    with pytest.raises(ValueError, match="only supported in local environments"):
+        Environment(type="local", workdir=str(tmp_path), metadata={"engine": "pyarrow", "mode": "streaming"})
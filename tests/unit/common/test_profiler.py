@@ -0,0 +1,73 @@
+"""
+Unit tests for the dataset profiler.
+"""
+
+import numpy as np
+import pandas as pd
+
+from aiden.common import profiler
+from aiden.common.dataset import Dataset
+from aiden.common.profiler import HyperLogLog, describe_datasets, format_profile, profile_dataset
+
+
+def test_hyperloglog_estimates_distinct_values():
+    """Test that the HyperLogLog estimate stays within a few percent of the true cardinality."""
+    for cardinality in (10, 1_000, 100_000):
+        sketch = HyperLogLog()
+        values = pd.Series(np.arange(cardinality).repeat(3))
+        sketch.add_hashes(pd.util.hash_pandas_object(values, index=False).to_numpy())
+        assert abs(sketch.count() - cardinality) <= max(2, 0.05 * cardinality)
+
+
+def test_profile_dataset(tmp_path):
+    """Test the statistics of a profile and its formatting for the prompts."""
+    path = tmp_path / "sales.csv"
+    pd.DataFrame(
+        {
+            "month": ["May", "June", "May", None, "May", "July"],
+            "amount": [10.5, 3.0, None, 7.25, 1.0, 99.0],
+            "units": [1, 2, 3, 4, 5, 6],
+        }
+    ).to_csv(path, index=False)
+    dataset = Dataset(path=str(path), format="csv")
+
+    profile = profile_dataset(dataset)
+
+    assert profile["rows"] == 6 and profile["rows_profiled"] == 6
+    month, amount, units = profile["columns"]
+    assert month["type"] == "string"
+    assert month["nulls"] == 1
+    assert month["distinct"] == 3
+    assert month["top"][0] == ["May", 3]
+    assert month["min"] == "July" and month["max"] == "May"
+    assert amount["nulls"] == 1 and amount["min"] == 1.0 and amount["max"] == 99.0
+    assert units["type"] == "int64" and units["distinct"] == 6
+
+    text = format_profile(dataset, profile)
+    assert text.splitlines()[0] == "sales (csv, 6 rows):"
+    assert "- month: string, nulls=1, distinct~3" in text
+    assert "'May' (3)" in text
+
+
+def test_profile_dataset_is_cached(tmp_path, monkeypatch):
+    """Test that profiles are computed once per version of a file."""
+    path = tmp_path / "values.parquet"
+    pd.DataFrame({"a": [1, 2, 3]}).to_parquet(path, index=False)
+    dataset = Dataset(path=str(path), format="parquet")
+
+    calls = []
+    compute_profile = profiler._compute_profile
+    monkeypatch.setattr(profiler, "_compute_profile", lambda d: calls.append(d) or compute_profile(d))
+
+    assert profile_dataset(dataset)["rows"] == 3
+    assert profile_dataset(Dataset(path=str(path), format="parquet"))["rows"] == 3
+    assert len(calls) == 1
+
+    pd.DataFrame({"a": [1, 2, 3, 4]}).to_parquet(path, index=False)
+    assert profile_dataset(dataset)["rows"] == 4
+    assert len(calls) == 2
+
+
+def test_describe_datasets_skips_missing_files(tmp_path):
+    """Test that datasets without a file are not described."""
+    assert describe_datasets([Dataset(path=str(tmp_path / "missing.csv"), format="csv")]) is None
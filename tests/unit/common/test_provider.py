@@ -2,9 +2,16 @@
 Unit tests for the provider module.
 """
 
-from unittest.mock import patch, MagicMock
+import asyncio
+from unittest.mock import AsyncMock, patch, MagicMock
 
+from pydantic import BaseModel
+from tenacity import retry, stop_after_attempt
+
+from aiden.common.cache import ResponseCache
+from aiden.common.rate_limiter import RateLimiter
 from aiden.common.provider import ProviderConfig, Provider
+from aiden.common.usage import UsageLedger
 
 
 def test_provider_config():
@@ -50,3 +57,130 @@ def test_provider(mock_get_params, mock_supports_schema, mock_completion):
 
     # Verify results
     assert result == "Test response"
+
+
+@patch("aiden.common.provider.completion")
+@patch("aiden.common.provider.supports_response_schema")
+@patch("aiden.common.provider.litellm.get_supported_openai_params")
+def test_provider_response_cache(mock_get_params, mock_supports_schema, mock_completion, tmp_path):
+    """Test that identical queries are served from the response cache unless bypassed."""
+    mock_get_params.return_value = {"response_format": True}
+    mock_supports_schema.return_value = True
+
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "Cached response"
+    mock_completion.return_value = mock_response
+
+    provider = Provider(cache=ResponseCache(tmp_path))
+
+    first = provider.query(system_message="System prompt", user_message="User message", backoff=False)
+    second = provider.query(system_message="System prompt", user_message="User message", backoff=False)
+    assert first == second == "Cached response"
+    assert mock_completion.call_count == 1
+
+    # Bypassing the cache always reaches the provider
+    provider.query(system_message="System prompt", user_message="User message", backoff=False, use_cache=False)
+    assert mock_completion.call_count == 2
+
+
+@patch("aiden.common.provider.completion")
+@patch("aiden.common.provider.supports_response_schema")
+@patch("aiden.common.provider.litellm.get_supported_openai_params")
+def test_provider_caches_only_valid_structured_responses(
+    mock_get_params, mock_supports_schema, mock_completion, tmp_path
+):
+    """Test that malformed structured responses are retried and never cached, and that cached ones are dropped."""
+    mock_get_params.return_value = {"response_format": True}
+    mock_supports_schema.return_value = True
+
+    class Answer(BaseModel):
+        value: int
+
+    def completion_returning(*contents):
+        responses = []
+        for content in contents:
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = content
+            responses.append(response)
+        return responses
+
+    mock_completion.side_effect = completion_returning('{"value": ', '{"value": 1}')
+    cache = ResponseCache(tmp_path)
+    provider = Provider(cache=cache)
+
+    no_wait_retries = staticmethod(lambda fn, retries: retry(stop=stop_after_attempt(retries))(fn))
+    with patch.object(Provider, "_with_retries", no_wait_retries):
+        result = provider.query("System prompt", "User message", response_format=Answer)
+    assert result == '{"value": 1}'
+    assert mock_completion.call_count == 2
+    key = cache.make_key(provider.model, "System prompt", "User message", Answer)
+    assert cache.get(key) == '{"value": 1}'
+
+    # A malformed entry left in the cache is dropped instead of being replayed
+    cache.set(key, '{"value": "one"}')
+    mock_completion.side_effect = completion_returning('{"value": 2}')
+    assert provider.query("System prompt", "User message", response_format=Answer, backoff=False) == '{"value": 2}'
+
+    provider.forget("System prompt", "User message", Answer)
+    assert cache.get(key) is None
+
+
+@patch("aiden.common.provider.acompletion", new_callable=AsyncMock)
+@patch("aiden.common.provider.supports_response_schema")
+@patch("aiden.common.provider.litellm.get_supported_openai_params")
+def test_provider_aquery(mock_get_params, mock_supports_schema, mock_acompletion):
+    """Test that concurrent asynchronous queries go through litellm.acompletion."""
+    mock_get_params.return_value = {"response_format": True}
+    mock_supports_schema.return_value = True
+
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "Async response"
+    mock_acompletion.return_value = mock_response
+
+    provider = Provider(rate_limiter=RateLimiter(max_concurrency=2))
+
+    async def fan_out():
+        return await asyncio.gather(
+            *(
+                provider.aquery(system_message="System", user_message=f"Message {i}", backoff=False, use_cache=False)
+                for i in range(4)
+            )
+        )
+
+    results = asyncio.run(fan_out())
+
+    assert results == ["Async response"] * 4
+    assert mock_acompletion.await_count == 4
+
+
+@patch("aiden.common.provider.completion")
+@patch("aiden.common.provider.supports_response_schema")
+@patch("aiden.common.provider.litellm.get_supported_openai_params")
+def test_provider_records_usage(mock_get_params, mock_supports_schema, mock_completion, tmp_path):
+    """Test that queries record their tokens, retries and cache hits in the usage ledger."""
+    mock_get_params.return_value = {"response_format": True}
+    mock_supports_schema.return_value = True
+
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "Response"
+    mock_response.usage.prompt_tokens = 40
+    mock_response.usage.completion_tokens = 10
+    mock_completion.side_effect = [ValueError("transient"), mock_response]
+
+    ledger = UsageLedger()
+    provider = Provider(model="openai/gpt-4o", cache=ResponseCache(tmp_path), ledger=ledger, role="data_engineer")
+    # Retry without waiting
+    no_wait_retries = staticmethod(lambda fn, retries: retry(stop=stop_after_attempt(retries))(fn))
+    with patch.object(Provider, "_with_retries", no_wait_retries):
+        provider.query(system_message="System prompt", user_message="User message")
+    provider.query(system_message="System prompt", user_message="User message", backoff=False)
+
+    call, cache_hit = ledger.records
+    assert (call.model, call.role) == ("openai/gpt-4o", "data_engineer")
+    assert (call.prompt_tokens, call.completion_tokens, call.retries) == (40, 10, 1)
+    assert call.cost > 0
+    assert cache_hit.cache_hit and cache_hit.prompt_tokens == 0
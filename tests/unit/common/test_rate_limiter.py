@@ -0,0 +1,94 @@
+"""
+Unit tests for the rate limiter module.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aiden.common.rate_limiter import RateLimiter, get_rate_limiter
+
+
+def test_invalid_concurrency():
+    """Test that a limiter needs at least one slot."""
+    with pytest.raises(ValueError):
+        RateLimiter(max_concurrency=0)
+
+
+def test_concurrency_bound():
+    """Test that no more than max_concurrency requests are in flight across threads."""
+    limiter = RateLimiter(max_concurrency=2)
+    lock = threading.Lock()
+    state = {"current": 0, "peak": 0}
+
+    def request():
+        with limiter.limit():
+            with lock:
+                state["current"] += 1
+                state["peak"] = max(state["peak"], state["current"])
+            time.sleep(0.05)
+            with lock:
+                state["current"] -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert state["peak"] == 2
+
+
+def test_async_concurrency_bound():
+    """Test that the async interface respects the same bound."""
+    limiter = RateLimiter(max_concurrency=3)
+    state = {"current": 0, "peak": 0}
+
+    async def request():
+        async with limiter.alimit():
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+            await asyncio.sleep(0.05)
+            state["current"] -= 1
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(9)))
+
+    asyncio.run(main())
+    assert state["peak"] == 3
+
+
+def test_token_bucket_delays_requests_over_rate():
+    """Test that requests beyond the bucket capacity wait for a refill."""
+    # 60 requests per minute: one token per second, bucket of 60 tokens
+    limiter = RateLimiter(max_concurrency=100, requests_per_minute=60)
+    limiter._tokens = 1.0
+
+    start = time.monotonic()
+    with limiter.limit():
+        pass
+    limiter._tokens = 0.9
+    with limiter.limit():
+        pass
+
+    assert time.monotonic() - start >= 0.08
+
+
+def test_penalize_blocks_all_callers():
+    """Test that a cooldown delays subsequent acquisitions."""
+    limiter = RateLimiter(max_concurrency=4)
+    limiter.penalize(0.1)
+
+    start = time.monotonic()
+    with limiter.limit():
+        pass
+
+    assert time.monotonic() - start >= 0.09
+
+
+def test_get_rate_limiter_is_shared_per_model():
+    """Test that limiters are shared per model."""
+    assert get_rate_limiter("openai/gpt-4o") is get_rate_limiter("openai/gpt-4o")
+    assert get_rate_limiter("openai/gpt-4o") is not get_rate_limiter("anthropic/claude-3")
@@ -0,0 +1,108 @@
+"""
+Unit tests for the synthetic data generator.
+"""
+
+import datetime
+from typing import Optional
+
+import pandas as pd
+import pytest
+from pydantic import BaseModel
+
+from aiden.common.dataset import Dataset
+from aiden.common.synthetic import Reference, generate_dataset, infer_references
+from aiden.common.utils.output_validation import validate_output
+
+
+class Employee(BaseModel):
+    EmployeeID: str
+    FirstName: str
+    Email: str
+    Region: str
+    HireDate: str
+
+
+class Transaction(BaseModel):
+    TransactionID: str
+    EmployeeID: str
+    TransactionDate: datetime.datetime
+    Amount: float
+    Quantity: int
+    Paid: bool
+    Note: Optional[str]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "json"])
+def test_generated_data_matches_schema(tmp_path, fmt):
+    """Test that the generated files match their schema, in each format."""
+    dataset = Dataset(path=str(tmp_path / f"transactions.{fmt}"), format=fmt, schema=Transaction)
+
+    generate_dataset(dataset, 5000, seed=0, edge_case_fraction=0.01)
+
+    assert validate_output(dataset.path, dataset) == []
+    data = dataset.load()
+    assert len(data) == 5000
+    assert data["TransactionID"].is_unique
+    assert 0 < data["Note"].isna().sum() < 1000
+    assert data.drop(columns=["Note"]).notna().all().all()
+
+
+def test_references_and_reproducibility(tmp_path):
+    """Test that referencing columns only hold values of the referenced column, and that seeds are reproducible."""
+    employees = generate_dataset(Dataset(str(tmp_path / "employees.csv"), "csv", schema=Employee), 50, seed=1)
+    references = {"EmployeeID": Reference(employees, "EmployeeID")}
+
+    first = generate_dataset(
+        Dataset(str(tmp_path / "a.parquet"), "parquet", schema=Transaction), 2000, references, seed=2
+    )
+    second = generate_dataset(
+        Dataset(str(tmp_path / "b.parquet"), "parquet", schema=Transaction), 2000, references, seed=2
+    )
+
+    employee_ids = set(pd.read_csv(employees.path)["EmployeeID"])
+    assert set(first.load()["EmployeeID"]) <= employee_ids
+    assert first.load().equals(second.load())
+    assert pd.read_csv(employees.path)["Email"].str.match(r"^[a-z]+\.[a-z]+\d*@[a-z.]+$").all()
+
+
+def test_infer_references(tmp_path):
+    """Test that a column referencing the unique values of the same column of another dataset is a foreign key."""
+    employees = Dataset(str(tmp_path / "employees.csv"), "csv", _name="employees")
+    pd.DataFrame({"EmployeeID": ["E1", "E2", "E3"], "Region": ["North", "South", "North"]}).to_csv(
+        employees.path, index=False
+    )
+    sales = Dataset(str(tmp_path / "sales.csv"), "csv", _name="sales")
+    pd.DataFrame({"EmployeeID": ["E1", "E1", "E3", None], "Region": ["East", "East", "West", "East"]}).to_csv(
+        sales.path, index=False
+    )
+    managers = Dataset(str(tmp_path / "managers.csv"), "csv", _name="managers")
+    pd.DataFrame({"EmployeeID": ["E3", "E2", "E1"]}).to_csv(managers.path, index=False)
+
+    references = infer_references([employees, sales, managers])
+
+    assert {
+        name: {column: (ref.dataset.name, ref.column) for column, ref in refs.items()}
+        for name, refs in references.items()
+    } == {
+        "sales": {"EmployeeID": ("employees", "EmployeeID")},
+        # Both columns hold the same unique values: the first dataset is the referenced one
+        "managers": {"EmployeeID": ("employees", "EmployeeID")},
+    }
+
+
+def test_edge_cases(tmp_path):
+    """Test that a fraction of the values are edge cases."""
+    dataset = Dataset(str(tmp_path / "t.parquet"), "parquet", schema=Transaction)
+
+    data = generate_dataset(dataset, 10_000, seed=3, edge_case_fraction=0.01).load()
+
+    assert ((data["Quantity"] < 0) | (data["Quantity"] >= 100_000)).any()
+    assert (data["Amount"] == 0).any()
+
+
+def test_unsupported_schema(tmp_path):
+    """Test that datasets without a schema, or with types that cannot be generated, are rejected."""
+    with pytest.raises(ValueError, match="no schema"):
+        generate_dataset(Dataset(str(tmp_path / "x.csv"), "csv"), 10)
+    with pytest.raises(ValueError, match="Cannot generate"):
+        generate_dataset(Dataset(str(tmp_path / "x.csv"), "csv", schema={"tags": list}), 10)
@@ -0,0 +1,86 @@
+"""
+Unit tests for the usage ledger of the LLM calls of a build.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from aiden.common.usage import LEDGER_NAME, UsageLedger, UsageRecord
+from aiden.registries.objects import ObjectRegistry
+
+
+def test_ledger_totals_by_role():
+    """Test that the ledger sums the records of the build and of each role."""
+    ledger = UsageLedger()
+    ledger.record(UsageRecord("openai/gpt-4o", "manager", 100, 20, latency=1.5, cost=0.01))
+    ledger.record(UsageRecord("openai/gpt-4o", "data_engineer", 300, 50, latency=2.5, retries=2, cost=0.02))
+    ledger.record(UsageRecord("openai/gpt-4o", "data_engineer", latency=0.1, cache_hit=True))
+
+    totals = ledger.totals()
+    assert totals["calls"] == 3
+    assert totals["prompt_tokens"] == 400
+    assert totals["completion_tokens"] == 70
+    assert totals["total_tokens"] == 470
+    assert totals["cost_usd"] == pytest.approx(0.03)
+    assert totals["latency_seconds"] == pytest.approx(4.1)
+    assert totals["retries"] == 2
+    assert totals["cache_hits"] == 1
+
+    by_role = ledger.totals_by_role()
+    assert list(by_role) == ["data_engineer", "manager"]
+    assert by_role["data_engineer"]["calls"] == 2
+    assert by_role["manager"]["prompt_tokens"] == 100
+
+
+def test_ledger_notifies_listeners():
+    """Test that listeners receive each record, and that failing listeners do not break the recording."""
+    ledger = UsageLedger()
+    received = []
+    ledger.add_listener(lambda record: 1 / 0)
+    ledger.add_listener(received.append)
+
+    record = UsageRecord("openai/gpt-4o", "tool", 10, 5, cost=0.0)
+    ledger.record(record)
+
+    assert received == [record]
+    assert ledger.records == [record]
+
+
+def test_ledger_current_is_the_ledger_of_the_active_registry():
+    """Test that the ledger of a build is found through its registry, and not outside of it."""
+    registry = ObjectRegistry.create(parent=ObjectRegistry.root())
+    ledger = UsageLedger()
+    registry.register(UsageLedger, LEDGER_NAME, ledger)
+
+    with registry.activate():
+        assert UsageLedger.current() is ledger
+    assert UsageLedger.current() is None
+
+
+def test_ledger_attach_records_agent_model_calls():
+    """Test that attaching an agent records the tokens of its model calls, and its failed calls."""
+    message = SimpleNamespace(token_usage=SimpleNamespace(input_tokens=120, output_tokens=30))
+    outcomes = [message, RuntimeError("provider down")]
+
+    def generate(messages, **kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    model = SimpleNamespace(model_id="anthropic/claude-3-7-sonnet-latest", generate=generate)
+    agent = SimpleNamespace(name="data_expert", model=model)
+    ledger = UsageLedger()
+    ledger.attach(agent)
+
+    assert agent.model.generate([]) is message
+    with pytest.raises(RuntimeError):
+        agent.model.generate([])
+
+    success, failure = ledger.records
+    assert (success.model, success.role) == ("anthropic/claude-3-7-sonnet-latest", "data_expert")
+    assert (success.prompt_tokens, success.completion_tokens) == (120, 30)
+    assert success.error is None
+    assert failure.error == "provider down"
+    assert ledger.totals()["errors"] == 1
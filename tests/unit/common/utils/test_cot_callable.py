@@ -0,0 +1,103 @@
+"""
+Unit tests for the chain of thought callable.
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from aiden.common.utils.cot.callable import ChainOfThoughtCallable
+from aiden.common.utils.cot.protocol import StepSummary
+
+
+def _extractor(step, agent):
+    return StepSummary(step_number=step, step_type="ActionStep", agent_name="data_engineer")
+
+
+def test_synchronous_summary():
+    """Test that steps are summarised inline when background mode is off."""
+    summarizer = Mock()
+    summarizer.summarize.return_value = ("Title", "Summary")
+    emitter = Mock()
+
+    cot = ChainOfThoughtCallable(emitter=emitter, extractor=_extractor, summarizer=summarizer)
+    cot(1)
+
+    emitter.emit_thought.assert_called_once_with("data_engineer", "💡 Title\n💭 Summary")
+    assert cot.get_full_chain_of_thought()[0].friendly_title == "Title"
+
+
+def test_background_summary_is_off_the_critical_path():
+    """Test that the raw step is emitted immediately and the friendly summary later."""
+
+    def slow_summary(summary):
+        time.sleep(0.2)
+        return "Title", "Summary"
+
+    summarizer = Mock()
+    summarizer.summarize.side_effect = slow_summary
+    emitter = Mock()
+
+    cot = ChainOfThoughtCallable(emitter=emitter, extractor=_extractor, summarizer=summarizer, background=True)
+    start = time.monotonic()
+    cot(1)
+    assert time.monotonic() - start < 0.1
+
+    # Only the raw step header has been emitted so far
+    assert emitter.emit_thought.call_args_list[0][0] == ("data_engineer", "🧠 ActionStep #1")
+
+    cot.flush()
+    emitter.emit_thought.assert_called_with("data_engineer", "💡 Title\n💭 Summary")
+    assert cot.get_full_chain_of_thought()[0].friendly_summary == "Summary"
+
+
+def test_background_summary_batches_pending_steps():
+    """Test that steps queued while the worker is busy are summarised in a single batch."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_summary(summary):
+        started.set()
+        release.wait(timeout=5)
+        return "First", "First summary"
+
+    summarizer = Mock()
+    summarizer.summarize.side_effect = blocking_summary
+    summarizer.summarize_batch.side_effect = lambda summaries: [(f"Step {s.step_number}", "Batched") for s in summaries]
+    emitter = Mock()
+
+    cot = ChainOfThoughtCallable(
+        emitter=emitter, extractor=_extractor, summarizer=summarizer, background=True, batch_size=3
+    )
+    cot(1)
+    # Queue further steps while the worker is busy with the first one
+    assert started.wait(timeout=5)
+    for step in range(2, 5):
+        cot(step)
+    release.set()
+    cot.flush()
+
+    summarizer.summarize_batch.assert_called_once()
+    assert [s.step_number for s in summarizer.summarize_batch.call_args[0][0]] == [2, 3, 4]
+    assert [s.friendly_title for s in cot.get_full_chain_of_thought()] == ["First", "Step 2", "Step 3", "Step 4"]
+
+
+def test_close_stops_the_worker_after_pending_steps():
+    """Test that close() emits the queued summaries and stops the worker, which restarts for further steps."""
+    summarizer = Mock()
+    summarizer.summarize.side_effect = lambda summary: (f"Step {summary.step_number}", "Summary")
+    emitter = Mock()
+
+    cot = ChainOfThoughtCallable(emitter=emitter, extractor=_extractor, summarizer=summarizer, background=True)
+    cot(1)
+    worker = cot._worker
+    cot.close()
+
+    assert not worker.is_alive()
+    emitter.emit_thought.assert_called_with("data_engineer", "💡 Step 1\n💭 Summary")
+
+    cot(2)
+    restarted = cot._worker
+    cot.close()
+    assert restarted is not worker and not restarted.is_alive()
+    assert cot.get_full_chain_of_thought()[1].friendly_title == "Step 2"
@@ -0,0 +1,68 @@
+"""
+Unit tests for the chain of thought summarizers.
+"""
+
+from unittest.mock import patch
+
+from aiden.common.utils.cot.protocol import StepSummary, ToolCall
+from aiden.common.utils.cot.summarizers import HeuristicStepSummarizer, LLMStepSummarizer
+
+
+def test_heuristic_summary_for_tool_call():
+    """Test that tool calls are described from their name, arguments and observation size."""
+    summary = StepSummary(
+        step_number=3,
+        step_type="ActionStep",
+        agent_name="data_engineer",
+        model_output="Thought: I should run the generated code. Then check the output.",
+        tool_calls=[ToolCall(name="execute_code", args={"node_id": "n1", "timeout": 60})],
+        observations="x" * 42,
+    )
+
+    title, text = HeuristicStepSummarizer().summarize(summary)
+
+    assert title == "Executing transformation code"
+    assert "I reasoned that i should run the generated code." in text
+    assert "I called 'execute_code' with node_id='n1', timeout=60." in text
+    assert "I observed 42 characters of output." in text
+
+
+def test_heuristic_summary_for_error():
+    """Test that errors are reflected in the title and summary."""
+    summary = StepSummary(
+        step_type="ActionStep",
+        tool_calls=[ToolCall(name="fix_transformation_code", args={})],
+        error="Traceback...\nKeyError: 'month'",
+    )
+
+    title, text = HeuristicStepSummarizer().summarize(summary)
+
+    assert title == "Error while fixing transformation code"
+    assert text.endswith("It failed with: KeyError: 'month'.")
+
+
+def test_heuristic_summary_for_step_without_tools():
+    """Test that steps without tool calls get a title from their type."""
+    summarizer = HeuristicStepSummarizer()
+    results = summarizer.summarize_batch([StepSummary(step_type="PlanningStep"), StepSummary(step_type="Other")])
+
+    assert results[0] == ("Planning the next steps", "No output was observed.")
+    assert results[1][0] == "Reasoning about the task"
+
+
+@patch("aiden.common.utils.cot.summarizers.Provider")
+def test_llm_summarizer_uses_configured_model(mock_provider_class):
+    """Test that the LLM summarizer queries the configured model and falls back on errors."""
+    mock_provider_class.return_value.query.return_value = '{"title": "Title", "summary": "Summary"}'
+
+    summarizer = LLMStepSummarizer(model="anthropic/claude-3-7-sonnet-latest")
+    assert summarizer.summarize(StepSummary(step_type="ActionStep")) == ("Title", "Summary")
+    mock_provider_class.assert_called_once_with(
+        "anthropic/claude-3-7-sonnet-latest", ledger=None, role="chain_of_thought"
+    )
+
+    mock_provider_class.return_value.query.side_effect = ValueError("boom")
+    assert summarizer.summarize(StepSummary(step_number=2, step_type="ActionStep")) == (
+        "ActionStep",
+        "Step 2 of type ActionStep",
+    )
@@ -0,0 +1,97 @@
+"""
+Unit tests for the output validation module.
+"""
+
+import datetime
+from typing import Optional
+
+import pandas as pd
+from pydantic import BaseModel
+
+from aiden.common.dataset import Dataset
+from aiden.common.utils.output_validation import validate_output
+
+
+class Order(BaseModel):
+    id: int
+    amount: float
+    customer: str
+    paid: bool
+    ordered_at: datetime.datetime
+    note: Optional[str]
+
+
+def _orders(**overrides):
+    data = {
+        "id": [1, 2, 3],
+        "amount": [9.5, 20.0, 3.25],
+        "customer": ["alice", "bob", "carol"],
+        "paid": [True, False, True],
+        "ordered_at": pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03"]),
+        "note": [None, "gift", None],
+    }
+    data.update(overrides)
+    return pd.DataFrame(data)
+
+
+def _problems(path, fmt="parquet"):
+    return [(problem.kind, problem.column) for problem in validate_output(path, Dataset(str(path), fmt, schema=Order))]
+
+
+def test_valid_output(tmp_path):
+    """Test that outputs matching the schema have no problems, in typed and untyped formats."""
+    _orders().to_parquet(tmp_path / "orders.parquet")
+    _orders().to_csv(tmp_path / "orders.csv", index=False)
+
+    assert _problems(tmp_path / "orders.parquet") == []
+    assert _problems(tmp_path / "orders.csv", "csv") == []
+
+
+def test_columns(tmp_path):
+    """Test that missing, unexpected and reordered columns are reported."""
+    path = tmp_path / "orders.parquet"
+    assert _problems(path) == [("missing_file", None)]
+
+    _orders().drop(columns=["note"]).to_parquet(path)
+    assert _problems(path) == [("missing_columns", None)]
+
+    _orders(extra=[1, 2, 3])[["amount", "id", "customer", "paid", "ordered_at", "note", "extra"]].to_parquet(path)
+    assert _problems(path) == [("unexpected_columns", None), ("column_order", None)]
+
+
+def test_types_and_nulls(tmp_path):
+    """Test that values that cannot be coerced to the schema types, and nulls in required fields, are reported."""
+    path = tmp_path / "orders.parquet"
+    _orders(
+        id=[1.0, 2.5, 3.0],
+        amount=["1.5", "2", "3"],
+        customer=["alice", None, "carol"],
+        paid=[0, 1, 2],
+        ordered_at=["2025-01-01", "2025-01-02T10:00:00", "yesterday"],
+    ).to_parquet(path)
+
+    assert _problems(path) == [
+        ("type", "id"),
+        ("nulls", "customer"),
+        ("type", "paid"),
+        ("type", "ordered_at"),
+    ]
+    message = str(validate_output(path, Dataset(str(path), "parquet", schema=Order))[0])
+    assert "Column 'id' cannot be read as int" in message
+
+
+def test_dict_schema_without_optional_fields(tmp_path):
+    """Test validation against a dictionary schema, whose fields are all required."""
+    path = tmp_path / "out.csv"
+    path.write_text("name,age\nAlice,\nBob,x\n")
+
+    problems = validate_output(path, Dataset(str(path), "csv", schema={"name": str, "age": int}))
+    assert [(problem.kind, problem.column) for problem in problems] == [("type", "age"), ("nulls", "age")]
+
+
+def test_empty_strings_in_text_formats(tmp_path):
+    """Test that empty strings in required string columns of text formats are not reported as nulls."""
+    path = tmp_path / "out.csv"
+    pd.DataFrame({"name": ["a", "", "c"], "age": [1, 2, 3]}).to_csv(path, index=False)
+
+    assert validate_output(path, Dataset(str(path), "csv", schema={"name": str, "age": int})) == []
@@ -4,13 +4,16 @@ Unit test for the prompt utility module.
 
 from unittest.mock import patch
 
-from aiden.common.utils.prompt import get_prompt_templates
+import yaml
+
+from aiden.common.utils.prompt import _load_prompt_templates, get_prompt_templates
 
 
 @patch("aiden.common.utils.prompt.yaml.safe_load")
 @patch("importlib.resources.files")
 def test_get_prompt_templates(mock_files, mock_yaml_load):
     """Test merging of prompt templates with overrides."""
+    _load_prompt_templates.cache_clear()
     # Setup mock returns
     mock_yaml_load.side_effect = [
         # Base template
@@ -28,3 +31,15 @@ def test_get_prompt_templates(mock_files, mock_yaml_load):
     # Verify the result - override should take precedence
     assert result["managed_agent"]["task"] == "Override task"
     assert result["managed_agent"]["context"] == "Base context"
+
+
+@patch("aiden.common.utils.prompt.yaml.safe_load", wraps=yaml.safe_load)
+def test_get_prompt_templates_is_cached(mock_yaml_load):
+    """Test that the templates are parsed once, and that callers get independent copies."""
+    _load_prompt_templates.cache_clear()
+    first = get_prompt_templates("toolcalling_agent.yaml", "data_expert_prompt_templates.yaml")
+    first["system_prompt"] = "modified"
+    second = get_prompt_templates("toolcalling_agent.yaml", "data_expert_prompt_templates.yaml")
+
+    assert mock_yaml_load.call_count == 2
+    assert second["system_prompt"] != "modified"
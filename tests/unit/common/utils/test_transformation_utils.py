@@ -2,7 +2,8 @@
 Unit test for the transformation_utils module.
 """
 
-from aiden.common.utils.transformation_utils import format_code_snippet
+from aiden.common.dataset import Dataset
+from aiden.common.utils.transformation_utils import check_output_dataset, format_code_snippet, replace_dataset_paths
 
 
 def test_format_code_snippet():
@@ -22,3 +23,35 @@ def test_format_code_snippet():
     # Verify truncation occurred and format is correct
     assert "additional lines omitted" in result
     assert "line 0" in result and "line 29" in result
+
+
+def test_replace_dataset_paths():
+    """Test that dataset path literals are rewritten, and that missing paths are reported."""
+    code = "df.to_csv('./out/result.csv')\nother = \"out/result.csv\""
+
+    rewritten = replace_dataset_paths(code, {"./out/result.csv": "/tmp/candidate.csv"})
+
+    assert rewritten == "df.to_csv('/tmp/candidate.csv')\nother = \"/tmp/candidate.csv\""
+    assert replace_dataset_paths(code, {"./elsewhere.csv": "/tmp/x.csv"}) is None
+
+
+def test_replace_dataset_paths_in_one_pass():
+    """Test that swapped paths, and paths prefixing one another, are not rewritten twice."""
+    code = "a = pd.read_csv('a.csv')\nb = pd.read_csv('b.csv')\nc = pd.read_csv('data/a.csv')"
+
+    rewritten = replace_dataset_paths(code, {"a.csv": "b.csv", "b.csv": "a.csv", "data/a.csv": "data/a.csv.bak"})
+
+    assert rewritten == "a = pd.read_csv('b.csv')\nb = pd.read_csv('a.csv')\nc = pd.read_csv('data/a.csv.bak')"
+
+
+def test_check_output_dataset(tmp_path):
+    """Test the output check on missing files, missing columns and valid outputs."""
+    dataset = Dataset(path=str(tmp_path / "out.csv"), format="csv", schema={"name": str, "age": int})
+
+    assert "was not created" in check_output_dataset(tmp_path / "out.csv", dataset)[0]
+
+    (tmp_path / "out.csv").write_text("name\nAlice\n")
+    assert "missing columns ['age']" in check_output_dataset(tmp_path / "out.csv", dataset)[0]
+
+    (tmp_path / "out.csv").write_text("name,age\nAlice,25\n")
+    assert check_output_dataset(tmp_path / "out.csv", dataset) == []
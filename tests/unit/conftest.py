@@ -0,0 +1,13 @@
+"""
+Shared fixtures for the unit tests.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Point the aiden cache root at a temporary directory so tests never touch the user cache."""
+    cache_dir = tmp_path / "aiden-cache"
+    monkeypatch.setenv("AIDEN_CACHE_DIR", str(cache_dir))
+    return cache_dir
@@ -2,7 +2,7 @@
 Unit tests for the description module.
 """
 
-from aiden.entities.description import SchemaInfo, CodeInfo, TransformationDescription
+from aiden.entities.description import SchemaInfo, CodeInfo, TransformationDescription, UsageInfo
 
 
 def test_dataclass_creation_and_defaults():
@@ -128,3 +128,20 @@ def test_json_serialization():
     assert deserialized.intent == original.intent
     assert deserialized.schemas.output == original.schemas.output
     assert deserialized.code.transformation == original.code.transformation
+
+
+def test_usage_representations():
+    """Test that the LLM usage of the build is listed in the text and markdown representations."""
+    totals = {"calls": 3, "prompt_tokens": 400, "completion_tokens": 70, "cost_usd": 0.03, "latency_seconds": 4.1}
+    desc = TransformationDescription(
+        id="test-transform",
+        state="ready",
+        intent="Test transformation",
+        schemas=SchemaInfo(output={"result": "int"}),
+        code=CodeInfo(),
+        usage=UsageInfo(totals=totals, by_role={"manager": {**totals, "cost_usd": None}}),
+    )
+
+    assert "total: 3 calls, 400 prompt + 70 completion tokens, $0.0300, 4.1s" in desc.as_text()
+    assert "- manager: 3 calls, 400 prompt + 70 completion tokens, unknown cost, 4.1s" in desc.as_markdown()
+    assert desc.to_dict()["usage"]["by_role"]["manager"]["calls"] == 3
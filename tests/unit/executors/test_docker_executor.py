@@ -0,0 +1,225 @@
+"""
+Unit tests for the DockerExecutor class, run against a Docker-compatible stand-in CLI.
+
+The stand-in implements the subset of the CLI used by the executor: images and containers are records in a state
+directory, 'exec' runs the command on the host in the container working directory, and the package check of a
+container fails for the modules listed in FAKE_DOCKER_MISSING.
+"""
+
+import json
+import sys
+import textwrap
+
+import pytest
+
+from aiden.common.dataset import Dataset
+from aiden.common.environment import Environment
+from aiden.executors import docker_executor
+from aiden.executors.docker_executor import DockerExecutor, get_container_pool, release_container_pools
+from aiden.registries.objects import ObjectRegistry
+from aiden.tools.execution import _get_executor_class
+
+FAKE_DOCKER = textwrap.dedent(
+    """
+    import json, os, sys, uuid
+
+    state = os.environ["FAKE_DOCKER_STATE"]
+    args = sys.argv[1:]
+    with open(os.path.join(state, "calls.jsonl"), "a") as f:
+        f.write(json.dumps(args) + "\\n")
+
+    if args[:2] == ["image", "inspect"]:
+        sys.exit(0 if os.path.exists(os.path.join(state, "image-" + args[2])) else 1)
+    elif args[0] == "build":
+        with open(os.path.join(state, "image-" + args[args.index("-t") + 1]), "w") as f:
+            f.write(sys.stdin.read())
+    elif args[0] == "run":
+        container_id = uuid.uuid4().hex
+        with open(os.path.join(state, container_id), "w") as f:
+            json.dump({"workdir": args[args.index("-w") + 1]}, f)
+        print(container_id)
+    elif args[0] == "exec":
+        path = os.path.join(state, args[1])
+        if not os.path.exists(path):
+            sys.exit("Error: No such container: " + args[1])
+        command = args[2:]
+        if command[0] == "sh":
+            sys.exit(0)  # container reset
+        if command[1] == "-c" and command[2].startswith("import "):
+            missing = [m for m in os.environ.get("FAKE_DOCKER_MISSING", "").split(",") if m and m in command[2]]
+            sys.exit("ModuleNotFoundError: No module named " + missing[0] if missing else 0)
+        with open(path) as f:
+            os.chdir(json.load(f)["workdir"])
+        os.execv(sys.executable, [sys.executable] + command[1:])
+    elif args[0] == "rm":
+        for container_id in args[2:]:
+            if os.path.exists(os.path.join(state, container_id)):
+                os.remove(os.path.join(state, container_id))
+    """
+)
+
+
+@pytest.fixture
+def docker_env(tmp_path, monkeypatch):
+    state = tmp_path / "state"
+    state.mkdir()
+    binary = tmp_path / "fake-docker"
+    binary.write_text(f"#!{sys.executable}\n{FAKE_DOCKER}")
+    binary.chmod(0o755)
+    monkeypatch.setenv("FAKE_DOCKER_STATE", str(state))
+    monkeypatch.setattr(docker_executor, "_built_images", set())
+    workdir = tmp_path / "work"
+    env = Environment(
+        type="local", workdir=str(workdir), metadata={"isolation": "docker", "binary": str(binary), "pool_size": 1}
+    )
+    return env, state
+
+
+def _calls(state):
+    return [json.loads(line) for line in (state / "calls.jsonl").read_text().splitlines()]
+
+
+def _runtime_images(state):
+    return sorted(path.name for path in state.iterdir() if path.name.startswith("image-"))
+
+
+def _executor(env, tmp_path, code, timeout=10, datasets=None):
+    return DockerExecutor(
+        execution_id="run",
+        code=code,
+        working_dir=env.workdir,
+        timeout=timeout,
+        environment=env,
+        datasets=datasets if datasets is not None else [],
+    )
+
+
+def test_executor_class_selected_by_isolation(docker_env):
+    env, _ = docker_env
+    assert _get_executor_class(environment=env) is DockerExecutor
+
+
+def test_runs_code_and_reuses_container(docker_env, tmp_path):
+    env, state = docker_env
+
+    first = _executor(env, tmp_path, "print('hello from the container')").run()
+    second = _executor(env, tmp_path, "raise ValueError('boom')").run()
+
+    assert first.exception is None and "hello from the container" in first.term_out[0]
+    assert isinstance(second.exception, RuntimeError) and "boom" in str(second.exception)
+    commands = [call[0] for call in _calls(state)]
+    assert commands.count("run") == 1
+    # Each run is followed by a reset of the container
+    assert sum(1 for call in _calls(state) if call[0] == "exec" and call[2] == "sh") == 2
+
+
+def test_container_limits_and_mounts(docker_env, tmp_path):
+    """Test that the inputs are mounted read-only, and only the working and output directories are writable."""
+    env, state = docker_env
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.csv").write_text("a\n1\n")
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "lookup.csv").write_text("a\n1\n")
+    datasets = [
+        Dataset(path=str(tmp_path / "data" / "input.csv"), format="csv"),
+        Dataset(path=str(tmp_path / "shared" / "lookup.csv"), format="csv"),
+        Dataset(path=str(tmp_path / "shared" / "output.csv"), format="csv"),
+    ]
+
+    _executor(env, tmp_path, "print(1)", datasets=datasets).run()
+
+    run = next(call for call in _calls(state) if call[0] == "run")
+    assert ["--network", "none"] == run[run.index("--network") : run.index("--network") + 2]
+    assert "--read-only" in run and "--cpus" in run and "--memory" in run
+    mounts = [run[i + 1] for i, arg in enumerate(run) if arg == "-v"]
+    assert sorted(mounts) == sorted(
+        [
+            f"{tmp_path / 'data'}:{tmp_path / 'data'}:ro",
+            f"{tmp_path / 'shared'}:{tmp_path / 'shared'}",
+            # The input next to the output is protected by a nested read-only mount, after its writable parent
+            f"{tmp_path / 'shared' / 'lookup.csv'}:{tmp_path / 'shared' / 'lookup.csv'}:ro",
+            f"{env.workdir}:{env.workdir}",
+        ]
+    )
+    assert mounts.index(f"{tmp_path / 'shared'}:{tmp_path / 'shared'}") < mounts.index(
+        f"{tmp_path / 'shared' / 'lookup.csv'}:{tmp_path / 'shared' / 'lookup.csv'}:ro"
+    )
+
+
+def test_container_pools_released_by_owner(docker_env, tmp_path):
+    """Test that the containers of a build are removed when the build releases its pools."""
+    env, state = docker_env
+    registry = ObjectRegistry.create(parent=ObjectRegistry.root())
+
+    with registry.activate():
+        executor = _executor(env, tmp_path, "print(1)")
+        executor.run()
+    (container_id,) = [
+        path.name for path in state.iterdir() if path.suffix == "" and not path.name.startswith("image-")
+    ]
+    release_container_pools(registry)
+
+    assert executor.pool._closed
+    assert ["rm", "-f", container_id] in _calls(state)
+    with registry.activate():
+        assert _executor(env, tmp_path, "print(1)").pool is not executor.pool
+
+
+def test_timeout(docker_env, tmp_path):
+    env, _ = docker_env
+
+    result = _executor(env, tmp_path, "import time\ntime.sleep(30)", timeout=1).run()
+
+    assert isinstance(result.exception, TimeoutError)
+
+
+def test_failed_container_start(tmp_path):
+    pool = get_container_pool(image="img", mounts=[], workdir=str(tmp_path), binary="false", size=1)
+
+    with pytest.raises(RuntimeError, match="Failed to start container"):
+        with pool.acquire():
+            pass
+
+
+def test_builds_runtime_image_once(docker_env, tmp_path):
+    """Test that without a configured image, one is built with the packages of the engine and then reused."""
+    env, state = docker_env
+
+    _executor(env, tmp_path, "print(1)").run()
+    _executor(env, tmp_path, "print(2)", datasets=[Dataset(path=str(tmp_path / "out" / "a.csv"), format="csv")]).run()
+
+    (image,) = _runtime_images(state)
+    dockerfile = (state / image).read_text()
+    assert dockerfile.startswith("FROM python:3.11-slim\n") and "pandas==" in dockerfile and "pyarrow==" in dockerfile
+    runs = [call for call in _calls(state) if call[0] == "run"]
+    assert len(runs) == 2 and all(image.removeprefix("image-") in run for run in runs)
+    assert sum(1 for call in _calls(state) if call[0] == "build") == 1
+
+
+def test_image_without_packages_fails_fast(docker_env, tmp_path, monkeypatch):
+    """Test that an image lacking the packages of generated code is reported before running any code."""
+    env, _ = docker_env
+    env.metadata["image"] = "python:3.11-slim"
+    monkeypatch.setenv("FAKE_DOCKER_MISSING", "pandas")
+
+    result = _executor(env, tmp_path, "print('never run')").run()
+
+    assert isinstance(result.exception, RuntimeError)
+    assert "does not provide the packages required by generated code" in str(result.exception)
+
+
+def test_runs_in_mounted_working_directory(docker_env, tmp_path, monkeypatch):
+    """Test that code runs in the mounted working directory, with relative dataset paths made absolute."""
+    env, state = docker_env
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.csv").write_text("a\n1\n")
+    datasets = [Dataset(path="./data/input.csv", format="csv"), Dataset(path="./data/output.csv", format="csv")]
+    code = "import shutil\nshutil.copy('./data/input.csv', './data/output.csv')"
+
+    result = _executor(env, tmp_path, code, datasets=datasets).run()
+
+    assert result.exception is None, result.exception
+    assert (tmp_path / "data" / "output.csv").read_text() == "a\n1\n"
+    run = next(call for call in _calls(state) if call[0] == "run")
+    assert run[run.index("-w") + 1] == str(env.workdir)
@@ -0,0 +1,139 @@
+"""
+Equivalence tests of the compute engines that generated code can target.
+
+The same multi-way join of the sales department fixture datasets is written for each engine, and executed by the
+executor of an environment targeting that engine; every engine must write the same output as pandas.
+"""
+
+from pathlib import Path
+
+import pyarrow.csv as pv
+import pytest
+
+from aiden.common.environment import Environment
+from aiden.config import config
+from aiden.executors.local_executor import LocalExecutor
+
+DATA_DIR = (Path(__file__).parents[2] / "input_data" / "sales_department").resolve()
+
+# Sales of each employee against their target: transactions, targets and employees joined on EmployeeID
+TRANSFORMATIONS = {
+    "pandas": """
+import pandas as pd
+
+transactions = pd.read_csv("{data}/sales_transactions.csv")
+targets = pd.read_csv("{data}/sales_targets.csv")
+employees = pd.read_csv("{data}/sales_employee_information.csv")
+sales = (
+    transactions[transactions["Status"] == "Completed"]
+    .groupby("EmployeeID", as_index=False)["Amount"]
+    .sum()
+    .rename(columns={{"Amount": "TotalSales"}})
+)
+output = (
+    targets[["EmployeeID", "TargetAmount"]]
+    .merge(employees[["EmployeeID", "Region"]], on="EmployeeID")
+    .merge(sales, on="EmployeeID", how="left")
+)
+output["TotalSales"] = output["TotalSales"].fillna(0).astype("int64")
+output = output[["EmployeeID", "Region", "TargetAmount", "TotalSales"]].sort_values("EmployeeID")
+output.to_csv("{output}", index=False)
+""",
+    "pyarrow": """
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+transactions = pv.read_csv("{data}/sales_transactions.csv")
+targets = pv.read_csv("{data}/sales_targets.csv")
+employees = pv.read_csv("{data}/sales_employee_information.csv")
+completed = transactions.filter(pc.equal(transactions["Status"], "Completed"))
+totals = completed.group_by("EmployeeID").aggregate([("Amount", "sum")])
+sales = pa.table({{"EmployeeID": totals["EmployeeID"], "TotalSales": totals["Amount_sum"]}})
+output = (
+    targets.select(["EmployeeID", "TargetAmount"])
+    .join(employees.select(["EmployeeID", "Region"]), "EmployeeID")
+    .join(sales, "EmployeeID", join_type="left outer")
+)
+output = output.set_column(
+    output.schema.get_field_index("TotalSales"), "TotalSales", pc.fill_null(output["TotalSales"], 0)
+)
+output = output.select(["EmployeeID", "Region", "TargetAmount", "TotalSales"]).sort_by("EmployeeID")
+pv.write_csv(output, "{output}")
+""",
+    "polars": """
+import polars as pl
+
+transactions = pl.scan_csv("{data}/sales_transactions.csv")
+targets = pl.scan_csv("{data}/sales_targets.csv")
+employees = pl.scan_csv("{data}/sales_employee_information.csv")
+sales = (
+    transactions.filter(pl.col("Status") == "Completed")
+    .group_by("EmployeeID")
+    .agg(pl.col("Amount").sum().alias("TotalSales"))
+)
+output = (
+    targets.select("EmployeeID", "TargetAmount")
+    .join(employees.select("EmployeeID", "Region"), on="EmployeeID")
+    .join(sales, on="EmployeeID", how="left")
+    .with_columns(pl.col("TotalSales").fill_null(0).cast(pl.Int64))
+    .select("EmployeeID", "Region", "TargetAmount", "TotalSales")
+    .sort("EmployeeID")
+    .collect()
+)
+output.write_csv("{output}")
+""",
+    "duckdb": """
+import duckdb
+
+connection = duckdb.connect()
+connection.execute(
+    \"\"\"
+    COPY (
+        WITH sales AS (
+            SELECT EmployeeID, SUM(Amount) AS TotalSales
+            FROM read_csv_auto('{data}/sales_transactions.csv')
+            WHERE Status = 'Completed'
+            GROUP BY EmployeeID
+        )
+        SELECT t.EmployeeID, e.Region, t.TargetAmount, CAST(COALESCE(s.TotalSales, 0) AS BIGINT) AS TotalSales
+        FROM read_csv_auto('{data}/sales_targets.csv') t
+        JOIN read_csv_auto('{data}/sales_employee_information.csv') e ON t.EmployeeID = e.EmployeeID
+        LEFT JOIN sales s ON t.EmployeeID = s.EmployeeID
+        ORDER BY t.EmployeeID
+    ) TO '{output}' (FORMAT CSV, HEADER)
+    \"\"\"
+)
+""",
+}
+
+
+def _run(engine: str, tmp_path: Path):
+    environment = Environment(type="local", workdir=str(tmp_path / "workdir"), metadata={"engine": engine})
+    output = tmp_path / f"{engine}.csv"
+    executor = LocalExecutor(
+        execution_id=f"engine-{engine}",
+        code=TRANSFORMATIONS[engine].format(data=DATA_DIR, output=output),
+        working_dir=tmp_path,
+        timeout=60,
+        environment=environment,
+    )
+
+    result = executor.run()
+
+    assert result.exception is None, result.exception
+    if executor.worker_pool is not None:
+        assert executor.worker_pool.preload == config.code_generation.engine_packages(engine)
+    return pv.read_csv(output)
+
+
+@pytest.mark.parametrize("engine", ["pyarrow", "polars", "duckdb"])
+def test_engines_write_the_same_output_as_pandas(engine, tmp_path):
+    """Test that the transformation of each engine writes the same output as the pandas transformation."""
+    pytest.importorskip(engine)
+
+    expected = _run("pandas", tmp_path)
+    actual = _run(engine, tmp_path)
+
+    assert expected.num_rows == 3
+    assert actual.equals(expected)
@@ -75,3 +75,29 @@ def test_local_executor_timeout(temp_test_dir, local_env):
 
     # Verify timeout handling
     assert isinstance(result.exception, TimeoutError)
+
+
+def test_local_executor_dagster_in_process(temp_test_dir):
+    """Test that dagster assets are materialised in process with per-step results."""
+    pytest.importorskip("dagster")
+    code = (
+        "import dagster as dg\n\n"
+        "@dg.asset\ndef numbers():\n    return [1, 2, 3]\n\n"
+        "@dg.asset\ndef total(numbers):\n    return sum(numbers)\n\n"
+        "@dg.asset\ndef broken(numbers):\n    raise ValueError('bad asset')\n\n"
+        "defs = dg.Definitions(assets=[numbers, total, broken])\n"
+    )
+    executor = LocalExecutor(
+        execution_id="test-dagster",
+        code=code,
+        working_dir=temp_test_dir,
+        timeout=60,
+        environment=Environment(type="dagster"),
+    )
+
+    result = executor.run()
+
+    steps = {step["name"]: step for step in result.step_results}
+    assert steps["numbers"]["status"] == "success" and steps["total"]["status"] == "success"
+    assert steps["broken"]["status"] == "failure" and "bad asset" in steps["broken"]["error"]
+    assert "bad asset" in str(result.exception)
@@ -0,0 +1,130 @@
+"""
+Unit tests for the RayExecutor class, run on a local Ray cluster.
+"""
+
+import pytest
+
+pytest.importorskip("ray")
+
+from aiden.common.dataset import Dataset  # noqa: E402
+from aiden.common.environment import Environment  # noqa: E402
+from aiden.executors import ray_executor  # noqa: E402
+from aiden.executors.ray_executor import RayExecutor, _materialise_dataset, _put_dataset  # noqa: E402
+
+
+@pytest.fixture(scope="module", autouse=True)
+def ray_cluster():
+    import ray
+
+    ray.init(num_cpus=2, include_dashboard=False, ignore_reinit_error=True)
+    yield
+    ray.shutdown()
+
+
+def _executor(tmp_path, code, timeout=30, datasets=None, outputs=None):
+    return RayExecutor(
+        execution_id="ray-run",
+        code=code,
+        working_dir=tmp_path,
+        timeout=timeout,
+        environment=Environment(type="local", workdir=str(tmp_path)),
+        datasets=datasets or [],
+        outputs=outputs,
+    )
+
+
+def test_ray_executor_success_and_error(tmp_path):
+    ok = _executor(tmp_path, "print('hello from ray')").run()
+    failed = _executor(tmp_path, "raise ValueError('ray boom')").run()
+
+    assert ok.exception is None and "hello from ray" in ok.term_out[0]
+    assert isinstance(failed.exception, RuntimeError) and "ray boom" in str(failed.exception)
+
+
+def test_ray_executor_reads_datasets(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("a\n1\n2\n")
+    output_path = tmp_path / "output.csv"
+    code = f"import pandas as pd\npd.read_csv('{input_path}').to_csv('{output_path}', index=False)\n"
+
+    result = _executor(
+        tmp_path,
+        code,
+        datasets=[Dataset(path=str(input_path), format="csv"), Dataset(path=str(output_path), format="csv")],
+    ).run()
+
+    assert result.exception is None
+    assert output_path.read_text() == "a\n1\n2\n"
+
+
+def test_ray_executor_timeout(tmp_path):
+    result = _executor(tmp_path, "import time\ntime.sleep(30)", timeout=1).run()
+
+    assert isinstance(result.exception, TimeoutError)
+
+
+def test_ray_executor_ships_back_existing_outputs(tmp_path, monkeypatch):
+    """Test that an output left by a previous run is written by the task and shipped back, not passed as an input."""
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("a\n1\n2\n")
+    output_path = tmp_path / "output.csv"
+    output_path.write_text("stale\n")
+    code = f"import pandas as pd\npd.read_csv('{input_path}').to_csv('{output_path}', index=False)\n"
+    datasets = [Dataset(path=str(input_path), format="csv"), Dataset(path=str(output_path), format="csv")]
+    executor = _executor(tmp_path, code, datasets=datasets, outputs=[str(output_path)])
+
+    inputs, outputs = executor._inputs_and_outputs()
+    assert [dataset.path for dataset in inputs] == [str(input_path)]
+    assert outputs == [str(output_path.resolve())]
+
+    # Run the task as if it were on another node than the driver
+    received = []
+    receive_files = ray_executor._receive_files
+    monkeypatch.setattr(ray_executor, "_driver_node_id", lambda: "another-node")
+    monkeypatch.setattr(ray_executor, "_receive_files", lambda files: received.append(files) or receive_files(files))
+    result = executor.run()
+
+    assert result.exception is None, result.exception
+    assert list(received[0]) == [str(output_path.resolve())]
+    assert output_path.read_text() == "a\n1\n2\n"
+
+
+def test_put_dataset_in_chunks(tmp_path):
+    """Test that a dataset file is put in the object store in chunks, and materialised whole on another node."""
+    path = tmp_path / "values.csv"
+    path.write_text("a\n" + "".join(f"{i}\n" for i in range(1000)))
+
+    key, refs = _put_dataset(path, chunk_size=1024)
+    assert len(refs) == -(-path.stat().st_size // 1024)
+    assert _put_dataset(path, chunk_size=1024)[1] is refs
+
+    copy = _materialise_dataset((str(tmp_path / "elsewhere" / "values.csv"), *key[1:]), refs)
+    assert open(copy).read() == path.read_text()
+
+
+def test_ray_executor_runs_in_working_directory_with_relative_paths(tmp_path, monkeypatch):
+    """Test that scripts run in their working directory, also on another node, with relative dataset paths."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.csv").write_text("a\n1\n2\n")
+    code = (
+        "import os\nimport pandas as pd\nprint(os.getcwd())\n"
+        "pd.read_csv('data/input.csv').to_csv('data/output.csv', index=False)\n"
+    )
+    datasets = [Dataset(path="data/input.csv", format="csv"), Dataset(path="data/output.csv", format="csv")]
+    executor = RayExecutor(
+        execution_id="ray-run",
+        code=code,
+        working_dir=tmp_path / "work",
+        timeout=30,
+        environment=Environment(type="local", workdir=str(tmp_path / "work")),
+        datasets=datasets,
+        outputs=["data/output.csv"],
+    )
+    monkeypatch.setattr(ray_executor, "_driver_node_id", lambda: "another-node")
+
+    result = executor.run()
+
+    assert result.exception is None, result.exception
+    assert result.term_out[0].strip() == str(executor.working_dir)
+    assert (tmp_path / "data" / "output.csv").read_text() == "a\n1\n2\n"
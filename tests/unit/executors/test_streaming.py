@@ -0,0 +1,120 @@
+"""
+Unit tests for the streaming execution mode.
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from aiden.common.dataset import Dataset
+from aiden.common.environment import Environment
+from aiden.executors.local_executor import LocalExecutor
+from aiden.executors.streaming import build_streaming_script
+from aiden.executors.streaming_runtime import BatchWriter, iter_batches
+
+TRANSFORM_BATCH = """
+import pandas as pd
+
+def transform_batch(batch: pd.DataFrame) -> pd.DataFrame:
+    print(f"batch of {len(batch)} rows")
+    result = batch[batch["a"] % 2 == 0].copy()
+    result["b"] = result["a"] * 10
+    return result
+"""
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "json"])
+def test_streaming_script_processes_bounded_batches(tmp_path, fmt):
+    """Test that a streaming script feeds batches of bounded size and writes every result."""
+    df = pd.DataFrame({"a": range(25)})
+    input_dataset = Dataset(path=str(tmp_path / f"input.{fmt}"), format=fmt)
+    output_dataset = Dataset(path=str(tmp_path / "out" / f"output.{fmt}"), format=fmt)
+    if fmt == "csv":
+        df.to_csv(input_dataset.path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(input_dataset.path, index=False)
+    else:
+        df.to_json(input_dataset.path, orient="records", lines=True)
+
+    executor = LocalExecutor(
+        execution_id=f"streaming-{fmt}",
+        code=build_streaming_script(TRANSFORM_BATCH, input_dataset, output_dataset, batch_size=10),
+        working_dir=tmp_path,
+        timeout=60,
+        environment=Environment(type="local", workdir=str(tmp_path), metadata={"mode": "streaming"}),
+        worker_pool=None,
+    )
+    result = executor.run()
+
+    assert result.exception is None, result.term_out
+    output = "".join(result.term_out)
+    assert output.count("batch of") == 3
+    assert "batch of 10 rows" in output and "batch of 5 rows" in output
+    assert "Streamed 25 rows in 3 batches, wrote 13 rows" in output
+
+    if fmt == "csv":
+        written = pd.read_csv(output_dataset.path)
+    elif fmt == "parquet":
+        written = pd.read_parquet(output_dataset.path)
+    else:
+        written = pd.read_json(output_dataset.path, lines=True)
+    assert written["a"].tolist() == list(range(0, 25, 2))
+    assert written["b"].tolist() == [a * 10 for a in range(0, 25, 2)]
+
+
+def test_streaming_requires_local_environment(tmp_path):
+    """Test that the streaming mode is rejected outside local environments."""
+    env = Environment(type="local", workdir=str(tmp_path), metadata={"mode": "streaming", "batch_size": 500})
+    assert env.is_streaming and env.batch_size == 500
+    assert not Environment(type="local", workdir=str(tmp_path)).is_streaming
+
+    with pytest.raises(ValueError, match="Streaming mode"):
+        Environment(type="dagster", workdir=str(tmp_path), metadata={"mode": "streaming"})
+
+
+def test_streamed_csv_columns_have_the_input_schema_types(tmp_path):
+    """Test that CSV columns are read with the types of the input schema rather than those of the first block."""
+    path = tmp_path / "codes.csv"
+    # The first block only holds numeric codes
+    path.write_text("code\n" + "".join(f"{i}\n" for i in range(200_000)) + "A1\n")
+
+    batches = list(iter_batches(str(path), "csv", 100_000, {"code": "str"}))
+
+    assert sum(len(batch) for batch in batches) == 200_001
+    assert batches[-1]["code"].iloc[-1] == "A1"
+
+
+def test_streamed_json_arrays_are_rejected(tmp_path):
+    """Test that JSON arrays, which cannot be read incrementally, are rejected with a clear error."""
+    path = tmp_path / "records.json"
+    path.write_text('[{"a": 1}, {"a": 2}]')
+
+    with pytest.raises(ValueError, match="line-delimited JSON"):
+        list(iter_batches(str(path), "json", 10))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_batch_writer_uses_the_output_schema(tmp_path, fmt):
+    """Test that columnar outputs have the types of the output schema, even without batches or with null batches."""
+    empty = BatchWriter(str(tmp_path / f"empty.{fmt}"), fmt, {"a": "int", "b": "str"})
+    empty.close()
+    assert Dataset(path=empty.path, format=fmt).arrow_schema().types == [pa.int64(), pa.string()]
+
+    writer = BatchWriter(str(tmp_path / f"output.{fmt}"), fmt, {"a": "int", "b": "str"})
+    writer.write(pd.DataFrame({"a": [None, None], "b": [None, None]}))
+    writer.write(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}))
+    writer.close()
+
+    written = Dataset(path=writer.path, format=fmt).load()
+    assert written["a"].tolist()[2:] == [1, 2] and written["b"].tolist() == [None, None, "x", "y"]
+    assert Dataset(path=writer.path, format=fmt).arrow_schema().types == [pa.int64(), pa.string()]
+
+
+def test_batch_writer_json_lines_have_no_blank_lines(tmp_path):
+    """Test that batches written as JSON lines follow each other without blank lines."""
+    writer = BatchWriter(str(tmp_path / "output.json"), "json")
+    writer.write(pd.DataFrame({"a": [1, 2]}))
+    writer.write(pd.DataFrame({"a": [3]}))
+    writer.close()
+
+    assert (tmp_path / "output.json").read_text() == '{"a":1}\n{"a":2}\n{"a":3}\n'
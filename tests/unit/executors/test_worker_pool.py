@@ -0,0 +1,103 @@
+"""
+Unit tests for the warm worker pool.
+"""
+
+import os
+import sys
+
+import pytest
+
+from aiden.executors import warm_worker
+from aiden.executors.worker_pool import WorkerPool, worker_pool_supported
+
+pytestmark = pytest.mark.skipif(not worker_pool_supported(), reason="Warm workers require os.fork")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = WorkerPool(size=1, preload=["json", "not_a_real_package_xyz"])
+    yield pool
+    pool.shutdown()
+
+
+def _run(pool, tmp_path, code, timeout=10):
+    code_file = tmp_path / "script.py"
+    code_file.write_text(code)
+    with pool.acquire() as worker:
+        return worker.run(
+            code_file,
+            cwd=tmp_path,
+            timeout=timeout,
+            stdout_file=tmp_path / "out.log",
+            stderr_file=tmp_path / "err.log",
+        )
+
+
+def test_runs_script_as_main(pool, tmp_path):
+    result = _run(pool, tmp_path, "import os\nif __name__ == '__main__':\n    print('hello', os.getcwd())")
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == f"hello {tmp_path}"
+    assert not result.timed_out
+
+
+def test_preloaded_modules_and_missing_packages(pool, tmp_path):
+    result = _run(pool, tmp_path, "import sys\nprint('json' in sys.modules)")
+
+    assert result.stdout.strip() == "True"
+    with pool.acquire() as worker:
+        assert worker.preloaded == ["json"]
+
+
+def test_reports_exceptions_and_exit_codes(pool, tmp_path):
+    error = _run(pool, tmp_path, "raise ValueError('boom')")
+    exited = _run(pool, tmp_path, "import sys\nsys.exit(3)")
+    syntax = _run(pool, tmp_path, "def broken(:\n")
+
+    assert error.returncode == 1 and "ValueError: boom" in error.stderr
+    assert exited.returncode == 3
+    assert syntax.returncode == 1 and "SyntaxError" in syntax.stderr
+
+
+def test_jobs_are_isolated(pool, tmp_path):
+    _run(pool, tmp_path, "import json\njson.leaked = True\nimport os\nos.environ['AIDEN_LEAK'] = '1'")
+    result = _run(pool, tmp_path, "import json, os\nprint(hasattr(json, 'leaked'), 'AIDEN_LEAK' in os.environ)")
+
+    assert result.stdout.strip() == "False False"
+
+
+def test_timeout_kills_job_but_keeps_worker(pool, tmp_path):
+    result = _run(pool, tmp_path, "import time\ntime.sleep(10)", timeout=0.5)
+
+    assert result.timed_out
+    assert _run(pool, tmp_path, "print('still alive')").stdout.strip() == "still alive"
+
+
+def test_dead_worker_is_replaced(pool, tmp_path):
+    with pool.acquire() as worker:
+        worker.kill()
+        pid = worker.process.pid
+
+    result = _run(pool, tmp_path, f"print({sys.version_info.major})")
+
+    assert result.stdout.strip() == str(sys.version_info.major)
+    with pool.acquire() as worker:
+        assert worker.process.pid != pid and worker.process.pid != os.getpid()
+
+
+def test_compiled_scripts_are_bounded(monkeypatch, tmp_path):
+    monkeypatch.setattr(warm_worker, "_compiled", warm_worker.OrderedDict())
+    monkeypatch.setattr(warm_worker, "_compiled_max_size", 2)
+    scripts = []
+    for i in range(3):
+        scripts.append(tmp_path / f"script_{i}.py")
+        scripts[-1].write_text(f"print({i})")
+
+    first = warm_worker._compile(scripts[0])
+    warm_worker._compile(scripts[1])
+    assert warm_worker._compile(scripts[0]) is first
+    warm_worker._compile(scripts[2])
+
+    # The second script was the least recently used one, so it was evicted
+    assert [code.co_filename for code in warm_worker._compiled.values()] == [str(scripts[0]), str(scripts[2])]
+    assert warm_worker._compile(scripts[0]) is first
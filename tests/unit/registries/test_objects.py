@@ -2,6 +2,8 @@
 Unit tests for the objects registry module.
 """
 
+import pytest
+
 from aiden.registries.objects import ObjectRegistry
 
 
@@ -103,3 +105,67 @@ def test_registry_management():
         assert False, "Expected KeyError was not raised"
     except KeyError:
         pass  # Expected behavior
+
+
+def test_scoped_registries_are_isolated():
+    """Test that builds activating their own scope do not see or clear each other's objects."""
+    import threading
+
+    root = ObjectRegistry.root()
+    root.clear()
+    root.register(SampleItem, "shared", SampleItem(0))
+    barrier = threading.Barrier(2)
+    seen = {}
+
+    def build(index):
+        scope = ObjectRegistry.create(parent=root)
+        with scope.activate():
+            ObjectRegistry().register(SampleItem, "output", SampleItem(index))
+            barrier.wait()
+            seen[index] = (ObjectRegistry() is scope, ObjectRegistry().get(SampleItem, "output").value)
+            assert ObjectRegistry().get(SampleItem, "shared").value == 0
+            ObjectRegistry().clear()
+
+    threads = [threading.Thread(target=build, args=(index,)) for index in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {1: (True, 1), 2: (True, 2)}
+    assert ObjectRegistry() is root
+    assert root.list() == [f"{SampleItem}://shared"]
+
+
+def test_scope_shadows_parent():
+    """Test that a scope reads through to its parent without modifying it."""
+    parent = ObjectRegistry.create()
+    parent.register(SampleItem, "item", SampleItem(1))
+    scope = ObjectRegistry.create(parent=parent)
+    scope.register(SampleItem, "item", SampleItem(2))
+
+    assert scope.get(SampleItem, "item").value == 2
+    assert parent.get(SampleItem, "item").value == 1
+    assert scope.get_all(SampleItem)[f"{SampleItem}://item"].value == 2
+    assert scope.list() == [f"{SampleItem}://item"]
+
+
+def test_retention_drops_least_recently_used():
+    """Test that a bounded type keeps its most recently used items only."""
+    registry = ObjectRegistry.create(retention={SampleItem: 2})
+    registry.register(SampleItem, "a", SampleItem(1))
+    registry.register(SampleItem, "b", SampleItem(2))
+    registry.get(SampleItem, "a")
+    registry.register(SampleItem, "c", SampleItem(3))
+
+    assert set(registry.get_all(SampleItem)) == {f"{SampleItem}://a", f"{SampleItem}://c"}
+    with pytest.raises(KeyError):
+        registry.get(SampleItem, "b")
+
+    # Other types are not bounded
+    for i in range(5):
+        registry.register(str, f"s{i}", str(i))
+    assert len(registry.get_all(str)) == 5
+
+    registry.set_retention(SampleItem, 1)
+    assert list(registry.get_all(SampleItem)) == [f"{SampleItem}://c"]
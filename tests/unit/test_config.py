@@ -0,0 +1,72 @@
+"""
+Unit tests for the configuration module.
+"""
+
+import sys
+
+import pytest
+
+from aiden.config import _PromptTemplates, config, is_package_available, refresh_package_availability
+
+
+def test_package_availability_is_cached_without_import(tmp_path, monkeypatch):
+    """Test that package availability is detected without importing the package, and refreshed on demand."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    refresh_package_availability()
+    assert not is_package_available("aiden_test_plugin")
+
+    (tmp_path / "aiden_test_plugin.py").write_text("raise RuntimeError('must not be imported')\n")
+    assert not is_package_available("aiden_test_plugin")
+
+    refresh_package_availability()
+    assert is_package_available("aiden_test_plugin")
+    assert "aiden_test_plugin" not in sys.modules
+    assert is_package_available("pandas")
+
+
+def test_allowed_packages():
+    """Test that the allowed packages include dagster only when it is installed."""
+    allowed = config.code_generation.allowed_packages
+    assert "pandas" in allowed
+    assert ("dagster" in allowed) == is_package_available("dagster")
+    assert set(allowed) <= set(config.code_generation.authorized_agent_imports)
+
+
+def test_prompt_templates_are_compiled_once(tmp_path, monkeypatch):
+    """Test that prompt templates are compiled once, and their bytecode cached on disk."""
+    monkeypatch.setenv("AIDEN_CACHE_DIR", str(tmp_path))
+    templates = _PromptTemplates()
+    templates.precompile()
+    template = templates.env.get_template("utils/cot_summarize.jinja")
+
+    assert templates.cot_summarize(context="step") == templates.cot_summarize(context="step")
+    assert templates.env.get_template("utils/cot_summarize.jinja") is template
+    assert any((tmp_path / "templates").iterdir())
+
+
+def test_engine_packages():
+    """Test that each compute engine has its own allowed packages, and that unknown engines are rejected."""
+    assert config.code_generation.engine_packages("pandas") == config.code_generation.allowed_packages
+    for engine in ("pyarrow", "polars", "duckdb"):
+        packages = config.code_generation.engine_packages(engine)
+        assert "pandas" not in packages
+        assert packages[0] == engine
+    with pytest.raises(ValueError, match="Unknown compute engine"):
+        config.code_generation.engine_packages("spark")
+
+
+def test_prompt_templates_target_the_engine():
+    """Test that the code generation prompts give the idioms of a columnar engine, and stay unchanged for pandas."""
+    templates = _PromptTemplates()
+    arguments = dict(
+        transformation_code="code",
+        plan="plan",
+        review="review",
+        problems=None,
+        allowed_packages=["pyarrow"],
+        environment_type="local",
+    )
+
+    assert "COMPUTE ENGINE: PYARROW" in templates.transformation_fix(**arguments, engine="pyarrow")
+    assert templates.transformation_fix(**arguments, engine="pandas") == templates.transformation_fix(**arguments)
+    assert "COMPUTE ENGINE" not in templates.transformation_fix(**arguments)
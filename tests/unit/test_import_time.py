@@ -0,0 +1,44 @@
+"""
+Import-time checks: importing aiden, or only its dataset and environment definitions, must not load the heavy
+dependencies that are only needed to build a transformation.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Dependencies that take seconds to import in total, and that are only needed to build a transformation
+HEAVY_MODULES = ["smolagents", "litellm", "openai", "pandas", "black", "rich", "jinja2", "aiden.agents"]
+
+_PROBE = """
+import importlib.util, json, sys
+{imports}
+# Modules imported with a lazy loader are only executed on first use
+loaded = [name for name, module in sys.modules.items() if not isinstance(module, importlib.util._LazyModule)]
+print(json.dumps(sorted(loaded)))
+"""
+
+
+def _import(imports: str) -> list:
+    """Import modules in a fresh interpreter, and return the modules executed."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(imports=imports)], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "imports",
+    [
+        "import aiden",
+        "from aiden.common.dataset import Dataset\nfrom aiden.common.environment import Environment",
+        "from aiden import Transformation",
+    ],
+)
+def test_import_does_not_load_heavy_dependencies(imports):
+    """Test that importing aiden defers the agents and the LLM clients until a transformation is built."""
+    modules = _import(imports)
+    loaded = [module for module in HEAVY_MODULES if module in modules]
+    assert loaded == []
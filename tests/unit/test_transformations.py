@@ -0,0 +1,249 @@
+"""
+Unit tests for the transformations module.
+"""
+
+import json
+
+import pytest
+
+import aiden.agents
+import aiden.transformations
+from aiden.agents.aiden import AidenGenerationResult
+from aiden.callbacks import Callback, ChainOfThoughtModelCallback
+from aiden.common.dataset import Dataset
+from aiden.common.environment import Environment
+from aiden.common.provider import ProviderConfig
+from aiden.common.usage import UsageLedger, UsageRecord
+from aiden.common.utils.cot import HeuristicStepSummarizer, LLMStepSummarizer
+from aiden.common.utils.transformation_state import TransformationState
+from aiden.executors.worker_pool import worker_pool_supported
+from aiden.transformations import Transformation, _get_step_summarizer, _rebind_source
+
+
+def test_get_step_summarizer():
+    """Test resolution of the chain_of_thought build option."""
+    provider_config = ProviderConfig(default_provider="openai/gpt-4o", tool_provider="anthropic/claude-3")
+
+    llm_summarizer = _get_step_summarizer(True, provider_config)
+    assert isinstance(llm_summarizer, LLMStepSummarizer)
+    assert llm_summarizer.model == "anthropic/claude-3"
+    assert isinstance(_get_step_summarizer("llm", provider_config), LLMStepSummarizer)
+    assert isinstance(_get_step_summarizer("heuristic", provider_config), HeuristicStepSummarizer)
+
+    custom = HeuristicStepSummarizer(max_value_length=10)
+    assert _get_step_summarizer(custom, provider_config) is custom
+
+    with pytest.raises(ValueError):
+        _get_step_summarizer("unknown", provider_config)
+
+
+def test_rebind_swapped_paths():
+    """Test that datasets swapping paths are rebound at once, without rewriting a rebound path again."""
+    source = "left = pd.read_csv('left.csv')\nright = pd.read_csv('right.csv')\n"
+
+    rebound = _rebind_source(source, [("left.csv", "right.csv"), ("right.csv", "left.csv")])
+
+    assert rebound == "left = pd.read_csv('right.csv')\nright = pd.read_csv('left.csv')\n"
+    with pytest.raises(ValueError, match="missing.csv"):
+        _rebind_source(source, [("left.csv", "other.csv"), ("missing.csv", "x.csv")])
+
+
+def _built_transformation(tmp_path):
+    """Return a transformation in the state left by a successful build, without running the agents."""
+    transformation = Transformation(
+        intent="double the values", environment=Environment(type="local", workdir=str(tmp_path / "workdir"))
+    )
+    transformation.input_datasets = [Dataset(path="./data/values.csv", format="csv", schema={"a": int})]
+    transformation.output_dataset = Dataset(path="./data/doubled.csv", format="csv", schema={"a": int})
+    transformation.transformer_source = (
+        "import pandas as pd\n\n"
+        "def transformation():\n"
+        "    df = pd.read_csv('./data/values.csv')\n"
+        "    (df * 2).to_csv('./data/doubled.csv', index=False)\n\n"
+        "if __name__ == '__main__':\n"
+        "    transformation()\n"
+    )
+    transformation.state = TransformationState.READY
+    return transformation
+
+
+def test_run_on_new_datasets(tmp_path):
+    """Test that a built transformation runs on new datasets and reports rows in and out."""
+    transformation = _built_transformation(tmp_path)
+    (tmp_path / "day1.csv").write_text("a\n1\n2\n3\n")
+    values = Dataset(path=str(tmp_path / "day1.csv"), format="csv", schema={"a": int})
+    values.name = "values"
+    output = Dataset(path=str(tmp_path / "day1_out.csv"), format="csv", schema={"a": int})
+
+    result = transformation.run([values], output, timeout=30)
+
+    assert result.success, result.error
+    assert result.rows_in == {"values": 3}
+    assert result.rows_out == 3
+    assert result.exec_time > 0
+    if worker_pool_supported():
+        assert result.peak_memory_mb > 0
+    assert (tmp_path / "day1_out.csv").read_text() == "a\n2\n4\n6\n"
+
+
+def test_run_errors(tmp_path):
+    """Test that running requires a built transformation and rebindable dataset paths."""
+    transformation = _built_transformation(tmp_path)
+    output = Dataset(path=str(tmp_path / "out.csv"), format="csv")
+
+    with pytest.raises(ValueError, match="Expected 1 input datasets"):
+        transformation.run([], output)
+
+    transformation.transformer_source = transformation.transformer_source.replace("'./data/values.csv'", "PATH")
+    with pytest.raises(ValueError, match="Cannot rebind"):
+        transformation.run([Dataset(path=str(tmp_path / "in.csv"), format="csv")], output)
+
+    transformation.state = TransformationState.DRAFT
+    with pytest.raises(RuntimeError, match="must be built"):
+        transformation.run([Dataset(path=str(tmp_path / "in.csv"), format="csv")], output)
+
+
+def test_run_streaming(tmp_path):
+    """Test that a streaming transformation streams the new input dataset into the new output dataset."""
+    transformation = _built_transformation(tmp_path)
+    transformation.environment = Environment(
+        type="local", workdir=str(tmp_path / "workdir"), metadata={"mode": "streaming", "batch_size": 2}
+    )
+    transformation.transformer_source = (
+        "import pandas as pd\n\n" "def transform_batch(batch: pd.DataFrame) -> pd.DataFrame:\n" "    return batch * 2\n"
+    )
+    (tmp_path / "day1.csv").write_text("a\n1\n2\n3\n")
+    output = Dataset(path=str(tmp_path / "day1_out.csv"), format="csv")
+
+    result = transformation.run([Dataset(path=str(tmp_path / "day1.csv"), format="csv")], output, timeout=30)
+
+    assert result.success, result.error
+    assert "Streamed 3 rows in 2 batches" in "".join(result.output)
+    assert (tmp_path / "day1_out.csv").read_text() == "a\n2\n4\n6\n"
+
+
+class _FakeAgent:
+    """Agent returning a fixed transformation, counting the builds that reached the agents."""
+
+    runs = 0
+
+    def __init__(self, **kwargs):
+        pass
+
+    def run(self, prompt, additional_args):
+        _FakeAgent.runs += 1
+        return AidenGenerationResult(
+            transformation_source_code="import pandas as pd\n\npd.read_csv('./data/values.csv')\n",
+            solution_plan="read the values",
+            metadata={"framework": "pandas"},
+        )
+
+
+def test_build_cache(tmp_path, monkeypatch):
+    """Test that rebuilding an unchanged transformation reuses the validated source of the previous build."""
+    monkeypatch.setattr(aiden.agents, "AidenAgent", _FakeAgent)
+    _FakeAgent.runs = 0
+    env = Environment(type="local", workdir=str(tmp_path / "workdir"))
+    values = Dataset(path="./data/values.csv", format="csv", schema={"a": int})
+    output = Dataset(path="./data/doubled.csv", format="csv", schema={"a": int})
+
+    first = Transformation(intent="double the values", environment=env)
+    first.build([values], output, chain_of_thought=False)
+    assert _FakeAgent.runs == 1
+    assert first.metadata["build_cache"] == "miss"
+
+    second = Transformation(intent="double the values", environment=env)
+    moved = Dataset(path="./other/values.csv", format="csv", schema={"a": int})
+    moved.name = "values"
+    second.build([moved], output, chain_of_thought=False)
+    assert _FakeAgent.runs == 1
+    assert second.state == TransformationState.READY
+    assert second.metadata["build_cache"] == "hit" and second.metadata["framework"] == "pandas"
+    assert "'./other/values.csv'" in second.transformer_source
+
+    Transformation(intent="double the values", environment=env).build(
+        [values], output, chain_of_thought=False, use_cache=False
+    )
+    Transformation(intent="triple the values", environment=env).build([values], output, chain_of_thought=False)
+    changed_schema = Dataset(path="./data/values.csv", format="csv", schema={"a": float})
+    Transformation(intent="double the values", environment=env).build([changed_schema], output, chain_of_thought=False)
+    assert _FakeAgent.runs == 4
+
+
+def test_resume(tmp_path, monkeypatch):
+    """Test that a build can be resumed from its checkpoint by another transformation object."""
+    monkeypatch.setattr(aiden.agents, "AidenAgent", _FakeAgent)
+    env = Environment(type="local", workdir=str(tmp_path / "workdir"))
+    values = Dataset(path="./data/values.csv", format="csv", schema={"a": int})
+    output = Dataset(path="./data/doubled.csv", format="csv", schema={"a": int})
+    first = Transformation(intent="double the values", environment=env)
+    first.build([values], output, chain_of_thought=False, use_cache=False)
+
+    resumed = Transformation(intent="double the values", environment=env)
+    resumed.resume(working_dir=first.working_dir)
+    assert resumed.state == TransformationState.READY
+    assert resumed.working_dir == first.working_dir
+    assert [dataset.name for dataset in resumed.input_datasets] == ["values"]
+    assert resumed.input_datasets[0].schema.model_fields["a"].annotation is int
+
+    with pytest.raises(ValueError, match="different intent"):
+        Transformation(intent="triple the values", environment=env).resume(working_dir=first.working_dir)
+    with pytest.raises(ValueError, match="No build checkpoint"):
+        Transformation(intent="double the values", environment=env).resume()
+
+
+def test_heuristic_chain_of_thought_is_inline(tmp_path, monkeypatch):
+    """Test that steps are summarised inline, without a summary worker, when the summarizer makes no LLM call."""
+    monkeypatch.setattr(aiden.agents, "AidenAgent", _FakeAgent)
+    created = []
+
+    class _RecordingCallback(ChainOfThoughtModelCallback):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            created.append(self.cot_callable)
+
+    monkeypatch.setattr(aiden.transformations, "ChainOfThoughtModelCallback", _RecordingCallback)
+    env = Environment(type="local", workdir=str(tmp_path / "workdir"))
+    values = Dataset(path="./data/values.csv", format="csv", schema={"a": int})
+    output = Dataset(path="./data/doubled.csv", format="csv", schema={"a": int})
+
+    Transformation(intent="double the values", environment=env).build(
+        [values], output, chain_of_thought="heuristic", use_cache=False
+    )
+
+    assert len(created) == 1 and not created[0].background
+
+
+class _UsageAgent(_FakeAgent):
+    """Agent making one LLM call of each of its roles during the build."""
+
+    def run(self, prompt, additional_args):
+        for role, tokens in [("manager", 100), ("data_engineer", 300)]:
+            UsageLedger.current().record(UsageRecord("openai/gpt-4o", role, tokens, 10, latency=1.0, cost=0.01))
+        return super().run(prompt, additional_args)
+
+
+class _UsageCallback(Callback):
+    def __init__(self):
+        self.records = []
+
+    def on_llm_call(self, record):
+        self.records.append(record)
+
+
+def test_build_usage(tmp_path, monkeypatch):
+    """Test that the LLM calls of a build are totalled in the metadata and description, and sent to callbacks."""
+    monkeypatch.setattr(aiden.agents, "AidenAgent", _UsageAgent)
+    env = Environment(type="local", workdir=str(tmp_path / "workdir"))
+    values = Dataset(path="./data/values.csv", format="csv", schema={"a": int})
+    output = Dataset(path="./data/doubled.csv", format="csv", schema={"a": int})
+    callback = _UsageCallback()
+
+    transformation = Transformation(intent="double the values", environment=env)
+    transformation.build([values], output, callbacks=[callback], chain_of_thought=False, use_cache=False)
+
+    metadata = transformation.get_metadata()
+    assert metadata["llm_calls"] == "2" and metadata["llm_prompt_tokens"] == "400"
+    assert json.loads(metadata["llm_usage_by_role"])["data_engineer"]["prompt_tokens"] == 300
+    assert transformation.describe().usage.by_role["manager"]["calls"] == 1
+    assert [record.role for record in callback.records] == ["manager", "data_engineer"]
@@ -4,6 +4,7 @@ Unit tests for the code_generation module.
 
 from unittest.mock import Mock, patch
 
+from aiden.generators.code_generator import TransformationCodeGenerator
 from aiden.tools.code_generation import get_generate_transformation_code
 from aiden.common.environment import Environment
 
@@ -52,3 +53,19 @@ def test_generate_transformation_code_calls_generator(mock_provider_class, mock_
         "Test task", "Test plan", ["dataset1", "dataset2"], "output_dataset"
     )
     assert result == "generated_code"
+
+
+def test_generate_candidates_bypasses_response_cache():
+    """Test that parallel candidates are not served from the response cache, as they would all repeat a past call."""
+    calls = []
+
+    async def aquery(system_message, user_message, **kwargs):
+        calls.append(kwargs)
+        return f"```python\nprint({len(calls)})\n```"
+
+    generator = TransformationCodeGenerator(Mock(aquery=aquery), Environment(type="local"))
+    with patch.object(TransformationCodeGenerator, "_generate_prompt", return_value="prompt"):
+        candidates = generator.generate_transformation_code_candidates("task", "plan", ["input"], "output", n=3)
+
+    assert len(candidates) == 3
+    assert all(call.get("use_cache") is False for call in calls)
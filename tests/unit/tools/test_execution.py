@@ -5,11 +5,12 @@ Unit tests for the execution module.
 import tempfile
 import os
 
-from aiden.tools.execution import _get_executor_class, get_executor_tool
+from aiden.tools.execution import _get_executor_class, get_executor_tool, run_candidates
 from aiden.common.environment import Environment
 from aiden.executors.local_executor import LocalExecutor
 from aiden.registries.objects import ObjectRegistry
 from aiden.common.dataset import Dataset
+from aiden.entities.code import Code
 
 
 def test_get_executor_class_default():
@@ -65,8 +66,8 @@ def test_execute_code_success():
         registry.register(Dataset, "success_input", input_dataset)
         registry.register(Dataset, "success_output", output_dataset)
 
-        # Very simple Python code
-        code = 'print("hello")'
+        # Very simple Python code writing the output
+        code = f'open({output_file_path!r}, "w").write("name,age\\nAlice,25\\n")\nprint("hello")'
 
         # Get the tool and execute
         tool = get_executor_tool()
@@ -125,3 +126,96 @@ def test_execute_code_exception():
         assert result["success"] is False
         assert result["exception"] is not None
         assert "Test exception" in result["exception"]
+
+
+def test_execute_code_schema_mismatch(tmp_path):
+    """Test that execute_code reports an output that does not match the output schema as a failure."""
+    (tmp_path / "input.csv").write_text("name,age\nAlice,25\n")
+    output_path = tmp_path / "output.csv"
+    registry = ObjectRegistry()
+    registry.clear()
+    registry.register(Dataset, "input", Dataset(path=str(tmp_path / "input.csv"), format="csv"))
+    registry.register(Dataset, "output", Dataset(path=str(output_path), format="csv", schema={"name": str, "age": int}))
+    code = f'open({str(output_path)!r}, "w").write("name,age\\nAlice,25.5\\n")'
+
+    result = get_executor_tool()(
+        node_id="test_schema",
+        code=code,
+        working_dir=str(tmp_path),
+        input_dataset_names=["input"],
+        output_dataset_name="output",
+        timeout=10,
+    )
+
+    assert result["success"] is False
+    assert "transformation_code_id" not in result
+    assert [(problem["kind"], problem["column"]) for problem in result["problems"]] == [("type", "age")]
+
+
+def _register_candidate_datasets(temp_dir):
+    output_file_path = os.path.join(temp_dir, "out", "candidate_output.csv")
+    registry = ObjectRegistry()
+    registry.clear()
+    registry.register(Dataset, "candidate_input", Dataset(path=os.path.join(temp_dir, "in.csv"), format="csv"))
+    registry.register(
+        Dataset, "candidate_output", Dataset(path=output_file_path, format="csv", schema={"name": str, "age": int})
+    )
+    return output_file_path
+
+
+def _candidate(output_path, sleep, columns="name,age"):
+    return (
+        f"import time, os\ntime.sleep({sleep})\npath = '{output_path}'\n"
+        f"os.makedirs(os.path.dirname(path), exist_ok=True)\n"
+        f"open(path, 'w').write('{columns}\\nAlice,25\\n')\n"
+    )
+
+
+def test_run_candidates_first_valid_candidate_wins():
+    """Test that the fastest valid candidate wins and that slower candidates are cancelled."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = _register_candidate_datasets(temp_dir)
+        codes = [
+            _candidate(output_path, 0, columns="wrong,columns"),
+            _candidate(output_path, 0.2),
+            _candidate(output_path, 30),
+        ]
+
+        result = run_candidates(codes, temp_dir, ["candidate_input"], "candidate_output", timeout=60)
+
+        assert result["success"] is True
+        assert result["code"] == codes[1]
+        assert ObjectRegistry().get(Code, result["transformation_code_id"]).code == codes[1]
+        with open(output_path) as f:
+            assert f.read().startswith("name,age")
+        report = {entry["candidate"]: entry for entry in result["candidates"]}
+        # Depending on scheduling, the invalid candidate either failed the output check or was still queued
+        assert report[1]["success"] is False
+        assert "missing columns" in report[1]["exception"] or report[1]["cancelled"]
+        assert report[3]["cancelled"] is True
+
+
+def test_run_candidates_sequential_fallback_and_failure():
+    """Test that candidates without the output path literal run sequentially, and that failures are reported."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        _register_candidate_datasets(temp_dir)
+        codes = ["raise ValueError('first failed')", "raise ValueError('second failed')"]
+
+        result = run_candidates(codes, temp_dir, ["candidate_input"], "candidate_output", timeout=10)
+
+        assert result["success"] is False
+        assert result["code"] == codes[0]
+        assert [entry["candidate"] for entry in result["candidates"]] == [1, 2]
+        assert "first failed" in result["candidates"][0]["exception"]
+
+
+def test_get_executor_class_distributed():
+    """Test that distributed execution uses Ray when installed, and falls back to LocalExecutor otherwise."""
+    result = _get_executor_class(distributed=True, environment=Environment(type="local"))
+
+    try:
+        from aiden.executors.ray_executor import RayExecutor
+    except ImportError:
+        assert result == LocalExecutor
+    else:
+        assert result == RayExecutor
@@ -0,0 +1,146 @@
+"""
+Unit tests for the optimisation of transformation code.
+"""
+
+import pytest
+
+from aiden.common.dataset import Dataset
+from aiden.entities.code import Code
+from aiden.registries.objects import ObjectRegistry
+from aiden.tools.optimization import _synthetic_inputs, benchmark_code, get_optimizer_tool, optimize_code
+
+SCHEMA = {"name": str, "age": int}
+
+
+class FakeGenerator:
+    """Returns the given rewrites in turn, recording the calls made to it."""
+
+    def __init__(self, *rewrites):
+        self.rewrites = list(rewrites)
+        self.calls = []
+
+    def optimize_transformation_code(self, transformation_code, plan, benchmark, problems=None):
+        self.calls.append({"code": transformation_code, "benchmark": benchmark, "problems": problems})
+        return self.rewrites.pop(0)
+
+
+@pytest.fixture
+def datasets(tmp_path):
+    input_path = tmp_path / "people.csv"
+    input_path.write_text("name,age\nAlice,25\nBob,30\n")
+    output_path = tmp_path / "adults.csv"
+    registry = ObjectRegistry.create(parent=ObjectRegistry.root())
+    with registry.activate():
+        registry.register(Dataset, "people", Dataset(path=str(input_path), format="csv", schema=SCHEMA))
+        registry.register(Dataset, "adults", Dataset(path=str(output_path), format="csv", schema=SCHEMA))
+        yield registry, str(input_path), str(output_path)
+
+
+def _code(input_path: str, output_path: str, body: str) -> str:
+    return (
+        "import time\n"
+        "import pandas as pd\n"
+        f"df = pd.read_csv({input_path!r})\n"
+        f"{body}\n"
+        f"df.to_csv({output_path!r}, index=False)\n"
+    )
+
+
+def _optimize(registry, code, generator, tmp_path, **kwargs):
+    registry.register(Code, "original", Code(code))
+    return optimize_code(
+        "original", "plan", ["people"], "adults", str(tmp_path / "work"), 60, generator, rows=100, **kwargs
+    )
+
+
+def test_get_optimizer_tool():
+    """Test get_optimizer_tool returns a callable tool."""
+    tool = get_optimizer_tool(llm_to_use="openai/gpt-4o", environment=None)
+
+    assert callable(tool)
+    assert tool.name == "optimize_transformation_code"
+
+
+def test_benchmark_code_profiles_the_script(tmp_path):
+    """Test that the benchmark times several runs after a warm-up, and reports the functions it spends time in."""
+    code = "import time\n\ndef slow_step():\n    time.sleep(0.2)\n\nslow_step()\nprint('done')\n"
+
+    benchmark = benchmark_code(code, tmp_path, 60, runs=3)
+
+    assert benchmark.success
+    assert len(benchmark.timings) == 3 and all(0.2 <= timing < 0.4 for timing in benchmark.timings)
+    assert benchmark.exec_time == sorted(benchmark.timings)[1]
+    assert "slow_step" in benchmark.profile
+
+
+def test_benchmark_code_reports_failures(tmp_path):
+    """Test that a failing script gives an unsuccessful benchmark with its error."""
+    benchmark = benchmark_code("raise ValueError('broken')", tmp_path, 60)
+
+    assert not benchmark.success
+    assert "broken" in benchmark.error
+
+
+def test_optimize_code_keeps_faster_identical_rewrite(datasets, tmp_path):
+    """Test that a faster rewrite with the same output is kept, and that the loop stops without further speedup."""
+    registry, input_path, output_path = datasets
+    slow = _code(input_path, output_path, "time.sleep(0.5)")
+    fast = _code(input_path, output_path, "time.sleep(0.05)")
+    generator = FakeGenerator(fast, fast)
+
+    result = _optimize(registry, slow, generator, tmp_path, max_iterations=3)
+
+    assert result["success"]
+    assert result["optimized"]
+    assert result["code"] == fast
+    assert result["speedup"] > 1
+    assert [attempt["accepted"] for attempt in result["attempts"]] == [True, False]
+    assert result["attempts"][1]["reason"] == "no further speedup"
+    assert registry.get(Code, result["transformation_code_id"]).code == fast
+    assert generator.calls[0]["benchmark"]["rows"] == {"people": 100}
+
+
+def test_optimize_code_rejects_rewrite_with_different_output(datasets, tmp_path):
+    """Test that a rewrite changing the output is rejected, and that the rejection is given to the next attempt."""
+    registry, input_path, output_path = datasets
+    original = _code(input_path, output_path, "time.sleep(0.5)")
+    wrong = _code(input_path, output_path, "df['age'] = df['age'] + 1")
+    generator = FakeGenerator(wrong, wrong)
+
+    result = _optimize(registry, original, generator, tmp_path, max_iterations=2)
+
+    assert result["success"]
+    assert not result["optimized"]
+    assert result["transformation_code_id"] == "original"
+    assert result["code"] == original
+    assert all("differs" in attempt["reason"] for attempt in result["attempts"])
+    assert generator.calls[0]["problems"] is None
+    assert "Attempt 1 was rejected" in generator.calls[1]["problems"]
+
+
+def test_optimize_code_reports_code_failing_on_synthetic_data(datasets, tmp_path):
+    """Test that code that cannot run on the synthetic data is not optimised."""
+    registry, input_path, output_path = datasets
+    code = _code(input_path, output_path, "assert len(df) < 10")
+
+    result = _optimize(registry, code, FakeGenerator(), tmp_path)
+
+    assert not result["success"]
+    assert "synthetic data" in result["exception"]
+    assert result["transformation_code_id"] == "original"
+
+
+def test_synthetic_inputs_keep_joins(tmp_path):
+    """Test that synthetic foreign keys only hold the keys of the synthetic dataset they reference."""
+    orders = Dataset(str(tmp_path / "orders.csv"), "csv", schema={"order_id": str, "customer_id": str, "amount": float})
+    orders.name = "orders"
+    (tmp_path / "orders.csv").write_text("order_id,customer_id,amount\nO1,C2,10.0\nO2,C2,5.0\nO3,C1,1.5\n")
+    customers = Dataset(str(tmp_path / "customers.csv"), "csv", schema={"customer_id": str, "city": str})
+    customers.name = "customers"
+    (tmp_path / "customers.csv").write_text("customer_id,city\nC1,Paris\nC2,Tokyo\nC3,Lima\n")
+
+    synthetic_orders, synthetic_customers = _synthetic_inputs([orders, customers], tmp_path / "synthetic", 500)
+
+    customer_ids = set(synthetic_customers.load()["customer_id"])
+    assert len(customer_ids) == 500
+    assert set(synthetic_orders.load()["customer_id"]) <= customer_ids